@@ -6,3 +6,6 @@ class AnomalyAgent:
 
     def detect(self, df, column):
         return self.tool.detect_anomalies(df, column)
+
+    def scan(self, df, **kwargs):
+        return self.tool.score_all(df, **kwargs)
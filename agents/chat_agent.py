@@ -1,15 +1,29 @@
-from transformers import pipeline
+from memory.model_registry import model_registry
+from tools.query_router_tool import QueryRouterTool
+from tools.table_retrieval_tool import TableRetrievalTool
 import pandas as pd
 
 class ChatAgent:
-    def __init__(self, df: pd.DataFrame):
-        # Convert all values to string to avoid Tapas dtype issues
-        self.df = df.head(20).astype(str)
-        self.qa_pipeline = pipeline("table-question-answering", model="google/tapas-large-finetuned-wtq")
+    def __init__(self, df: pd.DataFrame, quantize=None, dataset_key=None):
+        # TAPAS can't take large tables, so each question gets only the columns and rows
+        # (or pre-aggregated slices) that the retrieval indexes select from the full frame
+        self.df = df
+        if dataset_key is None:
+            self.retriever = TableRetrievalTool(df)
+        else:
+            self.retriever = TableRetrievalTool.for_dataset(dataset_key, df)
+        # Aggregate / filter / top-k questions are answered exactly by pandas, skipping the model
+        self.router = QueryRouterTool(df, retriever=self.retriever)
+        # The TAPAS pipeline is loaded lazily by the shared registry on the first question
+        self.quantize = quantize
 
     def answer(self, question: str) -> str:
         try:
-            result = self.qa_pipeline(table=self.df, query=question)
+            routed = self.router.answer(question)
+            if routed is not None:
+                return routed
+            table = self.retriever.retrieve(question)
+            result = model_registry.run("tapas", table=table, query=question, quantize=self.quantize)
             return result['answer']
         except Exception as e:
             return f"⚠️ Error: {str(e)}"
@@ -1,61 +1,226 @@
 # agents/controller_agent.py - CrewAI Implementation
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import BaseTool
+from crewai.tasks.task_output import TaskOutput
+import json
+import time
+from memory.dataset_registry import dataset_registry
+from memory.llm_cache import build_embedder, build_llm, llm_cache, model_name
+from tools.anomaly_detector_tool import AnomalyDetectorTool
+from tools.correlation_tool import CorrelationTool
 from tools.data_cleaning_tool import DataCleaningTool
+from tools.dtype_compaction_tool import DtypeCompactionTool
+from tools.profiler_tool import ProfilerTool
+from tools.row_fingerprint_tool import RowFingerprintIndex
+from tools.task_scheduler_tool import TaskSchedulerTool
+from tools.tracing_tool import TracingTool, trace_span
 import pandas as pd
 
+# Task graph: statistics, anomaly detection and quality assessment only need cleaned data,
+# so they run concurrently as soon as cleaning finishes. Visualization waits on statistics.
+TASK_DEPENDENCIES = {
+    "Data Cleaning": [],
+    "Statistics": ["Data Cleaning"],
+    "Visualization": ["Data Cleaning", "Statistics"],
+    "Anomaly Detection": ["Data Cleaning"],
+    "Quality Assessment": ["Data Cleaning"]
+}
+
+# Per-task timeouts (seconds) replace the single crew-wide max_execution_time
+TASK_TIMEOUTS = {
+    "Data Cleaning": 120,
+    "Statistics": 120,
+    "Visualization": 90,
+    "Anomaly Detection": 120,
+    "Quality Assessment": 90
+}
+
 # ==================== CREWAI CUSTOM TOOLS ====================
 
+# Caps that keep tool output (and therefore prompt size) constant as the dataset grows
+MAX_SUMMARY_COLUMNS = 20
+MAX_SUMMARY_PAIRS = 5
+
+
+def _round(value, digits=4):
+    return None if pd.isna(value) else round(float(value), digits)
+
+
+def _resolve(dataset_info):
+    dataset_id = dataset_registry.parse_id(dataset_info)
+    return dataset_id, dataset_registry.get(dataset_id)
+
+
 class DataCleaningToolCrewAI(BaseTool):
     """Custom CrewAI tool for data cleaning operations"""
     name: str = "data_cleaning_tool"
-    description: str = "Clean CSV data by handling missing values, standardizing types, and removing problematic columns"
+    description: str = (
+        "Clean the registered dataset by dropping empty rows and forward-filling missing values. "
+        "Input: the dataset ID (e.g. ds-0123456789ab). Output: a compact JSON summary of changes."
+    )
+    drop_duplicates: bool = False  # Also drop exact duplicate rows, found with the row fingerprint index
     
     def _run(self, dataset_info: str) -> str:
         """Execute data cleaning operations"""
-        return "Data cleaning completed: missing values imputed, types standardized, problematic columns removed"
+        dataset_id = dataset_registry.parse_id(dataset_info)
+        with trace_span(f"tool: {self.name}", df=dataset_registry.get(dataset_id, stage="raw")):
+            return dataset_registry.remember(dataset_id, "cleaning", lambda: self._clean(dataset_id))
+
+    def _clean(self, dataset_id):
+        raw = dataset_registry.get(dataset_id, stage="raw")
+        fingerprints = dataset_registry.remember(dataset_id, "fingerprints", lambda: RowFingerprintIndex.from_frame(raw))
+        with trace_span("DataCleaningTool.clean", df=raw) as span:
+            cleaned = span.output(DataCleaningTool().clean(
+                raw, drop_duplicates=self.drop_duplicates, fingerprints=fingerprints
+            ))
+        dataset_registry.set_stage(dataset_id, "cleaned", cleaned)
+        missing_before = raw.isnull().sum()
+        missing_after = cleaned.isnull().sum()
+        filled = (missing_before - missing_after).sort_values(ascending=False)
+        return json.dumps({
+            "rows_before": len(raw),
+            "rows_after": len(cleaned),
+            "rows_dropped": len(raw) - len(cleaned),
+            "duplicate_rows": fingerprints.duplicate_count(),
+            "duplicates_dropped": self.drop_duplicates,
+            "values_filled": int(filled.sum()),
+            "top_filled_columns": {col: int(n) for col, n in filled.head(MAX_SUMMARY_COLUMNS).items() if n},
+            "remaining_missing": int(missing_after.sum())
+        })
 
 class StatsAnalysisToolCrewAI(BaseTool):
     """Custom CrewAI tool for statistical analysis"""
     name: str = "statistical_analysis_tool"
-    description: str = "Generate comprehensive statistics, correlations, and data insights"
+    description: str = (
+        "Compute descriptive statistics and the strongest correlations of the registered dataset. "
+        "Input: the dataset ID. Output: compact JSON with per-column numeric summaries."
+    )
     
     def _run(self, cleaned_data: str) -> str:
         """Perform statistical analysis on cleaned data"""
-        return "Statistical analysis completed: descriptive stats, correlations, and data patterns identified"
+        dataset_id, df = _resolve(cleaned_data)
+        with trace_span(f"tool: {self.name}", df=df):
+            return dataset_registry.remember(dataset_id, "statistics", lambda: self._analyze(df))
+
+    def _analyze(self, df):
+        numeric = df.select_dtypes(include="number")
+        columns = {
+            col: {
+                "mean": _round(numeric[col].mean()),
+                "std": _round(numeric[col].std()),
+                "min": _round(numeric[col].min()),
+                "median": _round(numeric[col].median()),
+                "max": _round(numeric[col].max())
+            }
+            for col in numeric.columns[:MAX_SUMMARY_COLUMNS]
+        }
+        categorical = {
+            col: {"unique": int(df[col].nunique()), "top": str(df[col].mode().iloc[0]) if df[col].notna().any() else None}
+            for col in df.columns.difference(numeric.columns)[:MAX_SUMMARY_COLUMNS]
+        }
+        pairs = [
+            {"columns": [row.column_a, row.column_b], "corr": _round(row.correlation, 3)}
+            for row in CorrelationTool(sample_rows=1_000_000).top_pairs(df, k=MAX_SUMMARY_PAIRS).itertuples()
+        ]
+        return json.dumps({
+            "rows": len(df),
+            "numeric_columns": numeric.shape[1],
+            "numeric_summary": columns,
+            "categorical_summary": categorical,
+            "top_correlations": pairs
+        })
 
 class VisualizationToolCrewAI(BaseTool):
     """Custom CrewAI tool for data visualization"""
     name: str = "visualization_tool"
-    description: str = "Create interactive charts and visual insights from analyzed data"
+    description: str = (
+        "Profile the registered dataset's column kinds and cardinalities to choose suitable charts. "
+        "Input: the dataset ID. Output: compact JSON of chartable columns."
+    )
     
     def _run(self, analysis_results: str) -> str:
         """Generate visualizations based on analysis"""
-        return "Visualizations created: interactive charts prepared for dashboard display"
+        dataset_id, df = _resolve(analysis_results)
+        with trace_span(f"tool: {self.name}", df=df):
+            return dataset_registry.remember(dataset_id, "visualization", lambda: self._profile(df))
+
+    def _profile(self, df):
+        numeric = df.select_dtypes(include="number").columns
+        datetimes = df.select_dtypes(include="datetime").columns
+        others = df.columns.difference(numeric.union(datetimes))
+        cardinality = {col: int(df[col].nunique()) for col in others[:MAX_SUMMARY_COLUMNS]}
+        return json.dumps({
+            "numeric_columns": list(numeric[:MAX_SUMMARY_COLUMNS]),
+            "datetime_columns": list(datetimes[:MAX_SUMMARY_COLUMNS]),
+            "low_cardinality_columns": {col: n for col, n in cardinality.items() if n <= 30},
+            "high_cardinality_columns": {col: n for col, n in cardinality.items() if n > 30}
+        })
 
 class AnomalyDetectionToolCrewAI(BaseTool):
     """Custom CrewAI tool for anomaly detection"""
     name: str = "anomaly_detection_tool"
-    description: str = "Detect outliers and anomalies using statistical and ML methods"
+    description: str = (
+        "Count z-score, robust MAD and IQR outliers in every numeric column of the registered dataset. "
+        "Input: the dataset ID. Output: compact JSON of outlier counts per column and method."
+    )
     
     def _run(self, dataset_info: str) -> str:
         """Detect anomalies in the dataset"""
-        return "Anomaly detection completed: outliers identified using Z-score and Isolation Forest methods"
+        dataset_id, df = _resolve(dataset_info)
+        with trace_span(f"tool: {self.name}", df=df):
+            return dataset_registry.remember(dataset_id, "anomalies", lambda: self._detect(df))
+
+    def _detect(self, df):
+        summary = AnomalyDetectorTool().score_all(df)["summary"]
+        top = summary[summary["any method"] > 0].head(MAX_SUMMARY_COLUMNS)
+        return json.dumps({
+            "rows": len(df),
+            "columns_scanned": len(summary),
+            "rows_x_columns_flagged": int(summary["any method"].sum()),
+            "outliers_per_column": {col: {method: int(n) for method, n in counts.items()} for col, counts in top.iterrows()}
+        })
 
 class QualityAssessmentToolCrewAI(BaseTool):
     """Custom CrewAI tool for data quality assessment"""
     name: str = "quality_assessment_tool"
-    description: str = "Generate comprehensive data quality report with validation metrics"
+    description: str = (
+        "Measure missing values, duplicate rows and constant columns of the registered dataset. "
+        "Input: the dataset ID. Output: compact JSON quality metrics."
+    )
     
     def _run(self, dataset_info: str) -> str:
         """Assess data quality and generate report"""
-        return "Quality assessment completed: missing values, duplicates, and type validation analyzed"
+        dataset_id, df = _resolve(dataset_info)
+        with trace_span(f"tool: {self.name}", df=df):
+            return dataset_registry.remember(dataset_id, "quality", lambda: self._assess(df))
+
+    def _assess(self, df):
+        profile = ProfilerTool().profile(df)
+        columns = profile["columns"]
+        missing_pct = columns["missing_pct"].astype(float).sort_values(ascending=False)
+        return json.dumps({
+            "rows": profile["rows"],
+            "columns": len(columns),
+            "duplicate_rows": profile["duplicates"],
+            "missing_pct": {col: _round(pct, 2) for col, pct in missing_pct.head(MAX_SUMMARY_COLUMNS).items() if pct},
+            "constant_columns": list(columns.index[columns["distinct"] <= 1][:MAX_SUMMARY_COLUMNS])
+        })
 
 # ==================== CREWAI CONTROLLER AGENT ====================
 
 class ControllerAgent:
-    def __init__(self):
+    def __init__(self, tracer=None, drop_duplicates=False):
         self.logs = []
+        self.drop_duplicates = drop_duplicates
+        self.cleaning_report = None  # Set by execute_csv
+        # Spans for every task, tool call and controller stage of this run
+        self.tracer = tracer or TracingTool()
+        self._data_hash = ""
+        # SDA_LLM_BACKEND=local swaps in an offline stand-in model; it has no embeddings, so memory is off
+        self.llm = build_llm()
+        self.embedder = build_embedder()
+        self.memory_enabled = self.embedder is not None
+        agent_llm = {"llm": self.llm} if self.llm is not None else {}
         
         # ==================== DEFINE CREWAI AGENTS ====================
         
@@ -66,11 +231,12 @@ class ControllerAgent:
             in data preprocessing. You excel at identifying data quality issues, handling missing values 
             intelligently, standardizing data types, and preparing datasets for downstream analysis. 
             You always document your cleaning operations and ensure data integrity.""",
-            tools=[DataCleaningToolCrewAI()],
+            tools=[DataCleaningToolCrewAI(drop_duplicates=drop_duplicates)],
             verbose=True,
             allow_delegation=False,
             max_iter=3,
-            memory=True
+            memory=self.memory_enabled,
+            **agent_llm
         )
         
         self.statistics_agent = Agent(
@@ -84,7 +250,8 @@ class ControllerAgent:
             verbose=True,
             allow_delegation=False,
             max_iter=3,
-            memory=True
+            memory=self.memory_enabled,
+            **agent_llm
         )
         
         self.visualization_agent = Agent(
@@ -98,7 +265,8 @@ class ControllerAgent:
             verbose=True,
             allow_delegation=False,
             max_iter=3,
-            memory=True
+            memory=self.memory_enabled,
+            **agent_llm
         )
         
         self.anomaly_detection_agent = Agent(
@@ -112,7 +280,8 @@ class ControllerAgent:
             verbose=True,
             allow_delegation=False,
             max_iter=3,
-            memory=True
+            memory=self.memory_enabled,
+            **agent_llm
         )
         
         self.quality_assessment_agent = Agent(
@@ -126,11 +295,19 @@ class ControllerAgent:
             verbose=True,
             allow_delegation=False,
             max_iter=3,
-            memory=True
+            memory=self.memory_enabled,
+            **agent_llm
         )
         
         # ==================== CREATE CREWAI CREW ====================
         
+        # Roster of all agents; each task runs in its own single-task crew built from this config
+        self.crew_config = {
+            "process": Process.sequential,
+            "verbose": 2,  # Maximum verbosity for detailed logging
+            "memory": self.memory_enabled,  # Shared memory between agents when an embedder is available
+            "embedder": self.embedder
+        }
         self.crew = Crew(
             agents=[
                 self.data_cleaning_agent,
@@ -140,24 +317,82 @@ class ControllerAgent:
                 self.quality_assessment_agent
             ],
             tasks=[],  # Tasks created dynamically based on data
-            process=Process.sequential,  # Execute tasks in sequence for dependency management
-            verbose=2,  # Maximum verbosity for detailed logging
-            memory=True,  # Enable shared memory between agents
-            max_execution_time=300,  # 5-minute timeout for robustness
-            embedder={
-                "provider": "openai",
-                "config": {"model": "text-embedding-3-small"}
-            }
+            **self.crew_config
         )
 
-    def execute(self, df):
-        """Execute the complete CrewAI multi-agent data analysis workflow"""
-        
+    def _run_task(self, name, task):
+        """Kick off a single task in its own crew; context tasks have already produced output"""
+        with self.tracer.span(f"task: {name}", category="agent") as span:
+            key = self._cache_key(task)
+            cached = llm_cache.get(key)
+            if cached is not None:
+                # Downstream tasks read this as their context, exactly like a live run's output
+                task.output = TaskOutput(description=task.description, raw=cached["response"], agent=task.agent.role)
+                span.set(llm_cache="hit")
+                return task.output
+
+            crew = Crew(agents=[task.agent], tasks=[task], **self.crew_config)
+            result = crew.kickoff()
+            usage = getattr(result, "token_usage", None)
+            span.record_tokens(usage)
+            llm_cache.put(key, result.raw, task=name, role=task.agent.role, token_usage=span.attrs.get("total_tokens"))
+        # Time not spent inside tool calls is (almost entirely) waiting on the LLM
+        span.set(llm_seconds=max(0.0, span.wall_seconds - sum(child.wall_seconds or 0 for child in span.children)))
+        return result
+
+    def _cache_key(self, task):
+        """(backend and model, agent role, task prompt, hash of the data and upstream task outputs)"""
+        upstream = [context.output.raw for context in task.context
+                    if context.output is not None] if isinstance(task.context, list) else []
+        model = model_name(self.llm or getattr(task.agent, "llm", None))
+        return llm_cache.make_key(model, task.agent.role, task.description,
+                                  llm_cache.context_hash(self._data_hash, *upstream))
+
+    def execute(self, df, cleaning=None):
+        """Execute the complete CrewAI multi-agent data analysis workflow.
+
+        `cleaning` is the report of an out-of-core clean (`execute_csv`); `df` is then already clean.
+        """
+        with self.tracer.span("controller", category="agent", df=df) as span:
+            cleaned_df, logs = self._execute(df, cleaning)
+            span.output(cleaned_df)
+        return cleaned_df, logs
+
+    def execute_csv(self, source, output_path):
+        """Workflow for CSVs too large to parse whole: clean chunk by chunk into `output_path` first"""
+        with self.tracer.span("DataCleaningTool.clean_chunked", category="tool") as span:
+            cleaned_df, report = DataCleaningTool().clean_csv(source, output_path, drop_duplicates=self.drop_duplicates)
+            span.output(cleaned_df)
+        self.cleaning_report = report
+        self.logs.append(f"🧱 Controller: Cleaned out of core - {report['rows_in']:,} rows in {report['chunks']} chunks "
+                         f"→ {report['rows_out']:,} rows")
+        return self.execute(cleaned_df, cleaning=report)
+
+    def _execute(self, df, cleaning=None):
         self.logs.append("🚀 CrewAI Controller: Initializing multi-agent workflow...")
         
+        # Tools resolve this ID to the in-memory frame; the data itself never enters a prompt
+        dataset_id = dataset_registry.register(df)
+        if cleaning is not None:
+            # Already cleaned out of core: the cleaning tool reports that pass instead of cleaning again
+            dataset_registry.set_stage(dataset_id, "cleaned", df)
+            dataset_registry.remember(dataset_id, "cleaning", lambda: json.dumps({
+                "rows_before": cleaning["rows_in"],
+                "rows_after": cleaning["rows_out"],
+                "rows_dropped": cleaning["rows_in"] - cleaning["rows_out"],
+                "duplicates_dropped": cleaning["duplicates_dropped"],
+                "remaining_missing": int(df.isnull().sum().sum()),
+            }))
+        if llm_cache.enabled:
+            # Row fingerprints identify the data for cached responses; the cleaning tool reuses them
+            fingerprints = dataset_registry.remember(dataset_id, "fingerprints", lambda: RowFingerprintIndex.from_frame(df))
+            self._data_hash = llm_cache.context_hash(fingerprints.fingerprints, str(df.dtypes.to_dict()),
+                                                     f"drop_duplicates={self.drop_duplicates}")
+        
         # Generate dataset summary for agent context
         dataset_summary = f"""
         Dataset Analysis Request:
+        - Dataset ID (pass this to your tool): {dataset_id}
         - Total Rows: {len(df)}
         - Total Columns: {len(df.columns)}
         - Column Names: {list(df.columns)}
@@ -166,6 +401,7 @@ class ControllerAgent:
         - Memory Usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB
         """
         
+        scheduler = None
         try:
             # ==================== TASK 1: DATA CLEANING ====================
             cleaning_task = Task(
@@ -190,7 +426,7 @@ class ControllerAgent:
             
             # ==================== TASK 2: STATISTICAL ANALYSIS ====================
             statistics_task = Task(
-                description="""
+                description=f"""
                 Generate comprehensive statistical analysis of the cleaned dataset:
                 
                 Analysis Requirements:
@@ -200,6 +436,7 @@ class ControllerAgent:
                 4. Identify data distribution patterns and potential relationships
                 5. Generate insights about data quality and patterns
                 
+                Call your tool with dataset ID {dataset_id} to compute results on the real data.
                 Provide statistical insights that would be valuable for business decision-making.
                 """,
                 agent=self.statistics_agent,
@@ -210,7 +447,7 @@ class ControllerAgent:
             
             # ==================== TASK 3: VISUALIZATION STRATEGY ====================
             visualization_task = Task(
-                description="""
+                description=f"""
                 Develop visualization strategy based on statistical analysis results:
                 
                 Visualization Planning:
@@ -220,6 +457,7 @@ class ControllerAgent:
                 4. Prepare data insights that would benefit from visual representation
                 5. Consider user workflow and exploratory data analysis needs
                 
+                Call your tool with dataset ID {dataset_id} to compute results on the real data.
                 Focus on creating actionable visualization recommendations.
                 """,
                 agent=self.visualization_agent,
@@ -230,7 +468,7 @@ class ControllerAgent:
             
             # ==================== TASK 4: ANOMALY DETECTION ====================
             anomaly_detection_task = Task(
-                description="""
+                description=f"""
                 Perform comprehensive anomaly detection on the cleaned dataset:
                 
                 Detection Strategy:
@@ -240,6 +478,7 @@ class ControllerAgent:
                 4. Provide context for detected anomalies and their potential business impact
                 5. Recommend actions for handling identified outliers
                 
+                Call your tool with dataset ID {dataset_id} to compute results on the real data.
                 Focus on actionable anomaly insights for data quality improvement.
                 """,
                 agent=self.anomaly_detection_agent,
@@ -250,7 +489,7 @@ class ControllerAgent:
             
             # ==================== TASK 5: QUALITY ASSESSMENT ====================
             quality_assessment_task = Task(
-                description="""
+                description=f"""
                 Generate comprehensive data quality assessment report:
                 
                 Quality Metrics:
@@ -260,6 +499,7 @@ class ControllerAgent:
                 4. Assess overall dataset completeness and reliability
                 5. Provide data quality score and improvement recommendations
                 
+                Call your tool with dataset ID {dataset_id} to compute results on the real data.
                 Generate actionable quality insights for data governance.
                 """,
                 agent=self.quality_assessment_agent,
@@ -270,28 +510,51 @@ class ControllerAgent:
             
             # ==================== EXECUTE CREWAI WORKFLOW ====================
             
-            # Assign tasks to crew
-            self.crew.tasks = [
-                cleaning_task,
-                statistics_task, 
-                visualization_task,
-                anomaly_detection_task,
-                quality_assessment_task
-            ]
+            tasks = {
+                "Data Cleaning": cleaning_task,
+                "Statistics": statistics_task,
+                "Visualization": visualization_task,
+                "Anomaly Detection": anomaly_detection_task,
+                "Quality Assessment": quality_assessment_task
+            }
+            self.crew.tasks = list(tasks.values())
+            
+            scheduler = TaskSchedulerTool()
+            for name, task in tasks.items():
+                scheduler.add_task(
+                    name,
+                    lambda name=name, task=task: self._run_task(name, task),
+                    depends_on=TASK_DEPENDENCIES[name],
+                    timeout=TASK_TIMEOUTS[name]
+                )
             
             self.logs.append("🤖 CrewAI: Starting coordinated multi-agent execution...")
-            self.logs.append("📋 CrewAI: Task dependencies configured - sequential execution with context sharing")
+            self.logs.append("📋 CrewAI: Task dependencies configured - parallel DAG execution with context sharing")
+            
+            # Execute the task graph; independent tasks run concurrently
+            started_at = time.perf_counter()
+            task_results = scheduler.run()
+            wall_time = time.perf_counter() - started_at
             
-            # Execute the complete crew workflow
-            crew_results = self.crew.kickoff()
+            for name, outcome in task_results.items():
+                if outcome["status"] == "completed":
+                    self.logs.append(f"✅ {name}: completed in {outcome['elapsed']:.1f}s")
+                else:
+                    self.logs.append(f"⚠️ {name}: {outcome['status']} after {outcome['elapsed']:.1f}s - {outcome['error']}")
             
-            self.logs.append("✅ CrewAI: All agents completed their specialized tasks")
-            self.logs.append("🎯 CrewAI: Multi-agent collaboration successful")
-            self.logs.append(f"📊 CrewAI Workflow Summary: {len(self.crew.tasks)} tasks executed by {len(self.crew.agents)} specialized agents")
+            completed = sum(outcome["status"] == "completed" for outcome in task_results.values())
+            serial_time = sum(outcome["elapsed"] for outcome in task_results.values())
+            self.logs.append(f"🎯 CrewAI: {completed}/{len(tasks)} tasks completed")
+            self.logs.append(f"📊 CrewAI Workflow Summary: {wall_time:.1f}s wall-clock vs {serial_time:.1f}s of summed task time")
             
-            # Execute actual data cleaning for Streamlit integration
-            cleaner = DataCleaningTool()
-            cleaned_df = cleaner.clean(df)
+            # The cleaning tool already produced the frame in the registry; only clean here if
+            # the agent never called it
+            cleaned_df = dataset_registry.get(dataset_id, stage="cleaned")
+            if cleaned_df is None:
+                self.logs.append("🧹 Controller: Cleaning tool was not invoked - cleaning directly")
+                with self.tracer.span("DataCleaningTool.clean", df=df) as span:
+                    cleaned_df = span.output(DataCleaningTool().clean(df, drop_duplicates=self.drop_duplicates))
+            cleaned_df = self._compact(cleaned_df)
             
             self.logs.append("✅ Controller: Data processing pipeline completed successfully")
             self.logs.append(f"📈 Results: {len(cleaned_df)} rows, {len(cleaned_df.columns)} columns ready for analysis")
@@ -305,22 +568,48 @@ class ControllerAgent:
             # Robust fallback to original implementation
             try:
                 cleaner = DataCleaningTool()
-                cleaned_df = cleaner.clean(df)
+                with self.tracer.span("DataCleaningTool.clean (fallback)", df=df) as span:
+                    cleaned_df = df if cleaning is not None else cleaner.clean(df, drop_duplicates=self.drop_duplicates)
+                    span.output(cleaned_df)
+                cleaned_df = self._compact(cleaned_df)
                 self.logs.append("✅ Controller: Fallback execution successful")
                 return cleaned_df, self.logs
             except Exception as fallback_error:
                 self.logs.append(f"❌ Fallback Error: {str(fallback_error)}")
                 self.logs.append("🚨 Controller: Critical error - returning original data")
                 return df, self.logs
+        finally:
+            if scheduler is None:
+                dataset_registry.release(dataset_id)
+            else:
+                # Timed-out tasks keep running in the background and still resolve this ID
+                scheduler.when_idle(lambda: dataset_registry.release(dataset_id))
+
+    def _compact(self, cleaned_df):
+        """Post-clean dtype compaction; logs bytes before/after overall and for the biggest wins"""
+        with self.tracer.span("DtypeCompactionTool.compact", df=cleaned_df) as span:
+            compacted, report = DtypeCompactionTool().compact(cleaned_df)
+            span.output(compacted)
+        before, after = int(report["bytes_before"].sum()), int(report["bytes_after"].sum())
+        ratio = before / after if after else 1.0
+        self.logs.append(f"🗜️ Compaction: {before / 1024**2:.2f} MB → {after / 1024**2:.2f} MB ({ratio:.1f}x smaller)")
+        report["saved"] = report["bytes_before"] - report["bytes_after"]
+        for row in report[report["saved"] > 0].nlargest(MAX_SUMMARY_COLUMNS, "saved").itertuples():
+            self.logs.append(
+                f"   • {row.column}: {row.dtype_before} → {row.dtype_after}, "
+                f"{row.bytes_before / 1024:,.0f} KB → {row.bytes_after / 1024:,.0f} KB"
+            )
+        return compacted
 
     def get_agent_summary(self):
         """Return summary of CrewAI agents for demonstration purposes"""
         return {
             "total_agents": len(self.crew.agents),
             "agent_roles": [agent.role for agent in self.crew.agents],
-            "process_type": "Sequential with Context Sharing",
-            "memory_enabled": True,
-            "max_execution_time": "300 seconds",
+            "process_type": "Parallel DAG with Context Sharing",
+            "memory_enabled": self.memory_enabled,
+            "llm_cache": llm_cache.stats(),
+            "max_execution_time": {name: f"{seconds} seconds" for name, seconds in TASK_TIMEOUTS.items()},
             "tools_per_agent": {agent.role: len(agent.tools) for agent in self.crew.agents}
         }
     
@@ -334,12 +623,8 @@ class ControllerAgent:
                 "4. Anomaly Detection Agent - Outlier Identification",
                 "5. Quality Assessment Agent - Validation Report"
             ],
-            "task_dependencies": {
-                "Statistics": ["Data Cleaning"],
-                "Visualization": ["Data Cleaning", "Statistics"], 
-                "Anomaly Detection": ["Data Cleaning"],
-                "Quality Assessment": ["Data Cleaning"]
-            },
+            "task_dependencies": {name: deps for name, deps in TASK_DEPENDENCIES.items() if deps},
+            "critical_path": ["Data Cleaning", "Statistics", "Visualization"],
             "memory_sharing": "Context passed between dependent tasks",
             "error_handling": "Multi-level fallback with graceful degradation"
         }
\ No newline at end of file
@@ -1,19 +1,23 @@
 import pandas as pd
+from tools.profiler_tool import ProfilerTool
 
 class DataQualityAgent:
     def __init__(self):
-        pass
+        self.profiler = ProfilerTool()
 
-    def generate_report(self, df: pd.DataFrame) -> pd.DataFrame:
+    def generate_report(self, df: pd.DataFrame, profile: dict = None, fingerprints=None) -> pd.DataFrame:
+        # Built from the shared one-pass profile; pass `profile` to reuse one already computed
+        columns = (profile or self.profiler.profile(df, fingerprints))["columns"]
+        numeric = columns["dtype"].map(pd.api.types.is_numeric_dtype).astype(bool)
         report = pd.DataFrame({
-            'Column': df.columns,
-            'Data Type': df.dtypes.values,
-            'Missing Values': df.isnull().sum().values,
-            'Missing %': (df.isnull().sum() / len(df) * 100).round(2).values,
-            'Unique Values': df.nunique().values,
-            'Min': [df[col].min() if pd.api.types.is_numeric_dtype(df[col]) else '' for col in df.columns],
-            'Max': [df[col].max() if pd.api.types.is_numeric_dtype(df[col]) else '' for col in df.columns],
-            'Sample Value': [df[col].dropna().iloc[0] if not df[col].dropna().empty else '' for col in df.columns],
+            'Column': columns.index,
+            'Data Type': columns["dtype"].values,
+            'Missing Values': columns["missing"].values,
+            'Missing %': columns["missing_pct"].astype(float).round(2).values,
+            'Unique Values': columns["distinct"].values,
+            'Min': columns["min"].where(numeric, '').values,
+            'Max': columns["max"].where(numeric, '').values,
+            'Sample Value': columns["sample"].where(columns["sample"].notna(), '').values,
         })
 
         return report
@@ -1,35 +1,43 @@
 # agents/feature_generation_agent.py
 
 import pandas as pd
+from tools.feature_engine_tool import FeatureEngineTool, OPERATORS
 
 class FeatureGenerationAgent:
+    # Every method returns only the new column(s), never a copy of the input frame
+
+    def __init__(self, dataset_key=None, overlay_columns=()):
+        # Keys the parsed-datetime cache, so repeated date features skip re-parsing;
+        # session-derived columns differ from the shared dataset and are never cached under its key
+        self.dataset_key = dataset_key
+        self.overlay_columns = overlay_columns
+
     def create_math_feature(self, df, col1, col2, operation, new_col):
-        df_copy = df.copy()
+        if operation not in OPERATORS:
+            print(f"❌ Error creating math feature: unsupported operation '{operation}'")
+            return pd.DataFrame(index=df.index)
+        kind = {"kind": "ratio", "numerator": col1, "denominator": col2} if operation == '/' else \
+            {"kind": "expr", "expr": f"`{col1}` {operation} `{col2}`"}
+        return self.create_features(df, [{"name": new_col, **kind}])
+
+    def create_date_feature(self, df, date_col, part, new_col):
+        return self.create_features(df, [{"name": new_col, "kind": "date", "column": date_col, "part": part}])
+
+    def create_features(self, df, specs):
+        """Evaluate a batch of feature specs in one pass over `df`"""
         try:
-            if operation == '+':
-                df_copy[new_col] = df_copy[col1] + df_copy[col2]
-            elif operation == '-':
-                df_copy[new_col] = df_copy[col1] - df_copy[col2]
-            elif operation == '*':
-                df_copy[new_col] = df_copy[col1] * df_copy[col2]
-            elif operation == '/':
-                df_copy[new_col] = df_copy[col1] / df_copy[col2]
+            return self._engine(df).add(specs).evaluate()
         except Exception as e:
-            print(f"❌ Error creating math feature: {e}")
-        return df_copy
+            print(f"❌ Error creating features: {e}")
+            return pd.DataFrame(index=df.index)
 
-    def create_date_feature(self, df, date_col, part, new_col):
-        df_copy = df.copy()
+    def _engine(self, df):
+        return FeatureEngineTool(df, cache=False, dataset_key=self.dataset_key, overlay_columns=self.overlay_columns)
+
+    def create_expression_features(self, df, text):
+        """Evaluate "name = expression" lines, e.g. "margin = revenue - cost" """
         try:
-            df_copy[date_col] = pd.to_datetime(df_copy[date_col], errors='coerce')
-            if part == 'year':
-                df_copy[new_col] = df_copy[date_col].dt.year
-            elif part == 'month':
-                df_copy[new_col] = df_copy[date_col].dt.month
-            elif part == 'day':
-                df_copy[new_col] = df_copy[date_col].dt.day
-            elif part == 'weekday':
-                df_copy[new_col] = df_copy[date_col].dt.day_name()
+            return self._engine(df).parse(text).evaluate()
         except Exception as e:
-            print(f"❌ Error extracting date feature: {e}")
-        return df_copy
+            print(f"❌ Error creating features: {e}")
+            return pd.DataFrame(index=df.index)
@@ -1,13 +1,25 @@
 import pandas as pd
+from tools.correlation_tool import CorrelationTool
+from tools.stats_engine_tool import StatsEngineTool
 
 class StatsAgent:
     def __init__(self):
         self.name = "StatsAgent"
+        self.engine = StatsEngineTool()
+        self.correlation = CorrelationTool(sample_rows=1_000_000)
 
     def analyze(self, df: pd.DataFrame):
-        description = df.describe(include='all').transpose()
-        correlation = df.corr(numeric_only=True)
+        # One chunked pass with mergeable sketches instead of describe(include='all');
+        # quartiles are approximate, with their rank error bound in 'quantile_rank_error'
+        description = self.engine.analyze(df)
+        # Wide data: only the strongest pairs and a clustered, truncated matrix are kept
+        correlation = self.correlation.summary(df, k=20, max_columns=30)
         return {
             "description": description,
-            "correlation": correlation
+            "correlation": correlation["clustered"],
+            "top_correlations": correlation["top_pairs"]
         }
+
+    def analyze_csv(self, source, **read_kwargs):
+        """Describe a CSV too large for memory, chunk by chunk"""
+        return self.engine.describe(self.engine.sketch_csv(source, **read_kwargs))
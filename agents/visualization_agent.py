@@ -1,14 +1,80 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
+import plotly.io as pio
+from memory.artifact_cache import ArtifactCache
+from tools.csv_ingestion_tool import DatasetSchema
 from tools.visualization_tool import VisualizationTool
 
 class VisualizationAgent:
-    def __init__(self):
+    def __init__(self, max_workers=None):
         self.tool = VisualizationTool()
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        # Build time of each chart from the most recent generate_all; 0.0 for cache hits
+        self.last_build_times = {}
+
+    def plan_charts(self, df: pd.DataFrame, schema: DatasetSchema = None):
+        """Pick chart specs from the column kinds; charts the data can't support are left out"""
+        schema = schema or DatasetSchema.from_frame(df)
+        numeric = [col for col in schema.numeric_columns if col in df.columns]
+        categorical = [col for col in schema.categorical_columns if col in df.columns]
 
-    def generate_all(self, df: pd.DataFrame):
-        return {
-            "bar": self.tool.create_bar_chart(df),
-            "pie": self.tool.create_pie_chart(df),
-            "scatter": self.tool.create_scatter_plot(df),
-            "heatmap": self.tool.create_correlation_heatmap(df)
+        specs = {}
+        if categorical and numeric:
+            specs["bar"] = {"chart": "bar"}
+        if categorical:
+            specs["pie"] = {"chart": "pie"}
+        if len(numeric) >= 2:
+            specs["scatter"] = {"chart": "scatter"}
+            specs["heatmap"] = {"chart": "heatmap"}
+        return specs
+
+    def build_chart(self, df: pd.DataFrame, spec: dict):
+        # A tool per call: builds run concurrently and each records its own timing
+        tool = VisualizationTool()
+        options = {key: value for key, value in spec.items() if key != "chart"}
+        builders = {
+            "bar": tool.create_bar_chart,
+            "pie": tool.create_pie_chart,
+            "scatter": tool.create_scatter_plot,
+            "heatmap": tool.create_correlation_heatmap,
         }
+        return builders[spec["chart"]](df, **options), tool.last_build
+
+    def generate_all(self, df: pd.DataFrame, schema: DatasetSchema = None, dataset_key: str = None,
+                     cache: ArtifactCache = None):
+        """Build every planned chart in a worker pool; figure JSON is cached per (dataset, spec)"""
+        specs = self.plan_charts(df, schema)
+        figures, pending = {}, {}
+        self.last_build_times = {}
+        for name, spec in specs.items():
+            key = self._figure_key(dataset_key, spec) if cache is not None and dataset_key else None
+            cached = cache.get(key) if key else None
+            if cached is not None:
+                figures[name] = pio.from_json(cached)
+                self.last_build_times[name] = 0.0
+            else:
+                pending[name] = (spec, key)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {name: pool.submit(self.build_chart, df, spec) for name, (spec, _) in pending.items()}
+                for name, future in futures.items():
+                    try:
+                        fig, build = future.result()
+                    except Exception as e:
+                        print(f"⚠️ Could not build {name} chart: {e}")
+                        continue
+                    figures[name] = fig
+                    self.last_build_times[name] = build["aggregate_seconds"] + build["figure_seconds"]
+                    key = pending[name][1]
+                    if key:
+                        cache.put(key, fig.to_json())
+
+        return {name: figures[name] for name in specs if name in figures}
+
+    @staticmethod
+    def _figure_key(dataset_key, spec):
+        return ArtifactCache.make_key(dataset_key.encode(), "figure", json.dumps(spec, sort_keys=True, default=str))
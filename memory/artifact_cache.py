@@ -0,0 +1,183 @@
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Bump whenever cleaning/stats/quality logic changes so stale artifacts are never served
+PIPELINE_VERSION = "10"
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SDA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "smart_data_analyzer", "artifacts")
+)
+
+
+def estimate_size(value) -> int:
+    """Approximate in-memory footprint of a cached artifact in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)  # numpy arrays, RowFingerprintIndex
+    return sys.getsizeof(value)
+
+
+class ArtifactCache:
+    """Two-tier (memory LRU + pickle-on-disk) cache for pipeline artifacts keyed by content hash"""
+
+    def __init__(self, max_bytes=512 * 1024**2, cache_dir=DEFAULT_CACHE_DIR, max_disk_bytes=4 * 1024**3):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._current_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(data: bytes, *parts) -> str:
+        """Hash the raw upload bytes together with the pipeline version and any extra parts"""
+        digest = hashlib.sha256()
+        digest.update(PIPELINE_VERSION.encode())
+        for part in parts:
+            digest.update(b"\x00" + str(part).encode())
+        digest.update(b"\x00")
+        digest.update(data)
+        return digest.hexdigest()
+
+    # ==================== MEMORY TIER ====================
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        value = self._read_disk(key)
+        if value is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self._put_memory(key, value)
+        return value
+
+    def put(self, key, value):
+        self._put_memory(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._current_bytes -= entry[1]
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "memory_bytes": self._current_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def _put_memory(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._current_bytes -= old[1]
+            if size > self.max_bytes:
+                # Too big for the memory tier; the disk tier still serves it
+                return
+            self._entries[key] = (value, size)
+            self._current_bytes += size
+            while self._current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+
+    # ==================== DISK TIER ====================
+
+    def _disk_path(self, key):
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _read_disk(self, key):
+        path = self._disk_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as fh:
+                value = pickle.load(fh)
+            os.utime(path)  # Refresh recency for disk-side LRU
+            return value
+        except Exception as e:
+            print(f"⚠️ Discarding unreadable cache entry {key}: {e}")
+            os.remove(path)
+            return None
+
+    def _write_disk(self, key, value):
+        path = self._disk_path(key)
+        if not path:
+            return
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ Failed to persist cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
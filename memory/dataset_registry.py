@@ -0,0 +1,66 @@
+import re
+import threading
+import uuid
+
+import pandas as pd
+
+DATASET_ID_PATTERN = re.compile(r"ds-[0-9a-f]{12}")
+
+
+class DatasetRegistry:
+    """Process-wide map of dataset IDs to in-memory DataFrames, one entry per pipeline stage.
+
+    Tools receive only the short ID in their prompt and resolve it to the same object the
+    controller registered, so no frame is ever serialized into an LLM prompt.
+    """
+
+    def __init__(self):
+        self._datasets = {}  # dataset_id -> {stage: DataFrame}
+        self._results = {}  # (dataset_id, key) -> cached tool output
+        self._lock = threading.RLock()
+
+    def register(self, df: pd.DataFrame, stage: str = "raw") -> str:
+        dataset_id = f"ds-{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self._datasets[dataset_id] = {stage: df}
+        return dataset_id
+
+    def set_stage(self, dataset_id: str, stage: str, df: pd.DataFrame):
+        with self._lock:
+            self._datasets[dataset_id][stage] = df
+
+    def get(self, dataset_id: str, stage: str = None) -> pd.DataFrame:
+        """Return the requested stage, or the most processed one available"""
+        with self._lock:
+            stages = self._datasets.get(dataset_id)
+            if stages is None:
+                raise KeyError(f"Unknown dataset ID '{dataset_id}'")
+            if stage is not None:
+                return stages.get(stage)
+            return stages.get("cleaned", stages.get("raw"))
+
+    def remember(self, dataset_id: str, key: str, compute):
+        """Memoize a tool result per dataset so repeated tool calls by an agent are free"""
+        with self._lock:
+            if (dataset_id, key) in self._results:
+                return self._results[(dataset_id, key)]
+        value = compute()
+        with self._lock:
+            return self._results.setdefault((dataset_id, key), value)
+
+    def release(self, dataset_id: str):
+        with self._lock:
+            self._datasets.pop(dataset_id, None)
+            for key in [key for key in self._results if key[0] == dataset_id]:
+                del self._results[key]
+
+    @staticmethod
+    def parse_id(text: str) -> str:
+        """Pull a dataset ID out of free-form tool input written by an LLM"""
+        match = DATASET_ID_PATTERN.search(str(text))
+        if match is None:
+            raise KeyError(f"No dataset ID found in tool input: {text!r}")
+        return match.group(0)
+
+
+dataset_registry = DatasetRegistry()
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from tools.dtype_compaction_tool import infer_date_format
+
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Field lookups on a DatetimeIndex viewed over the cached int64 array (no parsing, no copies)
+DATE_PARTS = {
+    "year": lambda idx: idx.year,
+    "month": lambda idx: idx.month,
+    "day": lambda idx: idx.day,
+    "hour": lambda idx: idx.hour,
+    "quarter": lambda idx: idx.quarter,
+    "week": lambda idx: idx.isocalendar()["week"].to_numpy(),
+    "weekday": lambda idx: pd.Categorical.from_codes(
+        np.nan_to_num(np.asarray(idx.dayofweek, dtype=np.float64), nan=-1).astype(np.int8), categories=WEEKDAY_NAMES
+    ),
+}
+
+
+class DatetimeCache:
+    """Parsed datetime columns as int64 nanoseconds, keyed by (dataset_key, column).
+
+    Each column is parsed once, with a strptime format inferred from a sample instead of
+    per-element guessing; every later date-part extraction reads the cached array. The key must
+    name data that never changes under it: pass dataset_key=None for session-derived columns.
+    """
+
+    def __init__(self, max_bytes=256 * 1024**2, min_format_ratio=0.95):
+        self.max_bytes = max_bytes
+        self.min_format_ratio = min_format_ratio
+        self._entries = OrderedDict()  # (dataset_key, column) -> (int64 array, format)
+        self._current_bytes = 0
+        self._lock = threading.RLock()
+
+    def nanoseconds(self, dataset_key, column, series: pd.Series) -> np.ndarray:
+        """int64 ns since epoch (NaT as the int64 minimum); parsed only on the first call"""
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return self._to_ns(series)
+
+        key = (dataset_key, column)
+        with self._lock:
+            if dataset_key is not None and key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+
+        values, fmt = self._parse(series)
+        if dataset_key is not None:
+            with self._lock:
+                self._entries[key] = (values, fmt)
+                self._current_bytes += values.nbytes
+                while self._current_bytes > self.max_bytes and len(self._entries) > 1:
+                    _, (evicted, _) = self._entries.popitem(last=False)
+                    self._current_bytes -= evicted.nbytes
+        return values
+
+    def extract(self, dataset_key, column, series: pd.Series, part: str) -> pd.Series:
+        if part not in DATE_PARTS:
+            raise ValueError(f"Unknown date part '{part}'")
+        index = pd.DatetimeIndex(self.nanoseconds(dataset_key, column, series).view("M8[ns]"))
+        return pd.Series(DATE_PARTS[part](index), index=series.index)
+
+    def invalidate(self, dataset_key=None):
+        with self._lock:
+            for key in [key for key in self._entries if dataset_key is None or key[0] == dataset_key]:
+                self._current_bytes -= self._entries.pop(key)[0].nbytes
+
+    def _parse(self, series):
+        fmt = infer_date_format(series, self.min_format_ratio)
+        # Dates repeat heavily in most tables, so each distinct string is parsed only once
+        codes, uniques = pd.factorize(series)
+        parsed = pd.Series(pd.to_datetime(uniques, format=fmt or "mixed", errors="coerce"))
+        unique_ns = np.append(self._to_ns(parsed), np.iinfo(np.int64).min)  # code -1 (missing) -> NaT
+        return unique_ns[codes], fmt
+
+    @staticmethod
+    def _to_ns(parsed):
+        if parsed.dt.tz is not None:
+            parsed = parsed.dt.tz_localize(None)  # Date parts follow the local wall clock
+        return parsed.dt.as_unit("ns").to_numpy().view(np.int64)
+
+
+datetime_cache = DatetimeCache()
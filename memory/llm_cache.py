@@ -0,0 +1,249 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+
+from memory.artifact_cache import PIPELINE_VERSION
+from memory.dataset_registry import DATASET_ID_PATTERN
+
+try:
+    from crewai.llms.base_llm import BaseLLM
+except ImportError:
+    try:
+        from crewai import BaseLLM
+    except ImportError:
+        BaseLLM = None
+
+# openai: CrewAI's configured provider; local: deterministic offline stand-in, no memory/embedder
+LLM_BACKEND = os.environ.get("SDA_LLM_BACKEND", "openai")
+# off: always call the model; record: serve hits, call and store misses; replay: serve hits, fail misses.
+# The local stand-in only records when asked to explicitly.
+LLM_CACHE_MODE = os.environ.get("SDA_LLM_CACHE", "off" if LLM_BACKEND == "local" else "record")
+EMBEDDER_MODEL = os.environ.get("SDA_EMBEDDER_MODEL", "text-embedding-3-small")
+DEFAULT_LLM_CACHE_DIR = os.environ.get(
+    "SDA_LLM_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "smart_data_analyzer", "llm")
+)
+CACHE_MODES = ("off", "record", "replay")
+
+TOOL_NAME_PATTERN = re.compile(r"Tool Name: ([\w-]+)")
+TOOL_ARGUMENT_PATTERN = re.compile(r"Tool Arguments: \{['\"](\w+)['\"]")
+MAX_ANSWER_CHARS = 4000
+
+
+class LLMCacheMiss(KeyError):
+    """Raised in replay mode when a task has no recorded response"""
+
+
+class LLMResponseCache:
+    """Persistent task-level LLM responses keyed on (model, agent role, task prompt, context hash).
+
+    Dataset IDs are random per upload, so they are masked out of the prompt before hashing;
+    the context hash carries what actually identifies the data and the upstream task outputs.
+    Keys also include PIPELINE_VERSION, so tool changes never serve stale answers.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_LLM_CACHE_DIR, mode=LLM_CACHE_MODE, max_entries=1024,
+                 max_disk_bytes=256 * 1024**2):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode '{mode}', expected one of {CACHE_MODES}")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()  # key -> entry, least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.enabled and self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    @staticmethod
+    def make_key(model, role, prompt, context="") -> str:
+        """`model` names the backend and model (e.g. "openai:gpt-4o"); answers never cross models"""
+        digest = hashlib.sha256()
+        for part in (PIPELINE_VERSION, model, role, DATASET_ID_PATTERN.sub("<dataset>", prompt), context):
+            digest.update(str(part).encode())
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @staticmethod
+    def context_hash(*parts) -> str:
+        """Hash of data fingerprints / upstream outputs; bytes-like parts are hashed as-is"""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = DATASET_ID_PATTERN.sub("<dataset>", part).encode()
+            elif not isinstance(part, bytes):
+                part = part.tobytes()  # numpy arrays, e.g. row fingerprints
+            digest.update(part)
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Recorded response dict or None; replay mode raises LLMCacheMiss instead of None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._put_memory(key, entry)
+        with self._lock:
+            if entry is not None:
+                self.hits += 1
+                return entry
+            self.misses += 1
+        if self.mode == "replay":
+            raise LLMCacheMiss(f"No recorded LLM response for key {key[:12]} (SDA_LLM_CACHE=replay)")
+        return None
+
+    def put(self, key, response: str, **metadata):
+        if self.mode != "record":
+            return
+        entry = {"response": response, **metadata}
+        self._put_memory(key, entry)
+        if self.cache_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump(entry, f, default=str)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self._evict_disk()
+
+    def stats(self):
+        with self._lock:
+            return {"mode": self.mode, "entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _put_memory(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)  # Refresh recency for disk-side LRU
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def _evict_disk(self):
+        """Drop least recently used responses once the directory exceeds max_disk_bytes"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+
+def respond_locally(messages) -> str:
+    """Deterministic ReAct turn: call the agent's tool on the dataset once, then answer with its output"""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    text = "\n".join(str(message.get("content", "")) for message in messages)
+
+    # The format instructions mention "Observation:" too; only the executor's replies carry tool output
+    observed = [str(message.get("content", "")) for message in messages
+                if message.get("role") == "assistant" and "Observation:" in str(message.get("content", ""))]
+    if observed:
+        observation = observed[-1].rsplit("Observation:", 1)[1].strip()
+        return f"Thought: I now know the final answer\nFinal Answer: {observation[:MAX_ANSWER_CHARS]}"
+
+    tool = TOOL_NAME_PATTERN.search(text)
+    dataset = DATASET_ID_PATTERN.search(text)
+    if tool is None or dataset is None:
+        return "Thought: I now know the final answer\nFinal Answer: No tool output available for this task."
+    argument = TOOL_ARGUMENT_PATTERN.search(text)
+    action_input = json.dumps({argument.group(1) if argument else "dataset_info": dataset.group(0)})
+    return (
+        f"Thought: I should run {tool.group(1)} on the dataset\n"
+        f"Action: {tool.group(1)}\n"
+        f"Action Input: {action_input}"
+    )
+
+
+if BaseLLM is not None:
+    class LocalLLM(BaseLLM):
+        """Offline stand-in model: no network, same output for the same prompt"""
+
+        def __init__(self, model="local/deterministic", temperature=0.0):
+            super().__init__(model=model, temperature=temperature)
+
+        def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+            return respond_locally(messages)
+
+        def supports_function_calling(self) -> bool:
+            return False
+
+        def supports_stop_words(self) -> bool:
+            return True
+
+        def get_context_window_size(self) -> int:
+            return 128_000
+else:
+    LocalLLM = None
+
+
+def build_llm(backend=LLM_BACKEND):
+    """Model instance for the agents, or None to keep CrewAI's default provider"""
+    if backend == "local":
+        if LocalLLM is None:
+            print("⚠️ This CrewAI version has no BaseLLM; using the default LLM provider")
+            return None
+        return LocalLLM()
+    return None
+
+
+def model_name(llm=None, backend=LLM_BACKEND) -> str:
+    """Backend and model identity used in cache keys"""
+    model = getattr(llm, "model", None) or os.environ.get("OPENAI_MODEL_NAME") or os.environ.get("MODEL") or "default"
+    return f"{backend}:{model}"
+
+
+def build_embedder(backend=LLM_BACKEND):
+    """Crew embedder config, or None when crew memory should be off (local backend)"""
+    if backend == "local":
+        return None
+    return {"provider": "openai", "config": {"model": EMBEDDER_MODEL}}
+
+
+llm_cache = LLMResponseCache()
@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _load_tapas():
+    from transformers import pipeline
+    return pipeline("table-question-answering", model="google/tapas-large-finetuned-wtq")
+
+
+def _load_falcon():
+    from transformers import pipeline
+    return pipeline("text-generation", model="tiiuae/falcon-rw-1b", max_new_tokens=120)
+
+
+def quantize_pipeline(pipe):
+    """Swap the pipeline's model for an int8 dynamic-quantized copy (CPU inference only)"""
+    import torch
+    pipe.model = torch.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipe
+
+
+class _ModelEntry:
+    def __init__(self, loader):
+        self.loader = loader
+        self.model = None
+        self.lock = threading.Lock()
+        self.last_used = 0.0
+        self.load_seconds = None
+        self.first_inference_seconds = None
+        self.steady_calls = 0
+        self.steady_seconds = 0.0
+
+
+class ModelRegistry:
+    """Loads each model once per process on first use and shares it across Streamlit sessions.
+
+    Models idle for longer than `idle_seconds` are dropped. Before a model is loaded, while free
+    system memory is below `min_available_bytes`, least recently used models are dropped to make
+    room; the model being requested is never the one evicted.
+    """
+
+    def __init__(self, idle_seconds=1800, min_available_bytes=1 * 1024**3):
+        self.idle_seconds = idle_seconds
+        self.min_available_bytes = min_available_bytes
+        self.quantize_default = os.environ.get("SDA_QUANTIZE_MODELS", "0") == "1"
+        self._loaders = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        with self._lock:
+            self._loaders[name] = loader
+
+    def get(self, name, quantize=None):
+        key, entry = self._entry(name, quantize)
+        with entry.lock:  # Only the first caller loads; concurrent sessions wait for it
+            return self._ensure_loaded(key, entry)
+
+    def run(self, name, *args, quantize=None, **kwargs):
+        """Call the model under its lock, recording first-inference and steady-state latency"""
+        key, entry = self._entry(name, quantize)
+        with entry.lock:
+            self._ensure_loaded(key, entry)
+            started_at = time.perf_counter()
+            output = entry.model(*args, **kwargs)
+            elapsed = time.perf_counter() - started_at
+            if entry.first_inference_seconds is None:
+                entry.first_inference_seconds = elapsed
+            else:
+                entry.steady_calls += 1
+                entry.steady_seconds += elapsed
+            entry.last_used = time.time()
+        return output
+
+    def evict_idle(self, keep=None):
+        """Drop models unused for `idle_seconds`, except `keep`"""
+        now = time.time()
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if key != keep and entry.model is not None and now - entry.last_used > self.idle_seconds:
+                    self._unload(key)
+
+    def make_room(self, keep=None):
+        """Drop least recently used models (never `keep`) while free memory is below the threshold"""
+        with self._lock:
+            loaded = sorted((entry.last_used, key) for key, entry in self._entries.items()
+                            if entry.model is not None and key != keep)
+            for _, key in loaded:
+                if not self._under_memory_pressure():
+                    break
+                self._unload(key)
+
+    def latency_report(self):
+        report = {}
+        with self._lock:
+            entries = list(self._entries.items())
+        for key, entry in entries:
+            report[key] = {
+                "loaded": entry.model is not None,
+                "load_seconds": entry.load_seconds,
+                "first_inference_seconds": entry.first_inference_seconds,
+                "steady_state_seconds": entry.steady_seconds / entry.steady_calls if entry.steady_calls else None,
+                "steady_state_calls": entry.steady_calls,
+            }
+        return report
+
+    def _entry(self, name, quantize):
+        quantize = self.quantize_default if quantize is None else quantize
+        key = f"{name}:int8" if quantize else name
+        self.evict_idle(keep=key)
+
+        with self._lock:
+            if name not in self._loaders:
+                raise KeyError(f"No model registered under '{name}'")
+            entry = self._entries.get(key)
+            if entry is None:
+                loader = self._loaders[name]
+                entry = _ModelEntry((lambda: quantize_pipeline(loader())) if quantize else loader)
+                self._entries[key] = entry
+        return key, entry
+
+    def _ensure_loaded(self, key, entry):
+        # Caller holds entry.lock
+        if entry.model is None:
+            # Memory pressure only matters when something new is about to be loaded
+            self.make_room(keep=key)
+            started_at = time.perf_counter()
+            entry.model = entry.loader()
+            entry.load_seconds = time.perf_counter() - started_at
+            entry.first_inference_seconds = None
+            entry.steady_calls, entry.steady_seconds = 0, 0.0
+            print(f"✅ Model '{key}' loaded in {entry.load_seconds:.1f}s")
+        entry.last_used = time.time()
+        return entry.model
+
+    def _unload(self, key):
+        entry = self._entries[key]
+        if not entry.lock.acquire(blocking=False):
+            return  # In use right now; try again on the next sweep
+        try:
+            entry.model = None
+            print(f"♻️ Model '{key}' evicted")
+        finally:
+            entry.lock.release()
+
+    def _under_memory_pressure(self):
+        if psutil is None:
+            return False
+        return psutil.virtual_memory().available < self.min_available_bytes
+
+
+model_registry = ModelRegistry()
+model_registry.register("tapas", _load_tapas)
+model_registry.register("falcon", _load_falcon)
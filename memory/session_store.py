@@ -0,0 +1,198 @@
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "SDA_SESSION_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "smart_data_analyzer", "datasets")
+)
+# Overlays of sessions idle this long are dropped; Streamlit has no session-end hook
+OVERLAY_TTL_SECONDS = float(os.environ.get("SDA_OVERLAY_TTL", 3600))
+# Dataset files beyond this total are deleted least recently used first (open ones are kept)
+MAX_STORE_BYTES = int(os.environ.get("SDA_SESSION_MAX_BYTES", 8 * 1024**3))
+
+
+class SessionStore:
+    """Cleaned datasets persisted as Arrow IPC files and memory-mapped read-only.
+
+    Every session opening the same dataset gets a frame over the same mapped pages, so resident
+    memory grows with the number of distinct datasets, not sessions. Per-session changes live
+    in small column overlays (`set_column` / `frame`) and never touch the shared base. Mapped
+    frames are kept for the most recently used datasets only, and overlays expire with their
+    session (`drop_session`) or after `overlay_ttl` seconds without use. A dataset's file is
+    deleted once it is neither mapped nor used by any session, and the directory is capped at
+    `max_disk_bytes`; a deleted dataset simply reports `exists() == False` and is rebuilt.
+    """
+
+    MAX_OPEN_DATASETS = 8
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR, overlay_ttl=OVERLAY_TTL_SECONDS, max_disk_bytes=MAX_STORE_BYTES):
+        self.store_dir = store_dir
+        self.overlay_ttl = overlay_ttl
+        self.max_disk_bytes = max_disk_bytes
+        self._frames = OrderedDict()  # dataset_key -> mapped DataFrame (or in-memory fallback without pyarrow)
+        self._overlays = {}  # (session_id, dataset_key) -> {column: Series}
+        self._last_used = {}  # (session_id, dataset_key) -> time.monotonic() of last access
+        self._versions = {}  # (session_id, dataset_key) -> overlay version, bumped on every column write
+        self._version_counter = itertools.count(1)
+        self._lock = threading.RLock()
+        if self.store_dir and pa is not None:
+            os.makedirs(self.store_dir, exist_ok=True)
+
+    def path(self, dataset_key):
+        return os.path.join(self.store_dir, f"{dataset_key}.arrow")
+
+    def exists(self, dataset_key) -> bool:
+        with self._lock:
+            if dataset_key in self._frames:
+                return True
+        return pa is not None and os.path.exists(self.path(dataset_key))
+
+    def persist(self, dataset_key, df: pd.DataFrame) -> pd.DataFrame:
+        """Write the dataset once (uncompressed, so it can be mapped) and return the mapped frame"""
+        if pa is None:
+            with self._lock:
+                if dataset_key not in self._frames:
+                    self._remember_frame(dataset_key, df)
+                return self._frames[dataset_key]
+
+        path = self.path(dataset_key)
+        if not os.path.exists(path):
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)  # Atomic, so concurrent sessions never map a partial file
+        df = self.open(dataset_key)
+        self._evict_disk()
+        return df
+
+    def open(self, dataset_key) -> pd.DataFrame:
+        """Shared read-only frame; numeric columns are zero-copy views of the mapped file"""
+        with self._lock:
+            if dataset_key in self._frames:
+                self._frames.move_to_end(dataset_key)
+                return self._frames[dataset_key]
+            if pa is None:
+                raise KeyError(f"Dataset '{dataset_key}' is not in the session store")
+            path = self.path(dataset_key)
+            source = pa.memory_map(path, "r")
+            os.utime(path)  # Refresh recency for the directory's LRU cap
+            table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas(split_blocks=True)
+            self._remember_frame(dataset_key, df)
+            return df
+
+    def _remember_frame(self, dataset_key, df):
+        self._frames[dataset_key] = df
+        # Without pyarrow the frames are the only copy, so nothing can be evicted and reopened
+        while pa is not None and len(self._frames) > self.MAX_OPEN_DATASETS:
+            evicted, _ = self._frames.popitem(last=False)
+            self._delete_if_unused(evicted)
+
+    def overlay(self, session_id, dataset_key) -> dict:
+        """Mutable {column: Series} of this session's derived columns for the dataset"""
+        with self._lock:
+            self.expire_idle()
+            self._last_used[(session_id, dataset_key)] = time.monotonic()
+            return self._overlays.setdefault((session_id, dataset_key), {})
+
+    def set_column(self, session_id, dataset_key, name, values):
+        """Add or replace a derived column; bumps the overlay version so caches keyed on it miss"""
+        with self._lock:
+            self.overlay(session_id, dataset_key)[name] = values
+            self._versions[(session_id, dataset_key)] = next(self._version_counter)
+        return values
+
+    def overlay_token(self, session_id, dataset_key):
+        """Identifies the frame `frame()` returns: None for the plain shared base, else unique per overlay version"""
+        with self._lock:
+            version = self._versions.get((session_id, dataset_key))
+            return None if version is None else (session_id, version)
+
+    def frame(self, session_id, dataset_key) -> pd.DataFrame:
+        """Shared base plus this session's overlay columns; base columns are not copied"""
+        base = self.open(dataset_key)
+        columns = self.overlay(session_id, dataset_key)
+        if not columns:
+            return base.copy(deep=False)
+        view = base.copy(deep=False)
+        for name, values in columns.items():
+            view[name] = values
+        return view
+
+    def drop_overlay(self, session_id, dataset_key):
+        with self._lock:
+            self._overlays.pop((session_id, dataset_key), None)
+            self._last_used.pop((session_id, dataset_key), None)
+            self._versions.pop((session_id, dataset_key), None)
+            if dataset_key not in self._frames:
+                self._delete_if_unused(dataset_key)  # Its mapping was already released
+
+    def drop_session(self, session_id):
+        with self._lock:
+            for key in [key for key in self._overlays if key[0] == session_id]:
+                self.drop_overlay(*key)
+
+    def expire_idle(self, now=None):
+        """Drop overlays not used for `overlay_ttl` seconds (sessions that ended without notice)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for key in [key for key, used in self._last_used.items() if now - used > self.overlay_ttl]:
+                self.drop_overlay(*key)
+
+    def release(self, dataset_key):
+        """Forget the mapping; the file is deleted too unless a session still uses the dataset"""
+        with self._lock:
+            self._frames.pop(dataset_key, None)
+            self._delete_if_unused(dataset_key)
+
+    def _delete_if_unused(self, dataset_key):
+        # Caller holds the lock. Pages already mapped stay readable after the unlink (POSIX).
+        if pa is None or any(key[1] == dataset_key for key in self._overlays):
+            return
+        try:
+            os.remove(self.path(dataset_key))
+        except OSError:
+            pass  # Already gone, or still mapped on a platform that forbids deleting it
+
+    def _evict_disk(self):
+        """Delete least recently used dataset files, other than open or in-use ones, beyond max_disk_bytes"""
+        with self._lock:
+            in_use = set(self._frames) | {key[1] for key in self._overlays}
+            files = []
+            for name in os.listdir(self.store_dir):
+                if not name.endswith(".arrow"):
+                    continue
+                path = os.path.join(self.store_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, name[:-len(".arrow")], path))
+
+            total = sum(size for _, size, _, _ in files)
+            for _, size, dataset_key, path in sorted(files):
+                if total <= self.max_disk_bytes:
+                    break
+                if dataset_key in in_use:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+
+session_store = SessionStore()
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from tools.anomaly_detector_tool import AnomalyDetectorTool
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 1, 5_000)
+    values[[10, 200, 4_000]] = [9.0, -12.0, 7.5]
+    values[50] = np.nan
+    return pd.DataFrame({"v": values, "label": "x"})
+
+
+def test_detect_returns_only_flagged_rows_matching_score_all():
+    df = _frame()
+    tool = AnomalyDetectorTool()
+    result, _ = tool.detect_anomalies(df, "v")
+
+    z = (df["v"] - df["v"].mean()) / df["v"].std(ddof=0)
+    expected = df.index[z.abs() > 3.0]
+    flags = tool.score_all(df, columns=["v"], methods=("zscore",))["flags"]["v"]
+    assert sorted(result.index) == sorted(expected) == sorted(df.index[flags])
+    assert list(result.columns) == ["v", "z_score"]
+    assert result["z_score"].abs().is_monotonic_decreasing
+    np.testing.assert_allclose(result["z_score"], z[result.index], rtol=1e-6)
+
+
+def test_detect_caps_rows_and_keeps_every_marker():
+    df = _frame()
+    result, fig = AnomalyDetectorTool().detect_anomalies(df, "v", max_rows=2)
+    assert list(result.index) == [200, 10]
+    assert len(fig.data[1].x) > 2
+
+
+def test_detect_constant_column_flags_nothing():
+    df = pd.DataFrame({"v": [5.0] * 100})
+    result, _ = AnomalyDetectorTool().detect_anomalies(df, "v")
+    assert result.empty
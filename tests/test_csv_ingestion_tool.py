@@ -0,0 +1,39 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from tools.csv_ingestion_tool import CSVIngestionTool
+
+
+def make_csv(rows=200, bad_date=False):
+    lines = ["id,qty,city,day"]
+    for i in range(rows):
+        qty = "" if i % 17 == 0 else str(i % 50)
+        lines.append(f"{i},{qty},{['Austin', 'Boston'][i % 2]},2024-01-{i % 28 + 1:02d}")
+    if bad_date:
+        lines.append(f"{rows},1,Austin,not a date")
+    return "\n".join(lines).encode()
+
+
+def test_values_match_pandas_with_compact_dtypes_and_one_parse(capsys):
+    data = make_csv()
+    df, schema = CSVIngestionTool().read(data)
+    ref = pd.read_csv(io.BytesIO(data))
+
+    assert "C engine" not in capsys.readouterr().out  # Integer gaps no longer force a second parse
+    np.testing.assert_array_equal(df["id"].to_numpy(), ref["id"].to_numpy())
+    np.testing.assert_allclose(df["qty"].to_numpy(dtype=float), ref["qty"].to_numpy(), equal_nan=True)
+    assert df["id"].dtype.itemsize < 8 and df["qty"].dtype.itemsize < 8
+    assert isinstance(df["city"].dtype, pd.CategoricalDtype)
+    assert df["city"].astype(str).tolist() == ref["city"].tolist()
+    assert (df["day"] == pd.to_datetime(ref["day"])).all()
+    assert schema.memory_bytes <= ref.memory_usage(deep=True).sum()
+
+
+def test_date_column_with_an_unparseable_value_stays_text():
+    data = make_csv(bad_date=True)
+    df, _ = CSVIngestionTool().read(data)
+    ref = pd.read_csv(io.BytesIO(data))
+    assert not pd.api.types.is_datetime64_any_dtype(df["day"])
+    assert df["day"].astype(str).tolist() == ref["day"].tolist()
@@ -0,0 +1,65 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.data_cleaning_tool import DataCleaningTool
+from tools.row_fingerprint_tool import RowFingerprintIndex
+
+
+def messy_frame():
+    return pd.DataFrame({
+        "a": [1.0, np.nan, 1.0, np.nan, 3.0, 1.0],
+        "b": ["x", None, "x", None, None, "x"],
+    })
+
+
+def test_clean_matches_dropna_and_ffill():
+    df = messy_frame()
+    expected = df.dropna(how="all").ffill()
+    pd.testing.assert_frame_equal(DataCleaningTool().clean(df), expected)
+
+
+def test_clean_drops_duplicates_with_a_shared_fingerprint_index():
+    df = messy_frame()
+    expected = df[df.notna().any(axis=1) & ~df.duplicated()].ffill()
+    fingerprints = RowFingerprintIndex.from_frame(df)
+    cleaned = DataCleaningTool().clean(df, drop_duplicates=True, fingerprints=fingerprints)
+    pd.testing.assert_frame_equal(cleaned, expected)
+    assert fingerprints.duplicate_count() == int(df.duplicated().sum())
+
+
+def csv_bytes(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "a": rng.integers(0, 3, n).astype(float),
+        "n": rng.integers(0, 1000, n),
+        "b": rng.choice(["x", "y", None], n),
+    })
+    df.loc[rng.random(n) < 0.2, "a"] = np.nan
+    df.loc[(rng.random(n) < 0.05), ["a", "b"]] = [np.nan, None]
+    text = df.to_csv(index=False)
+    return (text + "2,7,late text\n,,\n").encode()
+
+
+@pytest.mark.parametrize("drop_duplicates", [False, True])
+def test_chunked_clean_matches_in_memory_clean(tmp_path, drop_duplicates):
+    pytest.importorskip("pyarrow")
+    data = csv_bytes()
+    expected = DataCleaningTool().clean(pd.read_csv(io.BytesIO(data)), drop_duplicates=drop_duplicates)
+    for suffix in ("arrow", "parquet"):
+        cleaned, report = DataCleaningTool().clean_csv(
+            io.BytesIO(data), str(tmp_path / f"out.{suffix}"), chunksize=250, drop_duplicates=drop_duplicates
+        )
+        pd.testing.assert_frame_equal(cleaned, expected.reset_index(drop=True))
+        assert report["rows_out"] == len(expected) and report["chunks"] > 1
+
+
+def test_chunked_clean_settles_types_over_every_chunk(tmp_path):
+    pytest.importorskip("pyarrow")
+    data = b"i,v\n" + b"".join(f"{k},{k}\n".encode() for k in range(30)) + b",text\n31,5\n"
+    cleaned, _ = DataCleaningTool().clean_csv(io.BytesIO(data), str(tmp_path / "out.arrow"), chunksize=10)
+    expected = DataCleaningTool().clean(pd.read_csv(io.BytesIO(data)))
+    pd.testing.assert_frame_equal(cleaned, expected, check_dtype=False)
+    assert cleaned["v"].tolist()[-2:] == ["text", "5"]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from tools.dtype_compaction_tool import DtypeCompactionTool
+
+
+def _frame():
+    n = 1_000
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "small_int": rng.integers(-100, 100, n),
+        "halves": rng.integers(0, 50, n) / 2.0,
+        "whole_float": rng.integers(0, 1_000, n).astype(np.float64),
+        "gappy_float": np.where(np.arange(n) % 7 == 0, np.nan, 1.0),
+        "precise": rng.normal(0, 1, n),
+        "city": pd.Series(rng.choice(["Oslo", "Lima", "Pune"], n), dtype=object),
+        "when": pd.Series(pd.date_range("2024-01-01", periods=n, freq="h").strftime("%d/%m/%Y %H:%M"), dtype=object),
+        "text": pd.Series([f"id-{i}" for i in range(n)], dtype=object),
+        "mixed": pd.Series([1, "a"] * (n // 2), dtype=object),
+        "flag": rng.integers(0, 2, n).astype(bool),
+    })
+
+
+def test_compacted_values_match_the_source():
+    df = _frame()
+    original = df.copy()
+    compacted, report = DtypeCompactionTool().compact(df)
+
+    pd.testing.assert_frame_equal(df, original)
+    for col in ["small_int", "halves", "whole_float", "gappy_float", "precise"]:
+        np.testing.assert_array_equal(compacted[col].to_numpy(dtype=np.float64), df[col].to_numpy(dtype=np.float64))
+    assert compacted["city"].astype(object).tolist() == df["city"].tolist()
+    assert compacted["text"].astype(object).tolist() == df["text"].tolist()
+    pd.testing.assert_series_equal(compacted["when"], pd.to_datetime(df["when"], dayfirst=True), check_dtype=False)
+
+    assert report["bytes_after"].sum() < report["bytes_before"].sum()
+
+
+def test_compacted_dtypes():
+    compacted, _ = DtypeCompactionTool().compact(_frame())
+    assert compacted["small_int"].dtype == np.int8
+    assert compacted["halves"].dtype == np.float32
+    assert compacted["whole_float"].dtype == np.int16
+    assert compacted["gappy_float"].dtype == np.float32
+    assert compacted["precise"].dtype == np.float64
+    assert isinstance(compacted["city"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(compacted["when"])
+    assert pd.api.types.is_string_dtype(compacted["text"])
+    assert compacted["mixed"].dtype == object and compacted["flag"].dtype == bool
+
+
+def test_one_unparseable_date_keeps_the_column_as_text():
+    dates = pd.Series(pd.date_range("2024-01-01", periods=50).strftime("%Y-%m-%d").tolist() + ["not a date"], dtype=object)
+    converted = DtypeCompactionTool().compact_series(dates)
+    assert not pd.api.types.is_datetime64_any_dtype(converted)
+    assert converted.astype(object).tolist() == dates.tolist()
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from tools.dtype_compaction_tool import DtypeCompactionTool
+from tools.feature_engine_tool import FeatureEngineTool
+
+
+def downcast_frame():
+    wide = pd.DataFrame({"a": [100, 120, -100], "b": [100, 127, -90], "c": [200, 0, 255]})
+    narrow = DtypeCompactionTool().downcast_numeric(wide.copy())
+    assert narrow["a"].dtype == np.int8 and narrow["c"].dtype == np.int16
+    return wide, narrow
+
+
+def test_expressions_on_downcast_integers_match_int64_arithmetic():
+    wide, narrow = downcast_frame()
+    features = FeatureEngineTool(narrow).parse("total = a + b\nproduct = a * b\nsquare = c * c").evaluate()
+    assert features["total"].tolist() == (wide["a"] + wide["b"]).tolist()
+    assert features["product"].tolist() == (wide["a"] * wide["b"]).tolist()
+    assert features["square"].tolist() == (wide["c"] * wide["c"]).tolist()
+
+
+def test_ratio_on_downcast_integers_matches_float_division():
+    wide, narrow = downcast_frame()
+    features = FeatureEngineTool(narrow).define("r", "ratio", numerator="a", denominator="c").evaluate()
+    expected = (wide["a"] / wide["c"]).replace([np.inf, -np.inf], np.nan)
+    pd.testing.assert_series_equal(features["r"], expected, check_names=False)
+
+
+def test_expressions_leave_the_source_frame_untouched():
+    _, narrow = downcast_frame()
+    FeatureEngineTool(narrow).parse("total = a + b").evaluate()
+    assert narrow["a"].dtype == np.int8
+
+
+def test_nullable_narrow_integers_keep_missing_values():
+    df = pd.DataFrame({"a": pd.array([100, None, 3], dtype="Int8"), "b": pd.array([100, 1, None], dtype="Int8")})
+    features = FeatureEngineTool(df).parse("total = a + b").define("r", "ratio", numerator="a", denominator="b").evaluate()
+    assert features["total"].tolist()[0] == 200 and features["total"].isna().tolist() == [False, True, True]
+    assert features["r"].tolist()[0] == 1.0 and features["r"].isna().tolist() == [False, True, True]
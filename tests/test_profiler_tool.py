@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from agents.data_quality_agent import DataQualityAgent
+from tools.profiler_tool import ProfilerTool
+
+
+def _frame():
+    return pd.DataFrame({
+        "i": np.array([3, 1, 2], dtype=np.int16),
+        "b": [True, False, True],
+        "f": np.array([1.5, np.nan, -2.0], dtype=np.float32),
+        "n": pd.array([4, None, 9], dtype="Int64"),
+        "s": ["x", "y", None],
+    })
+
+
+def test_min_max_keep_the_column_dtype_and_cover_bools():
+    df = _frame()
+    columns = ProfilerTool().profile(df)["columns"]
+    for col in ["i", "b", "f", "n"]:
+        assert columns.loc[col, "min"] == df[col].min()
+        assert columns.loc[col, "max"] == df[col].max()
+    assert type(columns.loc["i", "min"]) is type(df["i"].min())
+    assert type(columns.loc["b", "max"]) is type(df["b"].max())
+    assert type(columns.loc["f", "min"]) is type(df["f"].min())
+    assert pd.isna(columns.loc["b", "mean"])
+
+
+def test_quality_report_min_max_match_pandas():
+    df = _frame()
+    report = DataQualityAgent().generate_report(df)
+    expected_min = [df[c].min() if pd.api.types.is_numeric_dtype(df[c]) else '' for c in df.columns]
+    expected_max = [df[c].max() if pd.api.types.is_numeric_dtype(df[c]) else '' for c in df.columns]
+    assert report["Min"].tolist() == expected_min
+    assert report["Max"].tolist() == expected_max
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from tools.query_router_tool import QueryRouterTool
+
+
+@pytest.fixture
+def router():
+    df = pd.DataFrame({
+        "region": ["East", "East", "West", "West", "North", "South"],
+        "product": ["tea", "coffee", "tea", "coffee", "tea", "tea"],
+        "revenue": [10, 20, 50, 49, 5, 30],
+    })
+    return QueryRouterTool(df)
+
+
+def test_which_category_has_highest_measure_groups_and_picks_argmax(router):
+    spec = router.parse("which region has the highest revenue")
+    assert spec["group"] == "region"
+    assert spec["func"] == "sum"
+    assert spec["pick"] == "max"
+    assert "West (99)" in router.answer("which region has the highest revenue")
+
+
+def test_which_category_has_lowest_average(router):
+    spec = router.parse("which region has the lowest average revenue")
+    assert (spec["group"], spec["func"], spec["pick"]) == ("region", "mean", "min")
+    assert "North (5)" in router.answer("which region has the lowest average revenue")
+
+
+def test_top_k_plural_category_returns_grouped_totals(router):
+    spec = router.parse("top 2 regions by revenue")
+    assert spec["group"] == "region"
+    assert spec["func"] == "sum"
+    answer = router.answer("top 2 regions by revenue")
+    assert "- West: 99" in answer
+    assert "- East: 30" in answer or "- South: 30" in answer
+    assert "rows by" not in answer
+
+
+def test_plain_superlative_without_grouping_is_max(router):
+    spec = router.parse("what is the highest revenue")
+    assert (spec["func"], spec["group"], spec["pick"]) == ("max", None, None)
+
+
+def test_value_filter_and_group_use_every_named_column(router):
+    spec = router.parse("total revenue by region for tea")
+    assert spec["group"] == "region"
+    assert spec["value_filters"] == {"product": ["tea"]}
+    assert "- West: 50" in router.answer("total revenue by region for tea")
+
+
+def test_unused_categorical_column_falls_back_to_model(router):
+    # Only one grouping key is supported, so "region" would be silently dropped
+    assert router.parse("what is the total revenue for each product and region") is None
+    assert router.answer("what is the total revenue of the product with the highest revenue") is None
+
+
+@pytest.fixture
+def orders():
+    df = pd.DataFrame({
+        "quantity": [4, 6, 40, 3, 7],
+        "unit price": [95.0, 99.0, 5.0, 20.0, 5.0],
+        "price": [380.0, 594.0, 200.0, 60.0, 35.0],
+    })
+    return QueryRouterTool(df)
+
+
+def test_numeric_filter_binds_to_longest_column_name(orders):
+    spec = orders.parse("average quantity where unit price > 90")
+    assert spec["numeric_filters"] == [("unit price", ">", 90.0)]
+    assert "5 (computed over 2 rows)" in orders.answer("average quantity where unit price > 90")
+
+
+def test_numeric_equality_filter_binds_to_longest_column_name(orders):
+    spec = orders.parse("total quantity where unit price is 5")
+    assert spec["numeric_filters"] == [("unit price", "==", 5.0)]
+    assert "47 (computed over 2 rows)" in orders.answer("total quantity where unit price is 5")
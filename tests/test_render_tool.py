@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from tools.render_tool import MAX_MARKER_POINTS, RenderTool
+
+
+def test_marker_trace_is_capped_and_keeps_extremes():
+    rng = np.random.default_rng(0)
+    y = pd.Series(rng.normal(0, 1, 3 * MAX_MARKER_POINTS))
+    y.iloc[1234] = 50.0
+    trace = RenderTool().marker_trace(y.index, y, name="m")
+    assert len(trace.y) == MAX_MARKER_POINTS
+    assert 50.0 in set(trace.y) and 1234 in set(trace.x)
+    assert trace.x[0] == 0 and trace.x[-1] == len(y) - 1
+
+
+def test_small_marker_trace_is_unchanged():
+    y = pd.Series([1.0, 5.0, 2.0], index=[10, 20, 30])
+    trace = RenderTool().marker_trace(y.index, y, name="m")
+    assert list(trace.x) == [10, 20, 30] and list(trace.y) == [1.0, 5.0, 2.0]
+
+
+def test_line_trace_forced_points_are_bounded():
+    n = 4 * MAX_MARKER_POINTS
+    y = pd.Series(np.sin(np.arange(n) / 50.0))
+    trace = RenderTool().line_trace(y.index, y, name="l", max_points=100, keep_mask=np.ones(n, dtype=bool))
+    assert len(trace.y) <= 100 + MAX_MARKER_POINTS
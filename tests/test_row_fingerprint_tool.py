@@ -0,0 +1,47 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from memory.artifact_cache import estimate_size
+from tools.row_fingerprint_tool import RowFingerprintIndex
+
+
+def frame(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"a": rng.integers(0, 5, n), "b": rng.choice(["x", "y"], n)})
+
+
+def test_duplicated_matches_pandas():
+    df = frame(500, 0)
+    index = RowFingerprintIndex.from_frame(df)
+    np.testing.assert_array_equal(index.duplicated(), df.duplicated().to_numpy())
+    assert index.duplicate_count() == int(df.duplicated().sum())
+
+
+def test_incremental_append_matches_pandas_on_the_concatenation():
+    parts = [frame(300, seed) for seed in range(4)]
+    index = RowFingerprintIndex.from_frame(parts[0])
+    index.duplicated()  # Start tracking before the appends
+    for part in parts[1:]:
+        index.append(part)
+    expected = pd.concat(parts, ignore_index=True).duplicated().to_numpy()
+    np.testing.assert_array_equal(index.duplicated(), expected)
+
+
+def test_append_with_repeats_inside_the_new_rows():
+    index = RowFingerprintIndex.from_frame(pd.DataFrame({"a": [1, 2]}))
+    index.duplicated()
+    index.append(pd.DataFrame({"a": [3, 3, 1, 4]}))
+    assert index.duplicated().tolist() == [False, False, False, True, True, False]
+
+
+def test_size_estimate_and_pickle_stay_near_eight_bytes_per_row():
+    df = frame(10_000, 1)
+    index = RowFingerprintIndex.from_frame(df)
+    index.duplicated()
+    assert estimate_size(index) == index.nbytes
+    assert index.nbytes <= 10_000 * (8 + 1) + 8 * 20
+    restored = pickle.loads(pickle.dumps(index))
+    assert len(pickle.dumps(index)) < 2 * index.nbytes
+    np.testing.assert_array_equal(restored.duplicated(), df.duplicated().to_numpy())
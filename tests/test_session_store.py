@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from memory.session_store import SessionStore
+
+pytest.importorskip("pyarrow")
+
+
+def dataset(seed=0, n=1000):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.normal(size=n), "k": rng.integers(0, 9, n)})
+
+
+def test_persisted_frame_round_trips_and_overlays_stay_per_session(tmp_path):
+    store = SessionStore(str(tmp_path))
+    df = dataset()
+    store.persist("d", df)
+    pd.testing.assert_frame_equal(store.open("d"), df)
+
+    store.set_column("s1", "d", "y", df["x"] * 2)
+    assert store.frame("s1", "d")["y"].equals(df["x"] * 2)
+    assert "y" not in store.frame("s2", "d") and "y" not in store.open("d")
+    assert store.overlay_token("s2", "d") is None and store.overlay_token("s1", "d") is not None
+
+
+def test_release_deletes_the_file_only_when_no_session_uses_it(tmp_path):
+    store = SessionStore(str(tmp_path))
+    store.persist("d", dataset())
+    store.frame("s1", "d")
+    store.release("d")
+    assert os.path.exists(store.path("d"))  # s1 still uses it
+
+    store.drop_session("s1")
+    assert not os.path.exists(store.path("d"))
+    assert not store.exists("d")
+
+
+def test_lru_eviction_of_unused_datasets_deletes_their_files(tmp_path):
+    store = SessionStore(str(tmp_path))
+    store.MAX_OPEN_DATASETS = 2
+    for key in "abc":
+        store.persist(key, dataset())
+    assert sorted(os.listdir(tmp_path)) == ["b.arrow", "c.arrow"]
+
+
+def test_directory_is_capped_keeping_open_datasets(tmp_path):
+    store = SessionStore(str(tmp_path), max_disk_bytes=1)
+    store.persist("a", dataset())
+    store.release("a")
+    store.persist("b", dataset(1))
+    assert os.listdir(tmp_path) == ["b.arrow"]  # Over the cap, but "b" is open
+
+
+def test_idle_overlays_expire(tmp_path):
+    store = SessionStore(str(tmp_path), overlay_ttl=10)
+    store.persist("d", dataset())
+    store.set_column("s1", "d", "y", pd.Series(range(1000)))
+    store.expire_idle(now=store._last_used[("s1", "d")] + 11)
+    assert "y" not in store.frame("s1", "d")
@@ -0,0 +1,70 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.stats_engine_tool import StatsEngineTool
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 5000
+    return pd.DataFrame({
+        "price": rng.normal(50, 10, n),
+        "units": rng.integers(0, 20, n),
+        "city": rng.choice(["Austin", "Boston", "Chicago", None], n),
+    })
+
+
+def test_numeric_summary_matches_describe(frame):
+    ours = StatsEngineTool(chunksize=700).analyze(frame)
+    ref = frame.describe(include="all").T
+    for col in ("price", "units"):
+        for stat in ("count", "mean", "std", "min", "max"):
+            assert ours.loc[col, stat] == pytest.approx(ref.loc[col, stat], rel=1e-9)
+        # Quartiles are approximate; compare ranks within the sketch's error bound
+        for q, stat in ((0.25, "25%"), (0.5, "50%"), (0.75, "75%")):
+            rank = (frame[col] <= ours.loc[col, stat]).mean()
+            assert abs(rank - q) <= ours.loc[col, "quantile_rank_error"] + 0.01
+
+
+def test_text_summary_matches_describe(frame):
+    ours = StatsEngineTool(chunksize=700).analyze(frame)
+    ref = frame.describe(include="all").T
+    assert ours.loc["city", "count"] == ref.loc["city", "count"]
+    assert ours.loc["city", "unique"] == ref.loc["city", "unique"]
+    assert ours.loc["city", "top"] == ref.loc["city", "top"]
+    assert ours.loc["city", "freq"] == ref.loc["city", "freq"]
+
+
+def test_merged_sketches_match_a_single_pass(frame):
+    engine = StatsEngineTool(chunksize=1000)
+    merged = engine.merge(engine.sketch_frame(frame.iloc[:2000]), engine.sketch_frame(frame.iloc[2000:]))
+    whole = engine.describe(engine.sketch_frame(frame))
+    merged = engine.describe(merged)
+    for stat in ("count", "nulls", "mean", "std", "min", "max"):
+        assert merged.loc["price", stat] == pytest.approx(whole.loc["price", stat])
+    assert merged.loc["city", "freq"] == whole.loc["city", "freq"]
+
+
+def test_csv_column_that_turns_to_text_in_a_later_chunk():
+    csv = "value,n\n" + "\n".join(f"{i % 7},{i}" for i in range(100)) + "\nunknown,100\n"
+    ours = StatsEngineTool(chunksize=10).describe(StatsEngineTool(chunksize=10).sketch_csv(io.StringIO(csv)))
+    ref = pd.read_csv(io.StringIO(csv)).describe(include="all").T
+    assert ours.loc["value", "count"] == ref.loc["value", "count"]
+    assert ours.loc["value", "unique"] == ref.loc["value", "unique"]
+    assert ours.loc["value", "top"] == ref.loc["value", "top"]
+    assert ours.loc["value", "freq"] == ref.loc["value", "freq"]
+    assert ours.loc["n", "mean"] == pytest.approx(ref.loc["n", "mean"])
+
+
+def test_merge_with_a_side_that_tracked_no_frequencies():
+    engine = StatsEngineTool()
+    floats = engine.sketch_frame(pd.DataFrame({"x": [1.5, 2.5]}))
+    text = engine.sketch_frame(pd.DataFrame({"x": ["a", "a", "b"]}))
+    merged = engine.describe(engine.merge(text, floats))
+    assert merged.loc["x", "count"] == 5
+    assert merged.loc["x", "top"] == "a"
+    assert merged.loc["x", "freq_error"] == 2
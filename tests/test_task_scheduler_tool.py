@@ -0,0 +1,37 @@
+import threading
+
+from tools.task_scheduler_tool import TaskSchedulerTool
+
+
+def test_dependencies_run_in_order_and_failures_skip_downstream():
+    order = []
+    scheduler = TaskSchedulerTool()
+    scheduler.add_task("a", lambda: order.append("a"))
+    scheduler.add_task("b", lambda: order.append("b"), depends_on=["a"])
+    scheduler.add_task("c", lambda: 1 / 0)
+    scheduler.add_task("d", lambda: order.append("d"), depends_on=["c"])
+    results = scheduler.run()
+    assert order == ["a", "b"]
+    assert [results[name]["status"] for name in "abcd"] == ["completed", "completed", "failed", "skipped"]
+
+
+def test_when_idle_waits_for_abandoned_tasks():
+    release = threading.Event()
+    scheduler = TaskSchedulerTool()
+    scheduler.add_task("slow", lambda: release.wait(5), timeout=0.05)
+    assert scheduler.run()["slow"]["status"] == "timeout"
+
+    idle = threading.Event()
+    scheduler.when_idle(idle.set)
+    assert not idle.is_set()  # The abandoned thread is still running
+    release.set()
+    assert idle.wait(5)
+
+
+def test_when_idle_runs_immediately_without_stragglers():
+    scheduler = TaskSchedulerTool()
+    scheduler.add_task("a", lambda: None)
+    scheduler.run()
+    called = []
+    scheduler.when_idle(lambda: called.append(True))
+    assert called == [True]
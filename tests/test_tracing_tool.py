@@ -0,0 +1,36 @@
+import numpy as np
+
+from tools.tracing_tool import TracingTool
+
+BLOCK = 64 * 1024 ** 2
+
+
+def _spike():
+    block = np.ones(BLOCK // 8)
+    del block
+
+
+def test_peak_allocation_inside_a_span_is_recorded():
+    tracer = TracingTool(trace_allocations=True)
+    with tracer.span("outer"):
+        with tracer.span("inner"):
+            _spike()
+        with tracer.span("after"):
+            pass
+    outer = tracer.to_dict()["spans"][0]
+    inner, after = outer["children"]
+    assert abs(inner["process_alloc_delta_bytes"]) < BLOCK // 4
+    assert inner["process_alloc_peak_bytes"] >= BLOCK
+    assert outer["process_alloc_peak_bytes"] >= BLOCK
+    assert after["process_alloc_peak_bytes"] < BLOCK // 4
+
+
+def test_rss_peak_is_reported_in_the_timeline():
+    tracer = TracingTool(trace_allocations=False)
+    with tracer.span("stage"):
+        _spike()
+    span = tracer.to_dict()["spans"][0]
+    assert span["rss_peak_bytes"] >= max(span["rss_start_bytes"], span["rss_end_bytes"])
+    timeline = TracingTool.timeline(tracer.to_dict())
+    assert timeline.loc[0, "process_rss_peak_delta_mb"] >= 0
+    assert "process_alloc_peak_bytes" not in span
@@ -1,37 +1,158 @@
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from scipy.stats import zscore
+
+from tools.render_tool import MAX_LINE_POINTS, RenderTool
+
+try:
+    from sklearn.ensemble import IsolationForest
+except ImportError:
+    IsolationForest = None
+
+# Scale factor that makes the MAD a consistent estimator of the standard deviation
+MAD_SCALE = 1.4826
+# Rows per block when Isolation Forest scores the whole frame
+FOREST_BLOCK_ROWS = 100_000
+# Flagged rows returned by `detect_anomalies` (largest |z| first)
+MAX_ANOMALY_ROWS = 1_000
+
+
+def _column_values(series):
+    """float64 values of one column; a view (no copy) for plain float64 columns"""
+    if series.dtype == np.float64:
+        return series.to_numpy()
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
 
 class AnomalyDetectorTool:
-    def detect_anomalies(self, df, column):
-        df_copy = df.copy()
+    def score_all(self, df, columns=None, methods=("zscore", "mad", "iqr"), threshold=3.0, iqr_k=1.5,
+                  isolation_forest=False, if_sample=100_000, if_trees=100, if_contamination="auto"):
+        """Flag outliers in every numeric column, one column at a time.
+
+        Returns {"flags": bool DataFrame (any method), "summary": per-column outlier counts}.
+        Only one column's working arrays are alive at once; per-row scores are not kept, use
+        `score` for a column on demand. Columns with zero spread (std, MAD or IQR of 0) are
+        not flagged by that method.
+        """
+        columns = list(columns) if columns is not None else df.select_dtypes(include="number").columns.tolist()
+        any_flag = np.zeros((len(df), len(columns)), dtype=bool)
+        counts = {name: [] for name in methods if name in ("zscore", "mad", "iqr")}
+
+        for i, col in enumerate(columns):
+            values = _column_values(df[col])
+            for name in counts:
+                flag = self._flag(values, name, threshold, iqr_k)
+                counts[name].append(int(flag.sum()))
+                any_flag[:, i] |= flag
+
+        flag_frame = pd.DataFrame(any_flag, index=df.index, columns=columns)
+        summary = pd.DataFrame({f"{name} outliers": n for name, n in counts.items()}, index=columns)
+        summary["any method"] = any_flag.sum(axis=0)
+
+        if isolation_forest and len(columns):
+            flag_frame["isolation_forest"] = self._isolation_forest(df, columns, if_sample, if_trees, if_contamination)
+
+        return {
+            "flags": flag_frame,
+            "summary": summary.sort_values("any method", ascending=False),
+        }
+
+    def score(self, df, column, method="zscore", iqr_k=1.5) -> pd.Series:
+        """Per-row float32 score of one column: z / robust z / distance outside the IQR fences"""
+        values = _column_values(df[column])
+        center, scale = self._scale(values, method, iqr_k)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if method == "iqr":
+                low, high = center
+                score = np.fmax(np.fmax(low - values, values - high), 0) / scale
+            else:
+                score = (values - center) / scale
+        return pd.Series(score.astype(np.float32), index=df.index, name=column)
+
+    def _flag(self, values, method, threshold, iqr_k):
+        center, scale = self._scale(values, method, iqr_k)
+        if not scale > 0:  # Zero (or undefined) spread: every deviating value would be "infinite"
+            return np.zeros(len(values), dtype=bool)
+        if method == "iqr":
+            low, high = center
+            return (values < low) | (values > high)
+        deviation = values - center
+        np.abs(deviation, out=deviation)
+        return deviation > threshold * scale
+
+    @staticmethod
+    def _scale(values, method, iqr_k):
+        """(center, scale) of a column; for IQR the center is the (low, high) fence pair"""
+        if not (~np.isnan(values)).any():
+            return (np.nan, np.nan) if method == "iqr" else np.nan, np.nan
+        if method == "zscore":
+            return np.nanmean(values), np.nanstd(values)
+        if method == "mad":
+            median = np.nanmedian(values)
+            return median, np.nanmedian(np.abs(values - median)) * MAD_SCALE
+        q1, q3 = np.nanpercentile(values, [25, 75])
+        iqr = q3 - q1
+        return (q1 - iqr_k * iqr, q3 + iqr_k * iqr), iqr
+
+    def _isolation_forest(self, df, columns, sample_size, n_trees, contamination):
+        """Fit a bounded forest on a row subsample, then flag every row block by block (median-imputed)"""
+        if IsolationForest is None:
+            raise ImportError("scikit-learn is required for Isolation Forest scoring")
+        medians = np.nan_to_num(np.array([np.nanmedian(_column_values(df[col])) for col in columns]))
+
+        def block(positions):
+            values = df[columns].iloc[positions].to_numpy(dtype=np.float64, na_value=np.nan)
+            return np.where(np.isnan(values), medians, values)
+
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(len(df), size=min(sample_size, len(df)), replace=False))
+        forest = IsolationForest(n_estimators=n_trees, contamination=contamination, random_state=0, n_jobs=-1)
+        forest.fit(block(sample))
+        flags = np.empty(len(df), dtype=bool)
+        for start in range(0, len(df), FOREST_BLOCK_ROWS):
+            positions = np.arange(start, min(start + FOREST_BLOCK_ROWS, len(df)))
+            flags[positions] = forest.predict(block(positions)) == -1
+        return flags
+
+    def detect_anomalies(self, df, column, threshold=3.0, max_rows=MAX_ANOMALY_ROWS):
+        """Flagged rows of one column (at most `max_rows`, largest |z| first) and the full-series figure"""
+        # One z-score pass; flags use the same rule as `score_all`
+        values = _column_values(df[column])
+        center, scale = self._scale(values, "zscore", 1.5)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_scores = (values - center) / scale
+        flags = np.abs(z_scores) > threshold if scale > 0 else np.zeros(len(values), dtype=bool)
 
-        # Compute z-scores only for non-null values
-        z_scores = zscore(df_copy[column].dropna())
-        df_copy.loc[df_copy[column].notna(), 'z_score'] = z_scores
-        df_copy['anomaly'] = (df_copy['z_score'].abs() > 3)
+        flagged = np.flatnonzero(flags)
+        top = flagged[np.argsort(-np.abs(z_scores[flagged]), kind="stable")[:max_rows]]
+        result_df = pd.DataFrame({
+            column: df[column].iloc[top],
+            'z_score': z_scores[top].astype(np.float32),
+        })
 
-        # Plotly visualization
+        # Plotly visualization: WebGL + LTTB downsampling for long series, every anomaly kept
+        renderer = RenderTool()
+        series = df[column]
         fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df_copy.index,
-            y=df_copy[column],
-            mode='lines+markers',
+        fig.add_trace(renderer.line_trace(
+            series.index,
+            series,
             name='Data',
+            keep_mask=flags,
+            mode='lines+markers' if len(series) <= MAX_LINE_POINTS else 'lines',
             line=dict(color='blue')
         ))
-        fig.add_trace(go.Scatter(
-            x=df_copy[df_copy['anomaly']].index,
-            y=df_copy[df_copy['anomaly']][column],
-            mode='markers',
+        fig.add_trace(renderer.marker_trace(
+            series.index[flagged],
+            series.iloc[flagged],
             name='Anomalies',
             marker=dict(color='red', size=10, symbol='x')
         ))
         fig.update_layout(
-            title=f"Z-Score Based Anomaly Detection for '{column}'",
+            title=f"Z-Score Based Anomaly Detection for '{column}' ({len(flagged):,} anomalies)",
             xaxis_title="Index",
             yaxis_title=column,
             showlegend=True
         )
 
-        return df_copy, fig
+        return result_df, fig
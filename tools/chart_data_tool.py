@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+# Categories beyond these limits are folded into a single "Other" bar / slice
+MAX_BARS = 50
+MAX_PIE_SLICES = 12
+# Numeric x-axes with more distinct values than MAX_BARS are binned into this many buckets
+HISTOGRAM_BINS = 50
+OTHER_LABEL = "Other"
+
+
+class ChartDataTool:
+    """Aggregates server-side so figures carry at most a few hundred points, whatever the row count"""
+
+    def bar_data(self, df, x, y, agg="sum", max_bars=MAX_BARS, bins=HISTOGRAM_BINS) -> pd.DataFrame:
+        """One row per bar: group-by (or binned) aggregate of `y` over `x`, top-N plus "Other" """
+        keys = df[x]
+        if self._is_continuous(keys, max_bars):
+            return self._binned_bar_data(keys, df[y], x, y, agg, bins)
+        grouped = df[y].groupby(keys, observed=True).agg(["sum", "count"])
+        grouped = grouped[grouped["count"] > 0]
+
+        if len(grouped) > max_bars:
+            grouped = self._fold_other(grouped, max_bars - 1, rank_by="mean" if agg == "mean" else "sum")
+        values = grouped["sum"] / grouped["count"] if agg == "mean" else grouped["sum"]
+        return pd.DataFrame({x: grouped.index.astype(str), y: values.to_numpy()})
+
+    def pie_data(self, series: pd.Series, max_slices=MAX_PIE_SLICES) -> pd.DataFrame:
+        counts = series.value_counts()
+        if len(counts) > max_slices:
+            top = counts.iloc[:max_slices - 1]
+            counts = pd.concat([top, pd.Series({OTHER_LABEL: counts.iloc[max_slices - 1:].sum()})])
+        return pd.DataFrame({series.name: counts.index.astype(str), "count": counts.to_numpy()})
+
+    def histogram_data(self, series: pd.Series, bins=HISTOGRAM_BINS) -> pd.DataFrame:
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[np.isfinite(values)]
+        counts, edges = np.histogram(values, bins=bins)
+        return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
+
+    @staticmethod
+    def _is_continuous(series, max_bars):
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            return False
+        # A sample decides cheaply; a miss only means more groups get folded into "Other"
+        return series.iloc[:10_000].nunique() > max_bars
+
+    @staticmethod
+    def _binned_bar_data(keys, target, x, y, agg, bins):
+        """Equal-width bins over x with sums/counts from bincount; bars sit at bin midpoints"""
+        key_values = keys.to_numpy(dtype=np.float64, na_value=np.nan)
+        target_values = target.to_numpy(dtype=np.float64, na_value=np.nan)
+        ok = np.isfinite(key_values) & ~np.isnan(target_values)
+        if not ok.any():
+            return pd.DataFrame({x: [], y: []})
+        edges = np.linspace(key_values[ok].min(), key_values[ok].max(), bins + 1)
+        codes = np.clip(np.searchsorted(edges, key_values[ok], side="right") - 1, 0, bins - 1)
+        counts = np.bincount(codes, minlength=bins)
+        sums = np.bincount(codes, weights=target_values[ok], minlength=bins)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = sums / counts if agg == "mean" else sums
+        present = counts > 0
+        return pd.DataFrame({x: ((edges[:-1] + edges[1:]) / 2)[present], y: values[present]})
+
+    @staticmethod
+    def _fold_other(grouped, keep, rank_by):
+        ranking = grouped["sum"] / grouped["count"] if rank_by == "mean" else grouped["sum"]
+        top = ranking.abs().nlargest(keep).index
+        rest = grouped.drop(top)
+        grouped = grouped.loc[top]
+        grouped.index = grouped.index.astype(str)
+        grouped.loc[OTHER_LABEL] = rest.sum()
+        return grouped
@@ -0,0 +1,142 @@
+import io
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    FAST_ENGINE = "pyarrow"
+except ImportError:
+    FAST_ENGINE = None
+
+from tools.dtype_compaction_tool import DtypeCompactionTool, infer_date_format
+
+
+class DatasetSchema:
+    """Column name -> dtype mapping plus the semantic kind of every column"""
+
+    def __init__(self, dtypes: dict, kinds: dict, source_bytes: int = 0, memory_bytes: int = 0):
+        self.dtypes = dtypes
+        self.kinds = kinds
+        self.source_bytes = source_bytes
+        self.memory_bytes = memory_bytes
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source_bytes: int = 0):
+        kinds = {}
+        for col in df.columns:
+            dtype = df[col].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                kinds[col] = "boolean"
+            elif pd.api.types.is_numeric_dtype(dtype):
+                kinds[col] = "numeric"
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
+                kinds[col] = "datetime"
+            elif isinstance(dtype, pd.CategoricalDtype):
+                kinds[col] = "categorical"
+            else:
+                kinds[col] = "text"
+        return cls(
+            dtypes={col: str(dtype) for col, dtype in df.dtypes.items()},
+            kinds=kinds,
+            source_bytes=source_bytes,
+            memory_bytes=int(df.memory_usage(deep=True).sum()),
+        )
+
+    def columns_of_kind(self, *kinds):
+        return [col for col, kind in self.kinds.items() if kind in kinds]
+
+    @property
+    def numeric_columns(self):
+        return self.columns_of_kind("numeric")
+
+    @property
+    def categorical_columns(self):
+        return self.columns_of_kind("categorical", "text", "boolean")
+
+    @property
+    def datetime_columns(self):
+        return self.columns_of_kind("datetime")
+
+    def to_dict(self):
+        return {
+            "dtypes": self.dtypes,
+            "kinds": self.kinds,
+            "source_bytes": self.source_bytes,
+            "memory_bytes": self.memory_bytes,
+        }
+
+
+class CSVIngestionTool:
+    """Reads CSV bytes once, straight into compact dtypes inferred from a sample"""
+
+    def __init__(self, sample_rows=10000, category_ratio=0.5, max_categories=10000, datetime_ratio=0.95):
+        self.sample_rows = sample_rows
+        self.category_ratio = category_ratio
+        self.max_categories = max_categories
+        self.datetime_ratio = datetime_ratio
+
+    def read(self, source, **read_kwargs):
+        """Parse `source` (bytes, memoryview or binary file object) into (DataFrame, DatasetSchema)"""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source_bytes = len(source)
+            buffer = io.BytesIO(source)  # Shares the underlying bytes, no decoded str copy
+        else:
+            buffer = source
+            buffer.seek(0, io.SEEK_END)
+            source_bytes = buffer.tell()
+            buffer.seek(0)
+
+        sample = pd.read_csv(buffer, nrows=self.sample_rows, **read_kwargs)
+        buffer.seek(0)
+        dtypes, date_formats = self.infer_dtypes(sample)
+
+        df = self._parse(buffer, dtypes, read_kwargs)
+        for col, fmt in date_formats.items():
+            parsed = pd.to_datetime(df[col], format=fmt, errors="coerce")
+            # The format comes from a sample; a later value it can't parse keeps the column as text
+            if parsed.isna().sum() == df[col].isna().sum():
+                df[col] = parsed
+        df = self.downcast_numeric(df)
+
+        return df, DatasetSchema.from_frame(df, source_bytes=source_bytes)
+
+    def infer_dtypes(self, sample: pd.DataFrame):
+        """Pick category / datetime candidates from the sample; numerics are downcast after parsing"""
+        dtypes, date_formats = {}, {}
+        for col in sample.columns:
+            series = sample[col]
+            if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                continue
+            non_null = series.dropna()
+            if non_null.empty:
+                continue
+
+            date_format = infer_date_format(non_null, self.datetime_ratio)
+            if date_format is not None:
+                date_formats[col] = date_format
+                continue
+
+            n_unique = non_null.nunique()
+            if n_unique <= self.max_categories and n_unique <= len(non_null) * self.category_ratio:
+                dtypes[col] = "category"
+        return dtypes, date_formats
+
+    def downcast_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Shrink int64/float64 columns one at a time when every value fits the smaller type"""
+        return DtypeCompactionTool().downcast_numeric(df)
+
+    def _parse(self, buffer, dtypes, read_kwargs):
+        if FAST_ENGINE is not None:
+            try:
+                # No dtype mapping here: given one, the pyarrow engine reads every integer column as
+                # nullable and then fails on any gap. Categories are applied per column afterwards.
+                df = pd.read_csv(buffer, engine=FAST_ENGINE, **read_kwargs)
+            except (ValueError, TypeError) as e:
+                # The pyarrow engine rejects some options/inputs the C engine handles
+                print(f"⚠️ Fast CSV engine unavailable for this file, using C engine: {e}")
+                buffer.seek(0)
+            else:
+                for col, dtype in dtypes.items():
+                    df[col] = df[col].astype(dtype)
+                return df
+        return pd.read_csv(buffer, dtype=dtypes or None, low_memory=False, **read_kwargs)
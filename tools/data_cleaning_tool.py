@@ -1,8 +1,159 @@
+import os
+
 import pandas as pd
 
+from tools.row_fingerprint_tool import RowFingerprintIndex
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# CSV inputs larger than this are cleaned out of core (`clean_csv`) instead of parsed whole
+CHUNKED_CLEANING_BYTES = int(os.environ.get("SDA_CHUNKED_CLEANING_BYTES", 512 * 1024**2))
+
+# Chunked cleaning: column kind seen across all chunks -> dtype pinned for every chunk
+PINNED_DTYPES = {"empty": "float64", "int": "int64", "float": "float64", "bool": "boolean", "text": "object"}
+
+
 class DataCleaningTool:
-    def clean(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        df.dropna(axis=0, how='all', inplace=True)
-        df.fillna(method='ffill', inplace=True)
+    def clean(self, df: pd.DataFrame, drop_duplicates: bool = False, fingerprints: RowFingerprintIndex = None) -> pd.DataFrame:
+        """Drop empty rows and forward-fill; optionally drop exact duplicate rows first.
+
+        `fingerprints` may be an index already built over `df`, so deduplication reuses it.
+        """
+        keep = df.notna().any(axis=1).to_numpy().copy()
+        if drop_duplicates:
+            if fingerprints is None:
+                fingerprints = RowFingerprintIndex.from_frame(df)
+            keep &= ~fingerprints.duplicated()
+        df = df[keep] if not keep.all() else df.copy()
+        df.ffill(inplace=True)
         return df
+
+    def clean_chunked(self, source, output_path: str, chunksize: int = 100_000, drop_duplicates: bool = False,
+                      **read_kwargs) -> dict:
+        """Out-of-core variant of `clean`: stream the CSV in chunks into a Parquet or Arrow IPC file.
+
+        The last valid value of every column is carried across chunk boundaries, so the
+        forward-fill matches the in-memory result exactly. Only one chunk is resident at a time;
+        duplicate rows are found with a row fingerprint index extended chunk by chunk.
+        Column types are settled by a first pass over the file (so `source` must be a path or
+        seekable) and match `clean` on a whole-file read, except that booleans with gaps are
+        nullable booleans here rather than object.
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for chunked cleaning")
+
+        dtypes = self._pin_dtypes(source, chunksize, read_kwargs)
+        schema = pa.schema([(col, self._arrow_type(dtype)) for col, dtype in dtypes.items()])
+        carry = {}
+        rows_in = rows_out = chunks = duplicates = 0
+        fingerprints = RowFingerprintIndex() if drop_duplicates else None
+        if fingerprints is not None:
+            fingerprints.duplicated()  # Track duplicates incrementally from the first chunk on
+
+        writer = self._open_writer(output_path, schema)
+        try:
+            for chunk in pd.read_csv(source, chunksize=chunksize, dtype=dtypes, **read_kwargs):
+                rows_in += len(chunk)
+                if fingerprints is not None:
+                    start = len(fingerprints)
+                    repeated = fingerprints.append(chunk).duplicated()[start:]
+                    duplicates += int(repeated.sum())
+                    chunk = chunk[~repeated]
+                chunk = chunk.dropna(axis=0, how='all').ffill()
+                if chunk.empty:
+                    continue
+                # After ffill only leading NaNs remain; those take the previous chunk's last value
+                if carry:
+                    chunk = chunk.fillna(value=carry)
+                last_row = chunk.iloc[-1]
+                carry.update(last_row[last_row.notna()].to_dict())
+
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                writer.write_table(table)
+                rows_out += len(chunk)
+                chunks += 1
+        finally:
+            writer.close()
+
+        return {
+            "output_path": output_path,
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "chunks": chunks,
+            "duplicates_dropped": duplicates,
+            "bytes_written": os.path.getsize(output_path),
+        }
+
+    def clean_csv(self, source, output_path: str, drop_duplicates: bool = False, **kwargs):
+        """`clean_chunked` then `load_cleaned`: (cleaned frame, report) without ever parsing the whole file"""
+        report = self.clean_chunked(source, output_path, drop_duplicates=drop_duplicates, **kwargs)
+        return self.load_cleaned(output_path), report
+
+    @staticmethod
+    def load_cleaned(path: str) -> pd.DataFrame:
+        """Memory-map a file written by `clean_chunked` back into a DataFrame"""
+        if path.endswith(".parquet"):
+            return pq.read_table(path, memory_map=True).to_pandas()
+        with pa.memory_map(path, "r") as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    def _pin_dtypes(self, source, chunksize, read_kwargs):
+        # Every chunk must share one schema, and the Arrow writer can't widen it later, so a
+        # first pass over all chunks settles each column's type the way a whole-file read_csv
+        # would: int64 only when integral with no gaps anywhere, float64 for other numerics,
+        # text as soon as any chunk holds a non-numeric value. Only one chunk is resident.
+        kinds = {}
+        for chunk in pd.read_csv(source, chunksize=chunksize, **read_kwargs):
+            for col in chunk.columns:
+                kinds[col] = self._merge_kind(kinds.get(col), self._chunk_kind(chunk[col]))
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return {col: PINNED_DTYPES[kind] for col, kind in kinds.items()}
+
+    @staticmethod
+    def _chunk_kind(series):
+        if series.isna().all():
+            return "empty"
+        if pd.api.types.is_bool_dtype(series):
+            return "bool"
+        if pd.api.types.is_integer_dtype(series):
+            return "int"
+        if pd.api.types.is_numeric_dtype(series):
+            return "float"
+        if pd.api.types.is_object_dtype(series) and series.dropna().map(type).eq(bool).all():
+            return "bool"  # True/False with gaps reads as object
+        return "text"
+
+    @staticmethod
+    def _merge_kind(current, kind):
+        if current is None:
+            return kind
+        if current == kind:
+            return kind
+        if {current, kind} <= {"int", "float", "empty"}:
+            return "float"  # Gaps or decimals anywhere turn the whole column float, as read_csv does
+        if "empty" in (current, kind):
+            other = kind if current == "empty" else current
+            return other if other in ("bool", "text") else "float"
+        return "text"
+
+    @staticmethod
+    def _arrow_type(dtype):
+        if dtype == "float64":
+            return pa.float64()
+        if dtype == "int64":
+            return pa.int64()
+        if dtype == "boolean":
+            return pa.bool_()
+        return pa.string()
+
+    @staticmethod
+    def _open_writer(output_path, schema):
+        if output_path.endswith(".parquet"):
+            return pq.ParquetWriter(output_path, schema)
+        return pa.ipc.new_file(output_path, schema)
@@ -1,18 +1,26 @@
 import pandas as pd
+from tools.profiler_tool import ProfilerTool
 
 class DataQualityTool:
-    def generate_report(self, df: pd.DataFrame) -> pd.DataFrame:
-        report = pd.DataFrame(index=df.columns)
+    def __init__(self):
+        self.profiler = ProfilerTool()
 
-        report['Data Type'] = df.dtypes
-        report['Missing Values'] = df.isnull().sum()
-        report['% Missing'] = (df.isnull().sum() / len(df)) * 100
-        report['Unique Values'] = df.nunique()
-        report['Duplicates'] = df.duplicated().sum()
-        report['Constant Column'] = df.nunique() == 1
-        report['Mean'] = df.select_dtypes(include='number').mean()
-        report['Std Dev'] = df.select_dtypes(include='number').std()
-        report['Min'] = df.select_dtypes(include='number').min()
-        report['Max'] = df.select_dtypes(include='number').max()
+    def generate_report(self, df: pd.DataFrame, profile: dict = None, fingerprints=None) -> pd.DataFrame:
+        profile = profile or self.profiler.profile(df, fingerprints)
+        columns = profile["columns"]
+        report = pd.DataFrame(index=columns.index)
+
+        report['Data Type'] = columns['dtype']
+        report['Missing Values'] = columns['missing']
+        report['% Missing'] = columns['missing_pct'].astype(float)
+        report['Unique Values'] = columns['distinct']
+        report['Duplicates'] = profile['duplicates']
+        report['Constant Column'] = columns['constant']
+        report['Mean'] = columns['mean'].astype(float)
+        report['Std Dev'] = columns['std'].astype(float)
+        # Numeric, non-bool columns as in select_dtypes(include="number"); values keep their dtype
+        number = columns['dtype'].map(lambda dtype: pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)).astype(bool)
+        report['Min'] = columns['min'].where(number).infer_objects()
+        report['Max'] = columns['max'].where(number).infer_objects()
 
         return report
@@ -0,0 +1,131 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype(storage="pyarrow", na_value=np.nan)
+except ImportError:
+    STRING_DTYPE = None
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    guess_datetime_format = None
+
+
+def infer_date_format(values: pd.Series, min_ratio=0.95):
+    """Guess one strptime format from the first non-null values; None unless it parses most of them"""
+    non_null = values.dropna()
+    # Spread over the column, not its head, so day-first dates are likely to show a day above 12
+    head = non_null.iloc[np.linspace(0, len(non_null) - 1, min(len(non_null), 200)).astype(np.int64)].astype(str)
+    if head.empty or head.str.fullmatch(r"[-+]?\d+(\.\d+)?").all():
+        return None  # Plain numbers stored as text, not timestamps
+
+    if guess_datetime_format is None:
+        return None
+    # Ambiguous values like 01/02/2020 guess month-first; day-first is tried when that fails
+    for dayfirst in (False, True):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # "Parsing dates in %d/%m/%Y format when dayfirst=False"
+            fmt = guess_datetime_format(head.iloc[0], dayfirst=dayfirst)
+        if fmt is not None and pd.to_datetime(head, format=fmt, errors="coerce").notna().mean() >= min_ratio:
+            return fmt
+    return None
+
+
+class DtypeCompactionTool:
+    """Shrinks a frame column by column to the smallest dtype that holds its values exactly:
+    narrower ints/floats, integral floats without gaps as ints, low-cardinality text as
+    category, parseable date strings as datetimes and remaining text as Arrow-backed strings.
+    """
+
+    REPORT_COLUMNS = ["column", "dtype_before", "dtype_after", "bytes_before", "bytes_after"]
+
+    def __init__(self, category_ratio=0.5, max_categories=10000, datetime_ratio=0.95):
+        self.category_ratio = category_ratio
+        self.max_categories = max_categories
+        self.datetime_ratio = datetime_ratio
+
+    def compact(self, df: pd.DataFrame):
+        """Return (compacted frame, per-column report of bytes before/after); `df` is not modified"""
+        compacted = df.copy(deep=False)
+        rows = []
+        for col in df.columns:
+            series = df[col]
+            before = int(series.memory_usage(deep=True, index=False))
+            converted = self.compact_series(series)
+            if converted is not series:
+                compacted[col] = converted
+            rows.append((col, str(series.dtype), str(converted.dtype), before,
+                         int(converted.memory_usage(deep=True, index=False)) if converted is not series else before))
+        return compacted, pd.DataFrame(rows, columns=self.REPORT_COLUMNS)
+
+    def compact_series(self, series: pd.Series) -> pd.Series:
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        if pd.api.types.is_integer_dtype(series):
+            return self._downcast_integer(series)
+        if pd.api.types.is_float_dtype(series):
+            return self._downcast_float(series)
+        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            return self._compact_text(series)
+        return series
+
+    def downcast_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Numeric-only pass used at ingestion: shrink int/float columns in place when lossless"""
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_bool_dtype(series):
+                continue
+            if pd.api.types.is_integer_dtype(series):
+                df[col] = self._downcast_integer(series)
+            elif pd.api.types.is_float_dtype(series):
+                df[col] = self._narrow_float(series)
+        return df
+
+    @staticmethod
+    def _downcast_integer(series):
+        if not isinstance(series.dtype, np.dtype):
+            return series  # Nullable / Arrow integers keep their missing-value semantics
+        return pd.to_numeric(series, downcast="integer")
+
+    def _downcast_float(self, series):
+        values = series.to_numpy()
+        if isinstance(series.dtype, np.dtype) and len(values) and not np.isnan(values).any() \
+                and np.abs(values).max() < 2 ** 53 and np.array_equal(values, np.trunc(values)):
+            # Whole numbers with no gaps left after cleaning: store them as integers
+            return pd.to_numeric(series.astype(np.int64), downcast="integer")
+        return self._narrow_float(series)
+
+    @staticmethod
+    def _narrow_float(series):
+        if series.dtype != np.float64:
+            return series
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            return pd.Series(narrowed, index=series.index, name=series.name)
+        return series
+
+    def _compact_text(self, series):
+        non_null = series.dropna()
+        if non_null.empty:
+            return series
+        if pd.api.types.infer_dtype(non_null.iloc[:1000], skipna=True) != "string":
+            return series  # Mixed Python objects stay as they are
+
+        fmt = infer_date_format(non_null, self.datetime_ratio)
+        if fmt is not None:
+            parsed = pd.to_datetime(series, format=fmt, errors="coerce")
+            # Lossless only: a single unparseable value keeps the whole column as text
+            if parsed.notna().sum() == len(non_null):
+                return parsed
+
+        n_unique = non_null.nunique()
+        if n_unique <= self.max_categories and n_unique <= len(non_null) * self.category_ratio:
+            return series.astype("category")
+        if STRING_DTYPE is not None and series.dtype != STRING_DTYPE:
+            return series.astype(STRING_DTYPE)
+        return series
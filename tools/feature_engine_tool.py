@@ -0,0 +1,113 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from memory.datetime_cache import datetime_cache
+
+try:
+    import numexpr  # noqa: F401  (pandas picks it up as the eval engine when installed)
+    EVAL_ENGINE = "numexpr"
+except ImportError:
+    EVAL_ENGINE = "python"
+
+OPERATORS = {"+", "-", "*", "/"}
+
+# "name = expression" lines accepted by `parse`
+ASSIGNMENT_PATTERN = re.compile(r"^\s*([^=]+?)\s*=\s*(.+?)\s*$")
+
+
+def _widen(series: pd.Series) -> pd.Series:
+    """Ingestion narrows integers to int8/int16/...; widen before arithmetic so results don't wrap"""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_integer_dtype(dtype) or dtype.itemsize >= 8:
+        return series
+    return series.astype("Int64" if isinstance(dtype, pd.api.extensions.ExtensionDtype) else np.int64)
+
+
+class FeatureEngineTool:
+    """Lazy derived columns over a frame that is never copied.
+
+    Features are registered as specs and computed only when read; `evaluate` returns just the
+    new columns, computing arithmetic with DataFrame.eval (numexpr when installed). Date parts
+    read the shared datetime cache, so a column is parsed once per `dataset_key`; columns named in
+    `overlay_columns` (session-derived, not part of the keyed dataset) bypass it. Supported kinds:
+
+        {"name": "margin", "kind": "expr", "expr": "revenue - cost"}
+        {"name": "ctr", "kind": "ratio", "numerator": "clicks", "denominator": "views"}
+        {"name": "month", "kind": "date", "column": "order_date", "part": "month"}
+        {"name": "age_band", "kind": "bin", "column": "age", "bins": 5, "quantile": False}
+    """
+
+    def __init__(self, df: pd.DataFrame, cache=True, dataset_key=None, overlay_columns=()):
+        self.df = df
+        self.dataset_key = dataset_key
+        self.overlay_columns = overlay_columns
+        self.cache = cache
+        self.specs = {}
+        self._values = {}
+
+    def define(self, name, kind, **params):
+        if kind not in ("expr", "ratio", "date", "bin"):
+            raise ValueError(f"Unknown feature kind '{kind}'")
+        self.specs[name] = {"kind": kind, **params}
+        self._values.pop(name, None)
+        return self
+
+    def add(self, specs):
+        for spec in specs:
+            spec = dict(spec)
+            self.define(spec.pop("name"), spec.pop("kind"), **spec)
+        return self
+
+    def parse(self, text):
+        """Register one "name = expression" feature per line"""
+        for line in filter(str.strip, text.splitlines()):
+            match = ASSIGNMENT_PATTERN.match(line)
+            if match is None:
+                raise ValueError(f"Expected 'name = expression', got: {line!r}")
+            self.define(match.group(1), "expr", expr=match.group(2))
+        return self
+
+    def __contains__(self, name):
+        return name in self.specs
+
+    def __getitem__(self, name) -> pd.Series:
+        """Materialize a single virtual column on first read"""
+        if name in self._values:
+            return self._values[name]
+        return self.evaluate([name])[name]
+
+    def evaluate(self, names=None) -> pd.DataFrame:
+        """Compute the requested features (all by default) and return only those columns"""
+        names = list(names) if names is not None else list(self.specs)
+        pending = [name for name in names if name not in self._values]
+        computed = {}
+        for name in pending:
+            spec = self.specs[name]
+            kind = spec["kind"]
+            if kind == "expr":
+                values = self._operands(spec["expr"]).eval(spec["expr"], engine=EVAL_ENGINE)
+            elif kind == "ratio":
+                numerator = self.df[spec["numerator"]].astype(np.float64)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    values = numerator / self.df[spec["denominator"]].astype(np.float64)
+                values = values.replace([np.inf, -np.inf], np.nan)
+            elif kind == "date":
+                column = spec["column"]
+                dataset_key = None if column in self.overlay_columns else self.dataset_key
+                values = datetime_cache.extract(dataset_key, column, self.df[column], spec["part"])
+            else:
+                cut = pd.qcut if spec.get("quantile") else pd.cut
+                values = cut(self.df[spec["column"]], spec["bins"], labels=spec.get("labels"), duplicates="drop")
+            computed[name] = pd.Series(values, index=self.df.index, name=name)
+
+        if self.cache:
+            self._values.update(computed)
+        columns = {name: self._values[name] if name in self._values else computed[name] for name in names}
+        return pd.DataFrame(columns, index=self.df.index)
+
+    def _operands(self, expr) -> pd.DataFrame:
+        """Columns named in `expr`, narrow integers widened to 64 bits; other columns are not copied"""
+        columns = [col for col in self.df.columns if str(col) in expr]
+        return pd.DataFrame({col: _widen(self.df[col]) for col in columns}, index=self.df.index, copy=False)
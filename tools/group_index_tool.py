@@ -0,0 +1,160 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+AGGREGATES = ["sum", "mean", "count", "min", "max"]
+
+
+class GroupIndexTool:
+    """Factorized key codes per column plus a sum/mean/count/min/max cube per key combination.
+
+    Codes are computed once per key column; multi-key groups are composed from them without
+    touching the key values again. Each cube covers every numeric column, so any later
+    (keys, column, aggregate) choice is a lookup. Key combinations with more than
+    `max_groups` groups are not cubed; `aggregate` falls back to a plain groupby for those.
+    """
+
+    MAX_CACHED_DATASETS = 8
+    _instances = OrderedDict()
+    _instances_lock = threading.Lock()
+
+    def __init__(self, df: pd.DataFrame, max_groups=100_000):
+        self.df = df
+        self.max_groups = max_groups
+        self.numeric_columns = df.select_dtypes(include="number").columns.tolist()
+        self._codes = {}  # column -> (codes, uniques)
+        self._cubes = {}  # tuple of key columns -> cube DataFrame
+        self._sizes = {}  # tuple of key columns -> rows per group
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_dataset(cls, dataset_key, df, **kwargs):
+        """Share one index per dataset across reruns and sessions"""
+        with cls._instances_lock:
+            tool = cls._instances.get(dataset_key)
+            if tool is not None:
+                cls._instances.move_to_end(dataset_key)
+                return tool
+        tool = cls(df, **kwargs)
+        with cls._instances_lock:
+            cls._instances[dataset_key] = tool
+            while len(cls._instances) > cls.MAX_CACHED_DATASETS:
+                cls._instances.popitem(last=False)
+        return tool
+
+    def codes(self, column):
+        """(codes, sorted uniques) for one key column; missing keys get code -1"""
+        with self._lock:
+            if column not in self._codes:
+                codes, uniques = pd.factorize(self.df[column], sort=True)
+                dtype = np.int32 if len(uniques) < np.iinfo(np.int32).max else np.int64
+                self._codes[column] = (codes.astype(dtype), uniques)
+            return self._codes[column]
+
+    def group_codes(self, keys):
+        """Dense codes (-1 where any key is missing) and the group labels for a key combination"""
+        keys = list(keys)
+        codes, uniques = self.codes(keys[0])
+        codes = codes.astype(np.int64)
+        labels = [np.arange(len(uniques))]
+        levels = [uniques]
+        for key in keys[1:]:
+            next_codes, next_uniques = self.codes(key)
+            levels.append(next_uniques)
+            missing = (codes < 0) | (next_codes < 0)
+            combined = codes * len(next_uniques) + next_codes
+            # Compact after every key so combined codes never exceed n_rows * cardinality
+            observed, dense = np.unique(combined[~missing], return_inverse=True)
+            labels = [label[observed // len(next_uniques)] for label in labels] + [observed % len(next_uniques)]
+            codes = np.full(len(combined), -1, dtype=np.int64)
+            codes[~missing] = dense
+
+        if len(keys) == 1:
+            index = pd.Index(uniques, name=keys[0])
+        else:
+            index = pd.MultiIndex.from_arrays([level.take(label) for level, label in zip(levels, labels)], names=keys)
+        return codes, index
+
+    def cube(self, keys):
+        """All aggregates of all numeric columns for `keys`; columns are (column, aggregate)"""
+        keys = tuple(keys)
+        with self._lock:
+            if keys in self._cubes:
+                return self._cubes[keys]
+        codes, index = self.group_codes(keys)
+        if len(index) > self.max_groups:
+            return None
+
+        valid = codes >= 0
+        codes = codes[valid]
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(codes) else np.empty(0, dtype=np.int64)
+        n_groups = len(index)
+        sizes = pd.Series(np.bincount(codes, minlength=n_groups), index=index, name="count")
+
+        columns = {}
+        for col in self.numeric_columns:
+            if col in keys:
+                continue
+            values = self.df[col].to_numpy(dtype=np.float64, na_value=np.nan)[valid]
+            present = ~np.isnan(values)
+            count = np.bincount(codes[present], minlength=n_groups)
+            total = np.bincount(codes, weights=np.where(present, values, 0.0), minlength=n_groups)
+            ordered = values[order]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                columns[(col, "mean")] = total / count
+            columns[(col, "sum")] = total
+            columns[(col, "count")] = count
+            # fmin/fmax skip NaN, so all-missing groups stay NaN like pandas
+            columns[(col, "min")] = np.fmin.reduceat(ordered, starts) if len(starts) else np.empty(0)
+            columns[(col, "max")] = np.fmax.reduceat(ordered, starts) if len(starts) else np.empty(0)
+            if pd.api.types.is_integer_dtype(self.df[col].dtype) and len(starts):
+                columns.update(self._integer_aggregates(col, valid, order, starts, count == 0))
+
+        cube = pd.DataFrame(columns, index=index)
+        with self._lock:
+            self._cubes[keys] = cube
+            self._sizes[keys] = sizes
+        return cube
+
+    def size(self, keys):
+        """Rows per group for `keys` (built with the cube); None when there are too many groups"""
+        keys = tuple(keys)
+        if self.cube(keys) is None:
+            return None
+        with self._lock:
+            return self._sizes[keys]
+
+    def _integer_aggregates(self, col, valid, order, starts, empty):
+        """Exact integer sum/min/max (no float64 round trip); nullable columns keep <NA> groups"""
+        series = self.df[col]
+        int_dtype = np.uint64 if series.dtype.kind == "u" else np.int64
+        info = np.iinfo(int_dtype)
+        present = series.notna().to_numpy()[valid][order]
+        ints = series.to_numpy(dtype=int_dtype, na_value=0)[valid][order]
+        results = {
+            "sum": np.add.reduceat(ints, starts),
+            "min": np.minimum.reduceat(np.where(present, ints, info.max), starts),
+            "max": np.maximum.reduceat(np.where(present, ints, info.min), starts),
+        }
+        if isinstance(series.dtype, np.dtype):  # NumPy integers have no missing values
+            return {(col, func): values for func, values in results.items()}
+        no_missing = np.zeros(len(empty), dtype=bool)
+        return {
+            (col, "sum"): pd.arrays.IntegerArray(results["sum"], mask=no_missing),  # All-NA groups sum to 0
+            (col, "min"): pd.arrays.IntegerArray(results["min"], mask=empty),
+            (col, "max"): pd.arrays.IntegerArray(results["max"], mask=empty),
+        }
+
+    def aggregate(self, keys, column, func) -> pd.Series:
+        """Same result as df.groupby(keys)[column].agg(func), served from the cube when possible"""
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        if func in AGGREGATES and column in self.numeric_columns and column not in keys \
+                and all(key in self.df.columns for key in keys):
+            cube = self.cube(keys)
+            if cube is not None:
+                return cube[(column, func)].rename(column)
+        return self.df.groupby(keys, observed=True)[column].agg(func)
@@ -1,17 +1,17 @@
 import pandas as pd
-from transformers import pipeline
+from memory.model_registry import model_registry
 
 class NarrationTool:
-    def __init__(self):
-        self.model_id = "tiiuae/falcon-rw-1b"
+    def __init__(self, quantize=None):
+        # tiiuae/falcon-rw-1b is loaded by the shared registry the first time a summary is requested
+        self.model_name = "falcon"
+        self.quantize = quantize
+
+    def generate_summary(self, df: pd.DataFrame) -> str:
         try:
-            self.pipe = pipeline("text-generation", model=self.model_id, max_new_tokens=120)
+            model_registry.get(self.model_name, quantize=self.quantize)
         except Exception as e:
             print(f"❌ Model loading failed: {e}")
-            self.pipe = None
-
-    def generate_summary(self, df: pd.DataFrame) -> str:
-        if self.pipe is None:
             return "🚫 Model not loaded. Summary not available."
 
         try:
@@ -28,7 +28,7 @@ class NarrationTool:
             )
 
             print("🟡 Prompt to model:\n", prompt)
-            output = self.pipe(prompt)
+            output = model_registry.run(self.model_name, prompt, quantize=self.quantize)
             summary = output[0]["generated_text"]
             print("✅ Model response:\n", summary)
             return summary.strip()
@@ -0,0 +1,120 @@
+import operator
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+COMPARISONS = {
+    "=": operator.eq, "!=": operator.ne, ">": operator.gt,
+    ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+}
+FILTER_OPERATORS = ["contains", *COMPARISONS]
+
+
+class PageProviderTool:
+    """Server-side row model: the frame stays in Python and only one window of rows is served.
+
+    Sort orders are argsorted once per (column, direction) and cached; filters are vectorized
+    masks; the resulting row positions are cached per (sort, filters) so paging is a slice.
+    """
+
+    MAX_CACHED_DATASETS = 8
+    MAX_CACHED_QUERIES = 16
+    _instances = OrderedDict()
+    _instances_lock = threading.Lock()
+
+    def __init__(self, df: pd.DataFrame, page_size=100, prefetch_pages=1):
+        self.df = df
+        self.page_size = page_size
+        self.prefetch_pages = prefetch_pages
+        self._orders = {}  # (column, ascending) -> row positions
+        self._queries = OrderedDict()  # (sort, filters) -> row positions
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_dataset(cls, dataset_key, df, overlay_token=None, **kwargs):
+        """One provider per dataset version, so cached sort orders survive reruns.
+
+        `overlay_token` (SessionStore.overlay_token) changes whenever a session writes a column,
+        so a provider is only ever shared by callers that see identical data, and is never
+        repointed at another frame.
+        """
+        key = (dataset_key, overlay_token, tuple(df.columns))
+        with cls._instances_lock:
+            provider = cls._instances.get(key)
+            if provider is not None:
+                cls._instances.move_to_end(key)
+                return provider
+        # Shallow copy: later column assignments on the caller's frame do not reach the provider
+        provider = cls(df.copy(deep=False), **kwargs)
+        with cls._instances_lock:
+            cls._instances[key] = provider
+            while len(cls._instances) > cls.MAX_CACHED_DATASETS:
+                cls._instances.popitem(last=False)
+        return provider
+
+    def page(self, number=0, sort_by=None, ascending=True, filters=()) -> dict:
+        """Rows of page `number` plus `prefetch_pages` following pages, and paging metadata"""
+        positions = self.positions(sort_by, ascending, filters)
+        n_pages = max(1, -(-len(positions) // self.page_size))
+        number = min(max(int(number), 0), n_pages - 1)
+        start = number * self.page_size
+        window = positions[start:start + self.page_size * (1 + self.prefetch_pages)]
+        return {
+            "rows": self.df.iloc[window],
+            "page": number,
+            "n_pages": n_pages,
+            "total_rows": len(positions),
+            "start": start,
+        }
+
+    def positions(self, sort_by=None, ascending=True, filters=()) -> np.ndarray:
+        """Row positions after filtering and sorting; cached per query"""
+        filters = tuple(tuple(f) for f in filters)
+        key = (sort_by, ascending, filters)
+        with self._lock:
+            if key in self._queries:
+                self._queries.move_to_end(key)
+                return self._queries[key]
+
+        order = self.sort_order(sort_by, ascending) if sort_by is not None else np.arange(len(self.df))
+        if filters:
+            mask = self.filter_mask(filters)
+            order = order[mask[order]]
+
+        with self._lock:
+            self._queries[key] = order
+            while len(self._queries) > self.MAX_CACHED_QUERIES:
+                self._queries.popitem(last=False)
+        return order
+
+    def sort_order(self, column, ascending=True) -> np.ndarray:
+        with self._lock:
+            key = (column, ascending)
+            if key not in self._orders:
+                # Stable, missing values last in both directions, like sort_values
+                positions = pd.Series(self.df[column].to_numpy(), copy=False)
+                ordered = positions.sort_values(ascending=ascending, kind="stable", na_position="last")
+                self._orders[key] = ordered.index.to_numpy()
+            return self._orders[key]
+
+    def filter_mask(self, filters) -> np.ndarray:
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, op, value in filters:
+            series = self.df[column]
+            if op == "contains":
+                matched = series.astype("string").str.contains(str(value), case=False, regex=False)
+                mask &= matched.fillna(False).to_numpy(dtype=bool)
+                continue
+            matched = COMPARISONS[op](series, self._coerce(series, value))
+            mask &= matched.fillna(False).to_numpy(dtype=bool)
+        return mask
+
+    @staticmethod
+    def _coerce(series, value):
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            return float(value)
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return pd.Timestamp(value)
+        return value
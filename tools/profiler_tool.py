@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from tools.row_fingerprint_tool import RowFingerprintIndex
+
+
+class HyperLogLog:
+    """Mergeable approximate distinct counter; relative error is about 1.04 / sqrt(2 ** precision)"""
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, values):
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_array(np.asarray(values))
+        buckets = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        tail_bits = 64 - self.precision
+        tail = (hashes & np.uint64((1 << tail_bits) - 1)).astype(np.float64)
+        # Rank = position of the leftmost 1-bit in the remaining bits (tail_bits + 1 when all zero)
+        _, exponent = np.frexp(tail)
+        rank = np.where(tail > 0, tail_bits - exponent + 1, tail_bits + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * np.log(self.m / zeros)  # Linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class ProfilerTool:
+    """One pass per column (in parallel) for every metric both quality reports need.
+
+    Columns with more than `exact_distinct_limit` non-null values get HyperLogLog distinct
+    counts; smaller ones are counted exactly.
+    """
+
+    COLUMNS = ["dtype", "missing", "missing_pct", "distinct", "distinct_approx", "constant",
+               "mean", "std", "min", "max", "sample"]
+
+    def __init__(self, exact_distinct_limit=100_000, hll_precision=14, max_workers=None):
+        self.exact_distinct_limit = exact_distinct_limit
+        self.hll_precision = hll_precision
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+    def profile(self, df: pd.DataFrame, fingerprints: RowFingerprintIndex = None) -> dict:
+        """Return {"rows", "duplicates", "columns": DataFrame indexed by column name}"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            rows = list(pool.map(lambda col: self.profile_column(df[col]), df.columns))
+        columns = pd.DataFrame(rows, index=df.columns, columns=self.COLUMNS)
+
+        if fingerprints is None:
+            fingerprints = RowFingerprintIndex.from_frame(df)
+        return {"rows": len(df), "duplicates": fingerprints.duplicate_count(), "columns": columns}
+
+    def profile_column(self, series: pd.Series) -> dict:
+        n = len(series)
+        # min/max cover bool columns too and stay in the column's dtype; mean/std skip bools
+        numeric = pd.api.types.is_numeric_dtype(series)
+        moments = numeric and not pd.api.types.is_bool_dtype(series)
+        if numeric:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            present = ~np.isnan(values)
+        else:
+            present = series.notna().to_numpy()
+        non_null = int(present.sum())
+
+        row = {
+            "dtype": series.dtype,
+            "missing": n - non_null,
+            "missing_pct": (n - non_null) / n * 100 if n else 0.0,
+            "sample": series.iloc[int(present.argmax())] if non_null else None,
+        }
+        row["distinct"], row["distinct_approx"] = self._distinct(series, present, non_null)
+        row["constant"] = row["distinct"] == 1
+
+        if numeric and non_null:
+            if isinstance(series.dtype, np.dtype):
+                native = series.to_numpy()
+                native = native if non_null == n else native[present]
+                row.update({"min": native.min(), "max": native.max()})
+            else:
+                row.update({"min": series.min(), "max": series.max()})
+        if moments and non_null:
+            observed = values[present]
+            row.update({
+                "mean": observed.mean(),
+                "std": observed.std(ddof=1) if non_null > 1 else np.nan,
+            })
+        return row
+
+    def _distinct(self, series, present, non_null):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return int(len(np.unique(series.cat.codes.to_numpy()[present]))), False
+        if non_null <= self.exact_distinct_limit:
+            return int(series.nunique()), False
+        sketch = HyperLogLog(self.hll_precision)
+        sketch.update(series.to_numpy()[present])
+        return sketch.count(), True
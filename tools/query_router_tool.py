@@ -0,0 +1,242 @@
+import re
+
+import pandas as pd
+
+from tools.table_retrieval_tool import TOKEN_PATTERN, TableRetrievalTool
+
+AGGREGATE_KEYWORDS = [
+    ("mean", ["average", "avg", "mean"]),
+    ("median", ["median"]),
+    ("sum", ["sum", "total"]),
+    ("max", ["maximum", "max"]),
+    ("min", ["minimum", "min"]),
+    ("count", ["how many", "number of", "count"]),
+]
+
+# Plain max/min of a column, or argmax/argmin over groups in "which <column> has the highest ..."
+SUPERLATIVES = [
+    ("max", ["highest", "largest", "biggest"]),
+    ("min", ["lowest", "smallest"]),
+]
+
+COMPARATORS = [
+    (">=", ["at least", ">="]),
+    ("<=", ["at most", "<="]),
+    (">", ["greater than", "more than", "above", "over", ">"]),
+    ("<", ["less than", "fewer than", "below", "under", "<"]),
+    ("==", ["equal to", "equals", "is", "=", "=="]),
+]
+
+MAX_GROUPS_SHOWN = 20
+
+
+def _phrase(text) -> str:
+    # Unlike retrieval tokens, stopwords are kept: "by" / "per" carry the grouping intent
+    return " ".join(TOKEN_PATTERN.findall(str(text).lower()))
+
+
+def _format_number(value):
+    if isinstance(value, float) or hasattr(value, "is_integer"):
+        value = float(value)
+        if value.is_integer():
+            return f"{int(value):,}"
+        return f"{value:,.6f}".rstrip("0").rstrip(".")
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+
+class QueryRouterTool:
+    """Answers simple aggregate / filter / top-k questions with vectorized pandas on the full frame.
+
+    `answer` returns None when the question doesn't parse, so the caller can fall back to the model.
+    """
+
+    def __init__(self, df: pd.DataFrame, retriever: TableRetrievalTool = None):
+        self.df = df
+        self.retriever = retriever or TableRetrievalTool(df)
+        self.numeric_columns = df.select_dtypes(include="number").columns.tolist()
+        # Longest names first so "unit price" wins over "price"
+        self.column_phrases = sorted(
+            ((_phrase(col), col) for col in df.columns if _phrase(col)),
+            key=lambda item: -len(item[0])
+        )
+
+    def answer(self, question: str):
+        spec = self.parse(question)
+        if spec is None:
+            return None
+        try:
+            return self.execute(spec)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def parse(self, question: str):
+        text = " " + " ".join(re.findall(r"[a-z0-9_.<>=]+|\s", question.lower().replace(",", ""))) + " "
+        text = re.sub(r"\s+", " ", text)
+        phrase_text = " " + _phrase(question) + " "
+
+        top_match = re.search(r"\b(top|bottom|highest|lowest)\s+(\d+)\b", text)
+        top_k = (top_match.group(1), int(top_match.group(2))) if top_match else None
+
+        func = self._keyword(text, AGGREGATE_KEYWORDS)
+        superlative = self._keyword(text, SUPERLATIVES)
+        which_col = self._which_column(phrase_text)
+        pick = None
+        if which_col is not None and superlative is not None and top_k is None:
+            # "which region has the highest revenue": aggregate per region, then name the best one
+            pick = superlative
+        elif func is None:
+            func = superlative
+        if func is None and top_k is None and pick is None:
+            return None
+
+        mentions = self._mentions(phrase_text)
+        group_col = which_col if pick is not None else self._group_column(phrase_text, ranking=top_k is not None)
+        if group_col is None and top_match is not None:
+            # "top 5 region by revenue": the column right after "top N" is the grouping key
+            group_col = self._leading_column(" " + _phrase(text[top_match.end():]) + " ", numeric=False)
+        numeric_filters = self._numeric_filters(text)
+
+        _, value_filters = self.retriever.match(question)
+        value_filters = {col: values for col, values in value_filters.items() if col != group_col}
+
+        filtered_cols = set(value_filters)
+        targets = [col for _, col in mentions if col in self.numeric_columns and col != group_col]
+        target = targets[0] if targets else None
+
+        if func not in (None, "count") and target is None:
+            return None
+        if top_k is not None and target is None:
+            return None
+        if func is None:
+            func = "sum" if group_col else None
+
+        # A categorical column the spec would ignore means the question isn't understood; let the model try
+        used = {group_col, *value_filters}
+        if any(col not in self.numeric_columns and col not in used for _, col in mentions):
+            return None
+
+        return {
+            "func": func,
+            "target": target,
+            "group": group_col,
+            "top_k": top_k,
+            "pick": pick,
+            "value_filters": value_filters,
+            "numeric_filters": [f for f in numeric_filters if f[0] not in filtered_cols],
+        }
+
+    def execute(self, spec) -> str:
+        mask = pd.Series(True, index=self.df.index)
+        conditions = []
+        for col, values in spec["value_filters"].items():
+            mask &= self.df[col].isin(values)
+            conditions.append(f"{col} in {values}" if len(values) > 1 else f"{col} = {values[0]}")
+        for col, op, number in spec["numeric_filters"]:
+            series = self.df[col]
+            mask &= {
+                ">": series > number, "<": series < number, ">=": series >= number,
+                "<=": series <= number, "==": series == number
+            }[op]
+            conditions.append(f"{col} {op} {_format_number(number)}")
+
+        rows = self.df if mask.all() else self.df.loc[mask]
+        where = f" where {' and '.join(conditions)}" if conditions else ""
+        func, target, group, top_k = spec["func"], spec["target"], spec["group"], spec["top_k"]
+
+        if group is None and top_k is not None:
+            # "top 5 rows by price": whole rows ranked on the target column
+            direction, k = top_k
+            ranked = rows.nlargest(k, target) if direction in ("top", "highest") else rows.nsmallest(k, target)
+            return f"{direction.title()} {k} rows by {target}{where}:\n```\n{ranked.to_string()}\n```"
+
+        if group is None:
+            if func == "count":
+                value = int(rows[target].count()) if target else len(rows)
+                label = f"count of {target}" if target else "row count"
+            else:
+                value = rows[target].agg(func)
+                label = f"{func} of {target}"
+            return f"**{label}**{where}: {_format_number(value)} (computed over {len(rows):,} rows)"
+
+        grouped = rows.groupby(group, observed=True)
+        result = grouped.size() if func == "count" and target is None else grouped[target].agg(func)
+        label = f"{func} of {target}" if target else "row count"
+
+        if spec.get("pick") is not None:
+            result = result.dropna()
+            if result.empty:
+                raise ValueError("No groups to compare")
+            key = result.idxmax() if spec["pick"] == "max" else result.idxmin()
+            which = "highest" if spec["pick"] == "max" else "lowest"
+            return f"**{group} with the {which} {label}**{where}: {key} ({_format_number(result[key])})"
+
+        if top_k is not None:
+            direction, k = top_k
+            result = result.nlargest(k) if direction in ("top", "highest") else result.nsmallest(k)
+        else:
+            result = result.sort_values(ascending=False)
+
+        lines = [f"- {key}: {_format_number(value)}" for key, value in result.head(MAX_GROUPS_SHOWN).items()]
+        more = f"\n…and {len(result) - MAX_GROUPS_SHOWN} more groups" if len(result) > MAX_GROUPS_SHOWN else ""
+        return f"**{label} by {group}**{where}:\n" + "\n".join(lines) + more
+
+    @staticmethod
+    def _keyword(text, vocabulary):
+        for name, keywords in vocabulary:
+            if any(re.search(rf"\b{re.escape(word)}\b", text) for word in keywords):
+                return name
+        return None
+
+    def _mentions(self, phrase_text):
+        """Columns named in the question (plurals too), ordered by position, longest name winning overlaps"""
+        taken, found = [], []
+        for phrase, col in self.column_phrases:
+            for match in re.finditer(rf" {re.escape(phrase)}(?:s|es)? ", phrase_text):
+                span = (match.start(), match.end())
+                if any(span[0] < end and start < span[1] for start, end in taken):
+                    continue
+                taken.append(span)
+                found.append((span[0], col))
+        return sorted(found)
+
+    def _group_column(self, phrase_text, ranking=False):
+        """Column after "by"/"per"; numeric ones only group when not used for top-k ranking"""
+        for match in re.finditer(r" (?:by|per|each|across) ", phrase_text):
+            col = self._leading_column(phrase_text[match.end() - 1:], numeric=not ranking)
+            if col is not None:
+                return col
+        return None
+
+    def _which_column(self, phrase_text):
+        """Categorical column right after "which" / "what", e.g. "which region has ..." """
+        match = re.search(r" (?:which|what) ", phrase_text)
+        if match is None:
+            return None
+        return self._leading_column(phrase_text[match.end() - 1:], numeric=False)
+
+    def _leading_column(self, text, numeric=True):
+        for phrase, col in self.column_phrases:
+            if re.match(rf" {re.escape(phrase)}(?:s|es)? ", text) and (numeric or col not in self.numeric_columns):
+                return col
+        return None
+
+    def _numeric_filters(self, text):
+        """(column, op, number) conditions, longest column name winning overlaps like `_mentions`"""
+        taken, found = [], []
+        for col in sorted(self.numeric_columns, key=lambda col: -len(str(col))):
+            name = re.escape(str(col).lower())
+            for op, words in COMPARATORS:
+                pattern = "|".join(re.escape(word) for word in words)
+                matched = False
+                for match in re.finditer(rf"\b{name}\s*(?:is\s+)?(?:{pattern})\s*(-?\d+(?:\.\d+)?)", text):
+                    span = (match.start(), match.end())
+                    if any(span[0] < end and start < span[1] for start, end in taken):
+                        continue
+                    taken.append(span)
+                    found.append((span[0], (col, op, float(match.group(1)))))
+                    matched = True
+                if matched:
+                    break
+        return [condition for _, condition in sorted(found, key=lambda item: item[0])]
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Above this many points traces switch from SVG to WebGL
+WEBGL_THRESHOLD = 10_000
+# Line series are downsampled (LTTB) to this many points
+MAX_LINE_POINTS = 5_000
+# Marker traces (and the points a line trace is forced to keep) are capped the same way
+MAX_MARKER_POINTS = 5_000
+# Scatters larger than this become server-side 2-D binned heatmaps
+HEATMAP_THRESHOLD = 50_000
+HEATMAP_BINS = 200
+
+
+def _numeric_axis(values) -> np.ndarray:
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype("int64").to_numpy(dtype=np.float64)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.arange(len(values), dtype=np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: positions of `n_out` points that preserve the series shape"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket is the third triangle vertex
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        bucket_x, bucket_y = x[start:end], y[start:end]
+        areas = np.abs(
+            (x[previous] - next_x) * (bucket_y - y[previous])
+            - (x[previous] - bucket_x) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def _reduce(x, y, positions, max_points):
+    """LTTB subset of `positions` when there are more than `max_points` of them"""
+    if len(positions) <= max_points:
+        return positions
+    return positions[lttb_indices(_numeric_axis(x)[positions], y.to_numpy(dtype=np.float64)[positions], max_points)]
+
+
+class RenderTool:
+    """Keeps figure payloads bounded: WebGL traces, LTTB line downsampling and binned heatmaps"""
+
+    def line_trace(self, x, y, name, keep_mask=None, max_points=MAX_LINE_POINTS, **trace_kwargs):
+        """Line trace downsampled with LTTB; rows where `keep_mask` is True are always retained"""
+        x = pd.Series(x).reset_index(drop=True)
+        y = pd.Series(y).reset_index(drop=True)
+        present = y.notna().to_numpy()
+        positions = np.flatnonzero(present)
+
+        if len(positions) > max_points:
+            chosen = _reduce(x, y, positions, max_points)
+            if keep_mask is not None:
+                forced = np.flatnonzero(np.asarray(keep_mask, dtype=bool) & present)
+                chosen = np.union1d(chosen, _reduce(x, y, forced, MAX_MARKER_POINTS))
+            x, y = x.iloc[chosen], y.iloc[chosen]
+
+        return self._trace_class(len(y))(x=x, y=y, name=name, **trace_kwargs)
+
+    def marker_trace(self, x, y, name, max_points=MAX_MARKER_POINTS, **trace_kwargs):
+        """Marker trace downsampled with LTTB beyond `max_points`"""
+        x = pd.Series(x).reset_index(drop=True)
+        y = pd.Series(y).reset_index(drop=True)
+        chosen = _reduce(x, y, np.flatnonzero(y.notna().to_numpy()), max_points)
+        if len(chosen) < len(y):
+            x, y = x.iloc[chosen], y.iloc[chosen]
+        return self._trace_class(len(y))(x=x, y=y, name=name, mode="markers", **trace_kwargs)
+
+    def scatter_figure(self, df, x, y, title):
+        """Scatter for small frames, WebGL for medium ones and a 2-D histogram heatmap beyond that"""
+        n = len(df)
+        if n <= WEBGL_THRESHOLD:
+            return px.scatter(df, x=x, y=y, title=title)
+        if n <= HEATMAP_THRESHOLD:
+            return px.scatter(df, x=x, y=y, title=title, render_mode="webgl")
+
+        y_values = df[y].to_numpy(dtype=np.float64, na_value=np.nan)
+        if not pd.api.types.is_numeric_dtype(df[x]):
+            # No numeric x to bin on: a uniform row sample keeps the point cloud readable
+            sample = df[[x, y]].sample(HEATMAP_THRESHOLD, random_state=0)
+            return px.scatter(sample, x=x, y=y, title=f"{title} (sample of {HEATMAP_THRESHOLD:,} rows)", render_mode="webgl")
+
+        x_values = df[x].to_numpy(dtype=np.float64, na_value=np.nan)
+        ok = ~(np.isnan(x_values) | np.isnan(y_values))
+        counts, x_edges, y_edges = np.histogram2d(x_values[ok], y_values[ok], bins=HEATMAP_BINS)
+        fig = go.Figure(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.where(counts.T > 0, counts.T, np.nan),  # Empty bins stay transparent
+            colorscale="Viridis",
+            colorbar=dict(title="rows")
+        ))
+        fig.update_layout(title=f"{title} ({int(ok.sum()):,} rows binned)", xaxis_title=x, yaxis_title=y)
+        return fig
+
+    @staticmethod
+    def _trace_class(n_points):
+        return go.Scattergl if n_points > WEBGL_THRESHOLD else go.Scatter
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """Vectorized 64-bit fingerprint per row; independent of the index, so appended rows hash alike"""
+    if len(df.columns) == 0:
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+
+
+class RowFingerprintIndex:
+    """One uint64 fingerprint per row (8 bytes/row), built once and extended on append.
+
+    The duplicate mask is computed on first use and then kept up to date incrementally against
+    a sorted array of the distinct fingerprints seen so far (8 bytes each), so appends are
+    vectorized lookups and repeated duplicate checks cost nothing. Equal fingerprints are treated
+    as equal rows; a false match needs a 64-bit collision.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = list(columns) if columns is not None else None
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._size = 0
+        self._duplicated = None
+        self._distinct = None  # Sorted unique fingerprints, kept only once duplicates are tracked
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns=None):
+        index = cls(columns)
+        index.append(df)
+        return index
+
+    @property
+    def fingerprints(self) -> np.ndarray:
+        return self._hashes[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        tracked = 0 if self._duplicated is None else self._duplicated.nbytes + self._distinct.nbytes
+        return self._size * self._hashes.itemsize + tracked
+
+    def __getstate__(self):
+        # Pickle (artifact cache) only the used part of the over-allocated buffer
+        return {**self.__dict__, "_hashes": self.fingerprints.copy()}
+
+    def __len__(self):
+        return self._size
+
+    def append(self, df: pd.DataFrame):
+        """Fingerprint new rows; existing fingerprints and the duplicate mask are not recomputed"""
+        new = hash_rows(df[self.columns] if self.columns is not None else df)
+        if self._duplicated is not None:
+            distinct, first = np.unique(new, return_index=True)
+            mask = np.ones(len(new), dtype=bool)
+            mask[first] = False  # First occurrence within the new rows...
+            mask |= self._contains(new)  # ...unless an earlier row already had it
+            fresh = distinct[~self._contains(distinct)]
+            self._distinct = np.insert(self._distinct, np.searchsorted(self._distinct, fresh), fresh)
+            self._duplicated = np.concatenate([self._duplicated, mask])
+
+        needed = self._size + len(new)
+        if needed > len(self._hashes):
+            grown = np.empty(max(needed, 2 * len(self._hashes)), dtype=np.uint64)
+            grown[:self._size] = self.fingerprints
+            self._hashes = grown
+        self._hashes[self._size:needed] = new
+        self._size = needed
+        return self
+
+    def duplicated(self) -> np.ndarray:
+        """Boolean mask of rows that repeat an earlier row (keep='first' semantics)"""
+        if self._duplicated is None:
+            self._distinct, first = np.unique(self.fingerprints, return_index=True)
+            duplicated = np.ones(self._size, dtype=bool)
+            duplicated[first] = False
+            self._duplicated = duplicated
+        return self._duplicated
+
+    def _contains(self, fingerprints) -> np.ndarray:
+        """Membership of each fingerprint in the sorted distinct array"""
+        positions = np.searchsorted(self._distinct, fingerprints)
+        found = positions < len(self._distinct)
+        found[found] = self._distinct[positions[found]] == fingerprints[found]
+        return found
+
+    def duplicate_count(self) -> int:
+        return int(self.duplicated().sum())
+
+    def lookup(self, rows: pd.DataFrame) -> np.ndarray:
+        """Positions of indexed rows identical to any of `rows`"""
+        probe = hash_rows(rows[self.columns] if self.columns is not None else rows)
+        return np.flatnonzero(pd.Index(self.fingerprints).isin(probe))
+
+    @staticmethod
+    def near_duplicates(df: pd.DataFrame, columns=None, decimals=2, normalize_text=True) -> pd.Series:
+        """Group rows that match once text is case/whitespace-normalized and floats are rounded.
+
+        Returns a Series (indexed like `df`) of group ids for rows that belong to a group of two
+        or more; `columns` restricts the comparison, e.g. to leave out IDs or timestamps.
+        """
+        subset = df[list(columns)] if columns is not None else df
+        normalized = {}
+        for col in subset.columns:
+            series = subset[col]
+            if pd.api.types.is_float_dtype(series) and decimals is not None:
+                series = series.round(decimals)
+            elif normalize_text and (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+                series = series.astype("string").str.strip().str.lower()
+            normalized[col] = series
+        fingerprints = pd.Series(hash_rows(pd.DataFrame(normalized, index=df.index)), index=df.index)
+
+        repeated = fingerprints[fingerprints.duplicated(keep=False)]
+        return pd.Series(pd.factorize(repeated)[0], index=repeated.index, name="group")
@@ -0,0 +1,282 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from tools.profiler_tool import HyperLogLog
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class KLLSketch:
+    """Mergeable KLL quantile sketch over float values, updated a whole array at a time"""
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        self.n += other.n
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self._compress()
+        return self
+
+    def quantiles(self, qs) -> np.ndarray:
+        items = np.concatenate(self.levels)
+        if len(items) == 0:
+            return np.full(len(qs), np.nan)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        targets = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        idx = np.clip(np.searchsorted(cumulative, targets, side="left"), 0, len(items) - 1)
+        return items[idx]
+
+    @property
+    def rank_error(self) -> float:
+        """Normalized rank error bound (99% confidence, DataSketches constants); 0 while exact"""
+        if len(self.levels) == 1:
+            return 0.0
+        return 2.296 / self.k ** 0.9723
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(8, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                level = np.sort(level)
+                leftover = len(level) % 2
+                # Keep every other item (random phase) at double weight one level up
+                promoted = level[leftover:][self.rng.integers(2)::2]
+                self.levels[h] = level[:leftover]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+
+class TopKSketch:
+    """Misra-Gries frequent-items summary; counts are lower bounds, undercounted by at most `error`"""
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.error = 0
+
+    def update(self, values: pd.Series):
+        self._absorb(values.value_counts(dropna=True))
+
+    def merge(self, other: "TopKSketch"):
+        self.error += other.error
+        self._absorb(other.counts)
+        return self
+
+    def top(self, n=1):
+        return self.counts.nlargest(n)
+
+    def _absorb(self, counts: pd.Series):
+        if len(counts) == 0:
+            return
+        combined = counts if self.counts.empty else self.counts.add(counts, fill_value=0)
+        combined = combined.astype(np.int64)
+        if len(combined) > self.capacity:
+            cut = int(combined.nlargest(self.capacity + 1).iloc[-1])
+            combined = combined[combined > cut] - cut
+            self.error += cut
+        self.counts = combined
+
+
+class ColumnSketch:
+    """Count / mean / variance / min / max, quantiles, distinct count and frequent values for one column"""
+
+    def __init__(self, kind, k=200, top_capacity=1024, track_top=True, hll_precision=12):
+        self.kind = kind  # "numeric", "datetime" or "categorical"
+        self.top_capacity = top_capacity
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.kll = KLLSketch(k) if kind != "categorical" else None
+        # Frequencies of continuous values are meaningless and costly, so floats/datetimes skip them
+        self.top = TopKSketch(top_capacity) if track_top else None
+        self.distinct = HyperLogLog(hll_precision)
+
+    def promote(self):
+        """Turn a numeric/datetime sketch into a text one once the column turns out to hold text.
+
+        Moments and quantiles are dropped. Values seen before frequencies were tracked count
+        towards the frequency error bound, and already-counted values are keyed by their text.
+        """
+        if self.kind == "categorical":
+            return self
+        self.kind = "categorical"
+        self.kll = None
+        self.mean, self.m2, self.min, self.max = 0.0, 0.0, np.inf, -np.inf
+        if self.top is None:
+            self.top = TopKSketch(self.top_capacity)
+            self.top.error += self.count
+        elif not self.top.counts.empty:
+            counts = self.top.counts
+            self.top.counts = counts.groupby(counts.index.astype(str)).sum().astype(np.int64)
+        return self
+
+    def update(self, series: pd.Series):
+        self.nulls += int(series.isna().sum())
+        self.distinct.update(series.dropna().to_numpy())
+        if self.top is not None:
+            self.top.update(series)
+        if self.kll is None:
+            self.count += int(series.notna().sum())
+            return
+
+        values = series.dropna()
+        if self.kind == "datetime":
+            values = values.dt.as_unit("ns").astype("int64")
+        values = values.to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return
+        chunk_mean = values.mean()
+        self._merge_moments(len(values), chunk_mean, float(((values - chunk_mean) ** 2).sum()))
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.kll.update(values)
+
+    def merge(self, other: "ColumnSketch"):
+        if self.kind != other.kind:
+            # Text on either side makes the column text, as a whole-file read would
+            self.promote()
+            other.promote()
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        if self.top is not None:
+            if other.top is not None:
+                self.top.merge(other.top)
+            else:
+                self.top.error += other.count  # The other side never tracked frequencies
+        if self.kll is None:
+            self.count += other.count
+            return self
+        if other.count:
+            self._merge_moments(other.count, other.mean, other.m2)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.kll.merge(other.kll)
+        return self
+
+    def _merge_moments(self, n_b, mean_b, m2_b):
+        # Chan et al. parallel variance update
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta ** 2 * n_a * n_b / n
+        self.count = n
+
+    def describe(self) -> dict:
+        top = self.top.top(1) if self.top is not None else pd.Series(dtype=np.int64)
+        row = {
+            "count": self.count,
+            "nulls": self.nulls,
+            # Like describe(), distinct counts are reported for text columns (HyperLogLog estimate)
+            "unique": self.distinct.count() if self.kind == "categorical" else None,
+            "top": top.index[0] if len(top) else None,
+            "freq": int(top.iloc[0]) if len(top) else None,
+            "freq_error": self.top.error if self.top is not None else None,
+        }
+        if self.kll is None or self.count == 0:
+            return row
+
+        q25, q50, q75 = self.kll.quantiles(QUANTILES)
+        stats = {"mean": self.mean, "min": self.min, "25%": q25, "50%": q50, "75%": q75, "max": self.max}
+        if self.kind == "datetime":
+            stats = {name: pd.Timestamp(int(value)) for name, value in stats.items()}
+        else:
+            stats["std"] = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        row.update(stats)
+        row["quantile_rank_error"] = self.kll.rank_error
+        return row
+
+
+class StatsEngineTool:
+    """Single-pass, chunked, mergeable replacement for df.describe(include='all')"""
+
+    COLUMNS = ["count", "nulls", "unique", "mean", "std", "min", "25%", "50%", "75%", "max", "top", "freq", "freq_error",
+               "quantile_rank_error"]
+
+    def __init__(self, k=200, top_capacity=1024, chunksize=1_000_000):
+        self.k = k
+        self.top_capacity = top_capacity
+        self.chunksize = chunksize
+
+    def sketch_frame(self, df: pd.DataFrame, sketches=None) -> dict:
+        """Fold a frame into per-column sketches, slicing it into row chunks (views, not copies)"""
+        sketches = sketches if sketches is not None else {}
+        for start in range(0, max(len(df), 1), self.chunksize):
+            self._update(sketches, df.iloc[start:start + self.chunksize])
+        return sketches
+
+    def sketch_csv(self, source, **read_kwargs) -> dict:
+        sketches = {}
+        for chunk in pd.read_csv(source, chunksize=self.chunksize, **read_kwargs):
+            self._update(sketches, chunk)
+        return sketches
+
+    @staticmethod
+    def merge(left: dict, right: dict) -> dict:
+        """Combine sketches built over different chunks or by different workers"""
+        for col, sketch in right.items():
+            if col in left:
+                left[col].merge(sketch)
+            else:
+                left[col] = sketch
+        return left
+
+    def describe(self, sketches: dict) -> pd.DataFrame:
+        rows = {col: sketch.describe() for col, sketch in sketches.items()}
+        return pd.DataFrame.from_dict(rows, orient="index").reindex(columns=self.COLUMNS)
+
+    def analyze(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.describe(self.sketch_frame(df))
+
+    def _update(self, sketches, chunk):
+        for col in chunk.columns:
+            series = chunk[col]
+            kind = self._kind(series)
+            sketch = sketches.get(col)
+            if sketch is None:
+                track_top = kind == "categorical" or pd.api.types.is_integer_dtype(series)
+                sketch = sketches[col] = ColumnSketch(kind, self.k, self.top_capacity, track_top)
+            elif kind != sketch.kind:
+                # CSV chunks are typed independently: numbers early and text later means a text column
+                sketch.promote()
+                if kind != "categorical":
+                    series = series.astype("string")
+            sketch.update(series)
+
+    @staticmethod
+    def _kind(series):
+        if pd.api.types.is_bool_dtype(series):
+            return "categorical"
+        if pd.api.types.is_numeric_dtype(series):
+            return "numeric"
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return "datetime"
+        return "categorical"
@@ -0,0 +1,216 @@
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+import pandas as pd
+
+from tools.group_index_tool import GroupIndexTool
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = {"the", "a", "an", "of", "in", "for", "is", "are", "what", "which", "how", "by", "and", "or", "to", "with", "on", "per"}
+AGGREGATES = ["count", "sum", "mean", "min", "max"]
+
+
+def tokenize(text) -> list:
+    return [tok for tok in TOKEN_PATTERN.findall(str(text).lower()) if tok not in STOPWORDS]
+
+
+class TableRetrievalTool:
+    """Inverted indexes over column names and categorical values that cut a large frame down to
+    the few columns and rows (or pre-aggregated slices) a question actually needs."""
+
+    _instances = OrderedDict()
+    _instances_lock = threading.Lock()
+    MAX_CACHED_DATASETS = 8
+
+    def __init__(self, df: pd.DataFrame, max_rows=64, max_columns=8, max_index_cardinality=50000, group_index=None):
+        self.df = df
+        # Aggregated answers come from per-key cubes, so their cost depends on groups, not rows
+        self.group_index = group_index or GroupIndexTool(df)
+        self._totals = None
+        self.max_rows = max_rows
+        self.max_columns = max_columns
+        self.numeric_columns = df.select_dtypes(include="number").columns.tolist()
+
+        # token -> columns whose name contains it
+        self.column_index = defaultdict(set)
+        for col in df.columns:
+            for tok in tokenize(col):
+                self.column_index[tok].add(col)
+
+        # token -> [(column, value)] and (column, value) -> row positions, for low-cardinality columns;
+        # positions are int32 whenever the frame allows it (half the memory of groupby's int64)
+        position_dtype = np.int32 if len(df) < np.iinfo(np.int32).max else np.int64
+        self.value_index = defaultdict(list)
+        self.row_index = {}
+        self.group_columns = []
+        for col in df.columns:
+            if col in self.numeric_columns:
+                continue
+            if df[col].nunique() > max_index_cardinality:
+                continue
+            self.group_columns.append(col)
+            for value, positions in df.groupby(col, observed=True, sort=False).indices.items():
+                self.row_index[(col, value)] = positions.astype(position_dtype, copy=False)
+                for tok in tokenize(value):
+                    self.value_index[tok].append((col, value))
+
+    @classmethod
+    def for_dataset(cls, dataset_key, df, **kwargs):
+        """Build the indexes once per dataset and reuse them across reruns and sessions"""
+        with cls._instances_lock:
+            tool = cls._instances.get(dataset_key)
+            if tool is not None:
+                cls._instances.move_to_end(dataset_key)
+                return tool
+        kwargs.setdefault("group_index", GroupIndexTool.for_dataset(dataset_key, df))
+        tool = cls(df, **kwargs)
+        with cls._instances_lock:
+            cls._instances[dataset_key] = tool
+            while len(cls._instances) > cls.MAX_CACHED_DATASETS:
+                cls._instances.popitem(last=False)
+        return tool
+
+    def match(self, question):
+        """Return (ranked columns, {column: [values]}) mentioned in the question"""
+        tokens = tokenize(question)
+        token_set = set(tokens)
+
+        column_scores = defaultdict(int)
+        for tok in tokens:
+            for col in self.column_index.get(tok, ()):
+                column_scores[col] += 1
+
+        filters = defaultdict(list)
+        for tok in token_set:
+            for col, value in self.value_index.get(tok, ()):
+                # Multi-word values only match when every word appears in the question
+                if set(tokenize(value)) <= token_set and value not in filters[col]:
+                    filters[col].append(value)
+
+        columns = sorted(column_scores, key=lambda col: -column_scores[col])
+        return columns, dict(filters)
+
+    def retrieve(self, question) -> pd.DataFrame:
+        """Build the small string table that is handed to the QA model"""
+        columns, filters = self.match(question)
+        positions = self._filter_positions(filters)
+        n_rows = len(self.df) if positions is None else len(positions)
+
+        if n_rows <= self.max_rows:
+            rows = self.df if positions is None else self.df.iloc[positions]
+            table = rows[self._select_columns(columns, filters)]
+        else:
+            table = self._aggregate(columns, filters, positions)
+
+        if table.empty or table.shape[1] == 0:
+            table = self.df.head(self.max_rows)[self.df.columns[:self.max_columns]]
+        return table.reset_index(drop=True).astype(str)
+
+    def _filter_positions(self, filters):
+        if not filters:
+            return None
+        per_column = [
+            np.sort(np.concatenate([self.row_index[(col, value)] for value in values]))
+            for col, values in filters.items()
+        ]
+        # Intersect starting from the most selective column to keep the working set small
+        per_column.sort(key=len)
+        positions = per_column[0]
+        for col_positions in per_column[1:]:
+            positions = positions[np.isin(positions, col_positions, assume_unique=True)]
+        return positions
+
+    def _select_columns(self, columns, filters):
+        selected = list(dict.fromkeys(list(filters) + columns))
+        if not selected:
+            selected = list(self.df.columns)
+        return selected[:self.max_columns]
+
+    def _aggregate(self, columns, filters, positions):
+        """Too many rows to pass through: pre-aggregate the matched numeric columns instead"""
+        numeric = [col for col in columns if col in self.numeric_columns] or self.numeric_columns
+        numeric = numeric[:max(1, self.max_columns - 1)]
+        group_candidates = [col for col in list(filters) + columns if col in self.group_columns]
+
+        table = self._cube_aggregate(group_candidates[0] if group_candidates else None, filters, numeric)
+        if table is not None:
+            return table
+
+        # Too many key combinations to cube: aggregate the filtered rows directly
+        rows = self.df if positions is None else self.df.iloc[positions]
+        if group_candidates:
+            group_col = group_candidates[0]
+            grouped = rows.groupby(group_col, observed=True, sort=False)
+            table = grouped.size().rename("count").to_frame()
+            if numeric:
+                stats = grouped[numeric].agg(AGGREGATES[1:])
+                stats.columns = [f"{agg} of {col}" for col, agg in stats.columns]
+                table = table.join(stats)
+            table = table.reset_index()
+            if len(table) > self.max_rows:
+                table = table.nlargest(self.max_rows, "count")
+            return table
+
+        # No grouping key: one row per aggregate over the whole (filtered) slice
+        if not numeric:
+            return pd.DataFrame({"statistic": ["count"], "value": [len(rows)]})
+        table = rows[numeric].agg(AGGREGATES[1:])
+        table.loc["count"] = rows[numeric].count()
+        return table.rename_axis("statistic").reset_index()
+
+    def _cube_aggregate(self, group_col, filters, numeric):
+        """Same tables as the groupby path, combined from cached cube cells instead of rows"""
+        keys = [col for col in filters if col != group_col] + ([group_col] if group_col else [])
+        if not keys:
+            return self._whole_frame_totals(numeric)
+        cube = self.group_index.cube(keys)
+        if cube is None:
+            return None
+        sizes = self.group_index.size(keys)
+
+        mask = np.ones(len(cube), dtype=bool)
+        for col, values in filters.items():
+            mask &= cube.index.get_level_values(col).isin(values)
+        cells, sizes = cube[mask], sizes[mask]
+        stat = {(col, agg): cells[(col, agg)] for col in numeric for agg in ("sum", "count", "min", "max")}
+
+        if group_col is not None:
+            level = cells.index.get_level_values(group_col)
+            table = sizes.groupby(level, observed=True, sort=False).sum().rename("count").to_frame()
+            for col in numeric:
+                sums = stat[(col, "sum")].groupby(level, observed=True, sort=False).sum()
+                counts = stat[(col, "count")].groupby(level, observed=True, sort=False).sum()
+                table[f"sum of {col}"] = sums
+                table[f"mean of {col}"] = sums / counts.where(counts > 0)
+                table[f"min of {col}"] = stat[(col, "min")].groupby(level, observed=True, sort=False).min()
+                table[f"max of {col}"] = stat[(col, "max")].groupby(level, observed=True, sort=False).max()
+            table = table[table["count"] > 0].rename_axis(group_col).reset_index()
+            if len(table) > self.max_rows:
+                table = table.nlargest(self.max_rows, "count")
+            return table
+
+        if not numeric:
+            return pd.DataFrame({"statistic": ["count"], "value": [int(sizes.sum())]})
+        table = pd.DataFrame({
+            col: [
+                stat[(col, "sum")].sum(),
+                stat[(col, "sum")].sum() / count if (count := stat[(col, "count")].sum()) else np.nan,
+                stat[(col, "min")].min(),
+                stat[(col, "max")].max(),
+                count,
+            ]
+            for col in numeric
+        }, index=["sum", "mean", "min", "max", "count"])
+        return table.rename_axis("statistic").reset_index()
+
+    def _whole_frame_totals(self, numeric):
+        """Unfiltered, ungrouped statistics: computed over all rows once, then reused"""
+        if self._totals is None:
+            totals = self.df[self.numeric_columns].agg(AGGREGATES[1:])
+            totals.loc["count"] = self.df[self.numeric_columns].count()
+            self._totals = totals
+        if not numeric:
+            return pd.DataFrame({"statistic": ["count"], "value": [len(self.df)]})
+        return self._totals[numeric].rename_axis("statistic").reset_index()
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class TaskSchedulerTool:
+    """Runs a dependency graph of callables, starting every task as soon as its dependencies finish"""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self.tasks = {}  # name -> {"func", "depends_on", "timeout"}
+        self.abandoned = []  # Futures of timed-out tasks whose threads may still be running
+
+    def add_task(self, name, func, depends_on=(), timeout=None):
+        self.tasks[name] = {"func": func, "depends_on": list(depends_on), "timeout": timeout}
+
+    def validate(self):
+        """Reject unknown dependencies and cycles before anything is submitted"""
+        for name, spec in self.tasks.items():
+            for dep in spec["depends_on"]:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task '{name}' depends on unknown task '{dep}'")
+
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at task '{name}'")
+            visiting.add(name)
+            for dep in self.tasks[name]["depends_on"]:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.tasks:
+            visit(name)
+
+    def run(self):
+        """Execute the graph and return {name: {"status", "result", "error", "elapsed"}}.
+
+        Status is one of completed, failed, timeout or skipped (a dependency did not complete).
+        A timed-out task is abandoned, not killed: its thread finishes in the background, so
+        shared state it reads must stay alive until `when_idle` fires.
+        """
+        self.validate()
+        results = {}
+        running = {}  # future -> (name, started_at)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers or len(self.tasks) or 1)
+
+        try:
+            while len(results) < len(self.tasks):
+                self._submit_ready(executor, results, running)
+                if not running:
+                    break
+
+                done, _ = wait(list(running), timeout=self._next_deadline(running), return_when=FIRST_COMPLETED)
+                now = time.perf_counter()
+
+                for future in done:
+                    name, started_at = running.pop(future)
+                    try:
+                        results[name] = self._result("completed", now - started_at, result=future.result())
+                    except Exception as e:
+                        results[name] = self._result("failed", now - started_at, error=e)
+
+                for future, (name, started_at) in list(running.items()):
+                    timeout = self.tasks[name]["timeout"]
+                    if timeout is not None and now - started_at >= timeout:
+                        running.pop(future)
+                        if not future.cancel():
+                            self.abandoned.append(future)
+                        results[name] = self._result(
+                            "timeout", now - started_at, error=TimeoutError(f"Task '{name}' exceeded {timeout}s")
+                        )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def when_idle(self, callback):
+        """Call `callback` once every abandoned task has finished (right away if there are none)"""
+        pending = [future for future in self.abandoned if not future.done()]
+        if not pending:
+            callback()
+            return
+        remaining = [len(pending)]
+        lock = threading.Lock()
+
+        def finished(_):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                callback()
+
+        for future in pending:
+            future.add_done_callback(finished)
+
+    def _submit_ready(self, executor, results, running):
+        changed = True
+        while changed:  # Skips cascade, so keep sweeping until nothing new is resolved
+            changed = False
+            in_flight = {name for name, _ in running.values()}
+            for name, spec in self.tasks.items():
+                if name in results or name in in_flight:
+                    continue
+                dep_status = [results.get(dep, {}).get("status") for dep in spec["depends_on"]]
+                if any(status not in (None, "completed") for status in dep_status):
+                    results[name] = self._result("skipped", 0.0, error=RuntimeError("Upstream task did not complete"))
+                    changed = True
+                elif all(status == "completed" for status in dep_status):
+                    running[executor.submit(spec["func"])] = (name, time.perf_counter())
+                    in_flight.add(name)
+
+    def _next_deadline(self, running):
+        now = time.perf_counter()
+        remaining = [
+            started_at + self.tasks[name]["timeout"] - now
+            for name, started_at in running.values()
+            if self.tasks[name]["timeout"] is not None
+        ]
+        return max(0.0, min(remaining)) if remaining else None
+
+    @staticmethod
+    def _result(status, elapsed, result=None, error=None):
+        return {"status": status, "result": result, "error": error, "elapsed": elapsed}
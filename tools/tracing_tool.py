@@ -0,0 +1,404 @@
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pandas as pd
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Opt-in per-stage capture: span names (comma separated) or "all"
+PROFILE_STAGES = os.environ.get("SDA_PROFILE_STAGES", "")
+TRACE_ALLOCATIONS = os.environ.get("SDA_TRACE_MALLOC", "") not in ("", "0")
+PROFILE_TOP_N = 25
+# Interval of the RSS sampler that catches memory peaks inside a span
+RSS_SAMPLE_SECONDS = float(os.environ.get("SDA_RSS_SAMPLE_SECONDS", "0.05"))
+
+_local = threading.local()  # Per-thread stack of (tracer, span) for implicit parenting
+_tracemalloc_lock = threading.Lock()
+
+
+def _rss_bytes():
+    return psutil.Process().memory_info().rss if psutil is not None else None
+
+
+def _start_tracemalloc():
+    """Started once and left running: stopping it would corrupt concurrent spans"""
+    with _tracemalloc_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+class _PeakMonitor:
+    """Peak RSS (sampled in a background thread) and peak traced memory of every open span.
+
+    The tracemalloc peak is process-wide, so it is only reset here, after being folded into
+    every open span: nested and concurrent spans each keep their own maximum.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open = set()
+        self._sampler = None
+
+    def add(self, context):
+        with self._lock:
+            self._sample()
+            context.rss_peak = _rss_bytes()
+            context.alloc_peak = tracemalloc.get_traced_memory()[0] if context.trace_allocations else None
+            self._open.add(context)
+            if psutil is not None and self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name="span-rss-sampler", daemon=True)
+                self._sampler.start()
+
+    def remove(self, context):
+        with self._lock:
+            self._sample()
+            self._open.discard(context)
+
+    def _run(self):
+        while True:
+            time.sleep(RSS_SAMPLE_SECONDS)
+            with self._lock:
+                if not self._open:
+                    self._sampler = None
+                    return
+                self._sample()
+
+    def _sample(self):
+        rss = _rss_bytes()
+        peak = None
+        if tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+        for context in self._open:
+            if rss is not None:
+                context.rss_peak = max(context.rss_peak, rss)
+            if peak is not None and context.alloc_peak is not None:
+                context.alloc_peak = max(context.alloc_peak, peak)
+
+
+_peaks = _PeakMonitor()
+
+
+def _shape(df):
+    return getattr(df, "shape", (None, None)) if df is not None else (None, None)
+
+
+class Span:
+    """One timed stage: wall/CPU time, data shape in and out, memory and optional profile"""
+
+    def __init__(self, name, category, parent=None, **attrs):
+        self.name = name
+        self.category = category
+        self.parent = parent
+        self.children = []
+        self.attrs = attrs
+        self.thread = threading.current_thread().name
+        self.thread_id = threading.get_ident()
+        self.start = None
+        self.end = None
+        self.cpu_seconds = None
+        self.error = None
+
+    @property
+    def wall_seconds(self):
+        return None if self.end is None else self.end - self.start
+
+    def output(self, df):
+        """Record the shape of the frame this stage produced"""
+        self.attrs["rows_out"], self.attrs["columns_out"] = _shape(df)
+        return df
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def record_tokens(self, usage):
+        """Attach LLM token counts from a CrewAI UsageMetrics (or dict) to the span"""
+        if usage is None:
+            return
+        if not isinstance(usage, dict):
+            usage = usage.model_dump() if hasattr(usage, "model_dump") else vars(usage)
+        for field in ("prompt_tokens", "completion_tokens", "total_tokens", "successful_requests"):
+            if usage.get(field) is not None:
+                self.attrs[field] = int(usage[field])
+
+    def to_dict(self, epoch):
+        return {
+            "name": self.name,
+            "category": self.category,
+            "thread": self.thread,
+            "thread_id": self.thread_id,
+            "start_seconds": None if self.start is None else self.start - epoch,
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "error": self.error,
+            **self.attrs,
+            "children": [child.to_dict(epoch) for child in self.children],
+        }
+
+
+class _NullSpan:
+    """Returned by `trace_span` when no tracer is active on the thread"""
+
+    def output(self, df):
+        return df
+
+    def set(self, **attrs):
+        pass
+
+    def record_tokens(self, usage):
+        pass
+
+
+class _SpanContext:
+    def __init__(self, tracer, span, profile, trace_allocations):
+        self.tracer = tracer
+        self.span = span
+        self.profile = profile
+        self.trace_allocations = trace_allocations
+        self._profiler = None
+        self.rss_peak = None
+        self.alloc_peak = None
+
+    def __enter__(self):
+        span = self.span
+        stack = _stack()
+        stack.append((self.tracer, span))
+        span.attrs["rss_start_bytes"] = _rss_bytes()
+
+        if self.trace_allocations:
+            self._alloc_start, _ = tracemalloc.get_traced_memory()
+        _peaks.add(self)
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except ValueError:  # Another profiler is already active (e.g. an enclosing stage)
+                self._profiler = None
+
+        self._cpu_start = time.thread_time()
+        self._process_cpu_start = time.process_time()
+        span.start = time.perf_counter()
+        return span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.span
+        span.end = time.perf_counter()
+        span.cpu_seconds = time.thread_time() - self._cpu_start
+        _peaks.remove(self)
+        # Whole-process CPU also counts worker threads (scheduler tasks, thread pools) under this span
+        span.attrs["process_cpu_seconds"] = time.process_time() - self._process_cpu_start
+        if exc is not None:
+            span.error = f"{exc_type.__name__}: {exc}"
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+            span.attrs["profile"] = out.getvalue()
+        if self.trace_allocations:
+            # Traced memory is process-wide: concurrent spans' allocations are included
+            current, _ = tracemalloc.get_traced_memory()
+            span.attrs["process_alloc_delta_bytes"] = current - self._alloc_start
+            span.attrs["process_alloc_peak_bytes"] = self.alloc_peak - self._alloc_start
+
+        span.attrs["rss_end_bytes"] = _rss_bytes()
+        span.attrs["rss_peak_bytes"] = self.rss_peak
+        _stack().pop()
+        return False
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+class TracingTool:
+    """Collects nested spans for one pipeline run and exports them as JSON or Chrome trace.
+
+    Spans nest by thread: a span opened while another is active on the same thread becomes its
+    child; the first span of a worker thread attaches to the run's root span. Tools deeper in
+    the stack use the module-level `trace_span`, which is a no-op outside a traced run.
+
+    Memory figures (RSS at span start/end, its sampled peak, traced-allocation delta and peak)
+    are process-wide, so spans running concurrently, in this run or another, show up in each
+    other's numbers.
+    """
+
+    def __init__(self, profile_stages=PROFILE_STAGES, trace_allocations=TRACE_ALLOCATIONS):
+        if isinstance(profile_stages, str):
+            profile_stages = {name.strip() for name in profile_stages.split(",") if name.strip()}
+        self.profile_stages = set(profile_stages)
+        self.trace_allocations = trace_allocations
+        if trace_allocations:
+            _start_tracemalloc()
+        self.roots = []
+        self.epoch = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._lock = threading.Lock()
+
+    def span(self, name, category="stage", df=None, profile=None, **attrs):
+        """Context manager timing `name`; `df` records rows/columns in, `span.output(df)` out"""
+        attrs["rows_in"], attrs["columns_in"] = _shape(df)
+        stack = _stack()
+        with self._lock:
+            if stack and stack[-1][0] is self:
+                parent = stack[-1][1]
+            else:
+                # New thread: hang off the stage that is waiting on it
+                parent = self._open_span()
+            span = Span(name, category, parent=parent, **attrs)
+            (parent.children if parent is not None else self.roots).append(span)
+        if profile is None:
+            profile = "all" in self.profile_stages or name in self.profile_stages
+        return _SpanContext(self, span, profile, self.trace_allocations)
+
+    def _open_span(self):
+        """Innermost open span on the thread of the run's open root span, if any"""
+        span = next((root for root in reversed(self.roots) if root.end is None), None)
+        while span is not None:
+            child = next((c for c in reversed(span.children)
+                          if c.start is not None and c.end is None and c.thread_id == span.thread_id), None)
+            if child is None:
+                return span
+            span = child
+        return None
+
+    def traced(self, name=None, category="stage"):
+        """Decorator form of `span`"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name or func.__qualname__, category=category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "pid": os.getpid(),
+                "spans": [root.to_dict(self.epoch) for root in self.roots if root.end is not None],
+            }
+
+    def to_json(self, path=None, indent=2):
+        text = json.dumps(self.to_dict(), indent=indent, default=str)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def to_chrome_trace(self, path=None):
+        """Chrome trace event format (chrome://tracing, Perfetto); timestamps in microseconds"""
+        trace = self.chrome_trace(self.to_dict())
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(trace, f, default=str)
+        return trace
+
+    # Exports work on `to_dict()` output too, so cached traces can be rendered without the tracer
+
+    @staticmethod
+    def chrome_trace(trace: dict) -> dict:
+        events = []
+        for span in TracingTool._walk(trace["spans"]):
+            if span["start_seconds"] is None:
+                continue
+            args = {k: v for k, v in span.items() if k not in ("children", "name", "category", "thread", "thread_id",
+                                                              "start_seconds", "wall_seconds") and v is not None}
+            events.append({
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": span["start_seconds"] * 1e6,
+                "dur": (span["wall_seconds"] or 0) * 1e6,
+                "pid": trace.get("pid", 0),
+                "tid": span["thread_id"],
+                "args": args,
+            })
+        threads = {span["thread_id"]: span["thread"] for span in TracingTool._walk(trace["spans"])}
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": trace.get("pid", 0), "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    @staticmethod
+    def timeline(trace: dict) -> pd.DataFrame:
+        """One row per span (depth-first) for tables and Gantt-style charts"""
+        rows = []
+        for depth, span in TracingTool._walk(trace["spans"], with_depth=True):
+            rows.append({
+                "span": span["name"],
+                "category": span["category"],
+                "depth": depth,
+                "thread": span["thread"],
+                "start_s": span["start_seconds"],
+                "wall_s": span["wall_seconds"],
+                "cpu_s": span["cpu_seconds"],
+                "process_cpu_s": span.get("process_cpu_seconds"),
+                "rows_in": span.get("rows_in"),
+                "columns_in": span.get("columns_in"),
+                "rows_out": span.get("rows_out"),
+                "columns_out": span.get("columns_out"),
+                "process_rss_delta_mb": _mb_delta(span.get("rss_end_bytes"), span.get("rss_start_bytes")),
+                "process_rss_peak_delta_mb": _mb_delta(span.get("rss_peak_bytes"), span.get("rss_start_bytes")),
+                "process_alloc_delta_mb": _mb_delta(span.get("process_alloc_delta_bytes"), 0),
+                "process_alloc_peak_mb": _mb_delta(span.get("process_alloc_peak_bytes"), 0),
+                "total_tokens": span.get("total_tokens"),
+                "llm_s": span.get("llm_seconds"),
+                "error": span.get("error"),
+            })
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def profiles(trace: dict) -> dict:
+        """{span name: cProfile report} for the stages that were profiled"""
+        return {span["name"]: span["profile"] for span in TracingTool._walk(trace["spans"]) if span.get("profile")}
+
+    @staticmethod
+    def _walk(spans, with_depth=False):
+        pending = [(0, span) for span in reversed(spans)]
+        while pending:
+            depth, span = pending.pop()
+            yield (depth, span) if with_depth else span
+            pending.extend((depth + 1, child) for child in reversed(span["children"]))
+
+
+def _mb_delta(end, start):
+    if end is None or start is None:
+        return None
+    return (end - start) / 1024 ** 2
+
+
+def current_tracer():
+    stack = _stack()
+    return stack[-1][0] if stack else None
+
+
+def trace_span(name, category="tool", df=None, **attrs):
+    """Child span of whatever is active on this thread; a no-op when nothing is being traced"""
+    tracer = current_tracer()
+    if tracer is None:
+        return _NullContext()
+    return tracer.span(name, category=category, df=df, **attrs)
+
+
+class _NullContext:
+    def __enter__(self):
+        return _NullSpan()
+
+    def __exit__(self, *exc):
+        return False
@@ -1,14 +1,100 @@
+import time
+
 import plotly.express as px
 import pandas as pd
+from tools.chart_data_tool import ChartDataTool
+from tools.correlation_tool import CorrelationTool
+from tools.render_tool import RenderTool
 
 class VisualizationTool:
-    def create_custom_bar_chart(self, df, x, y):
-        return px.bar(df, x=x, y=y, title=f"Bar Chart: {x} vs {y}")
+    def __init__(self):
+        self.renderer = RenderTool()
+        self.chart_data = ChartDataTool()
+        # Timing of the most recent figure: {"chart", "rows", "points", "aggregate_seconds", "figure_seconds"}
+        self.last_build = None
+
+    def create_custom_bar_chart(self, df, x, y, agg="sum"):
+        start = time.perf_counter()
+        data = self.chart_data.bar_data(df, x, y, agg=agg)
+        aggregated = time.perf_counter()
+        fig = px.bar(data, x=x, y=y, title=f"Bar Chart: {agg} of {y} by {x}")
+        self._record("bar", df, len(data), start, aggregated)
+        return fig
 
     def create_custom_scatter_plot(self, df, x, y):
-        return px.scatter(df, x=x, y=y, title=f"Scatter Plot: {x} vs {y}")
+        start = time.perf_counter()
+        fig = self.renderer.scatter_figure(df, x=x, y=y, title=f"Scatter Plot: {x} vs {y}")
+        self._record("scatter", df, sum(len(trace.x) if trace.x is not None else 0 for trace in fig.data), start, start)
+        return fig
 
     def create_custom_pie_chart(self, df, category_col):
-        pie_data = df[category_col].value_counts().reset_index()
-        pie_data.columns = [category_col, 'count']
-        return px.pie(pie_data, names=category_col, values='count', title=f"Pie Chart: {category_col}")
+        start = time.perf_counter()
+        pie_data = self.chart_data.pie_data(df[category_col])
+        aggregated = time.perf_counter()
+        fig = px.pie(pie_data, names=category_col, values='count', title=f"Pie Chart: {category_col}")
+        self._record("pie", df, len(pie_data), start, aggregated)
+        return fig
+
+    def create_histogram(self, df, column):
+        start = time.perf_counter()
+        data = self.chart_data.histogram_data(df[column])
+        aggregated = time.perf_counter()
+        fig = px.bar(data, x=(data["bin_start"] + data["bin_end"]) / 2, y="count", title=f"Histogram: {column}")
+        fig.update_traces(width=(data["bin_end"] - data["bin_start"]).to_numpy())
+        fig.update_layout(xaxis_title=column, bargap=0)
+        self._record("histogram", df, len(data), start, aggregated)
+        return fig
+
+    # Auto-dashboard charts: columns are picked from the data when not given
+
+    def create_bar_chart(self, df, x=None, y=None, agg="mean"):
+        x = x or self._pick_category(df)
+        y = y or self._numeric_columns(df)[0]
+        return self.create_custom_bar_chart(df, x, y, agg=agg)
+
+    def create_pie_chart(self, df, column=None):
+        return self.create_custom_pie_chart(df, column or self._pick_category(df))
+
+    def create_scatter_plot(self, df, x=None, y=None):
+        if x is None or y is None:
+            # The most strongly correlated pair makes the most informative default scatter
+            pairs = CorrelationTool(sample_rows=200_000).top_pairs(df, k=1)
+            if len(pairs):
+                x, y = pairs.iloc[0]["column_a"], pairs.iloc[0]["column_b"]
+            else:
+                x, y = self._numeric_columns(df)[:2]
+        return self.create_custom_scatter_plot(df, x, y)
+
+    def create_correlation_heatmap(self, df, max_columns=30):
+        start = time.perf_counter()
+        corr = CorrelationTool(sample_rows=200_000).clustered(df, max_columns=max_columns)
+        aggregated = time.perf_counter()
+        fig = px.imshow(corr, zmin=-1, zmax=1, color_continuous_scale="RdBu_r", title="Correlation Heatmap")
+        self._record("heatmap", df, corr.size, start, aggregated)
+        return fig
+
+    @staticmethod
+    def _numeric_columns(df):
+        return df.select_dtypes(include="number").columns.tolist()
+
+    @staticmethod
+    def _pick_category(df, max_categories=50):
+        """Lowest-cardinality non-numeric column with at least two values"""
+        candidates = []
+        for col in df.select_dtypes(exclude=["number", "datetime"]).columns:
+            n_unique = df[col].nunique()
+            if n_unique >= 2:
+                candidates.append((n_unique > max_categories, n_unique, col))
+        if not candidates:
+            raise ValueError("No categorical column to chart")
+        return min(candidates)[2]
+
+    def _record(self, chart, df, points, start, aggregated):
+        end = time.perf_counter()
+        self.last_build = {
+            "chart": chart,
+            "rows": len(df),
+            "points": points,
+            "aggregate_seconds": aggregated - start,
+            "figure_seconds": end - aggregated,
+        }
@@ -0,0 +1,207 @@
+"""Headless batch runner: the dashboard's analysis pipeline over many CSVs, one process per file.
+
+    python ui/batch_cli.py data/ "exports/2024-*.csv" -o batch_output --workers 8
+
+Each input gets a folder named after its content hash holding Parquet tables and a
+summary.json; files whose folder is already complete are skipped, so an interrupted run
+picks up where it stopped. manifest.jsonl records one line per input as results arrive.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import glob
+import json
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from memory.artifact_cache import ArtifactCache
+
+SUMMARY_FILE = "summary.json"
+MANIFEST_FILE = "manifest.jsonl"
+
+
+def expand_inputs(inputs, pattern="*.csv", recursive=False):
+    """Directories are searched for `pattern`; anything else is treated as a glob"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            item = os.path.join(item, "**", pattern) if recursive else os.path.join(item, pattern)
+        paths.extend(glob.glob(item, recursive=recursive))
+    # Stable order, each file once even when globs overlap
+    return sorted({os.path.abspath(path) for path in paths if os.path.isfile(path)})
+
+
+def output_dir_for(output_root, key):
+    return os.path.join(output_root, key[:16])
+
+
+def write_frame(df, path):
+    """Parquet via a temp file; mixed-type object columns (report cells) are written as text"""
+    frame = df.reset_index() if not isinstance(df.index, pd.RangeIndex) else df
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        try:
+            frame.to_parquet(tmp_path, index=False)
+        except (TypeError, ValueError):
+            frame = frame.astype({col: str for col in frame.columns if frame[col].dtype == object})
+            frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_json(value, path):
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(value, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def process_file(path, output_root, narrate=False, force=False, drop_duplicates=False):
+    """Run the pipeline on one CSV in a worker process; returns a manifest record"""
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        data = f.read()
+    key = ArtifactCache.make_key(data, *(["drop_duplicates"] if drop_duplicates else []))
+    out_dir = output_dir_for(output_root, key)
+    record = {"path": path, "key": key, "output": out_dir}
+    if not force and os.path.exists(os.path.join(out_dir, SUMMARY_FILE)):
+        return {**record, "status": "skipped", "seconds": 0.0}
+
+    # Heavy imports stay in the workers; the parent only hashes paths and collects records
+    from agents.anomaly_agent import AnomalyAgent
+    from agents.controller_agent import ControllerAgent
+    from agents.data_quality_agent import DataQualityAgent
+    from agents.stats_agent import StatsAgent
+    from tools.csv_ingestion_tool import CSVIngestionTool, DatasetSchema
+    from tools.data_cleaning_tool import CHUNKED_CLEANING_BYTES
+    from tools.row_fingerprint_tool import RowFingerprintIndex
+    from tools.tracing_tool import TracingTool
+
+    tracer = TracingTool()
+    # Too large to parse whole: cleaned out of core from the file, chunk by chunk
+    large = len(data) > CHUNKED_CLEANING_BYTES
+    if large:
+        df = None
+    else:
+        with tracer.span("CSVIngestionTool.read", category="tool") as span:
+            df, schema = CSVIngestionTool().read(data)
+            span.output(df)
+        if df.empty or df.columns.size == 0:
+            raise ValueError("CSV has no data or no columns")
+    source_bytes = len(data)
+    del data
+
+    with tracer.span("pipeline", category="pipeline", df=df) as pipeline_span:
+        controller = ControllerAgent(tracer=tracer, drop_duplicates=drop_duplicates)
+        if large:
+            os.makedirs(out_dir, exist_ok=True)
+            cleaning_path = os.path.join(out_dir, f"cleaning.{uuid.uuid4().hex}.arrow")
+            try:
+                cleaned_df, logs = controller.execute_csv(path, cleaning_path)
+            finally:
+                if os.path.exists(cleaning_path):
+                    os.remove(cleaning_path)
+            schema = DatasetSchema.from_frame(cleaned_df, source_bytes=source_bytes)
+            rows = controller.cleaning_report["rows_in"]
+        else:
+            cleaned_df, logs = controller.execute(df)
+            rows = len(df)
+        with tracer.span("StatsAgent.analyze", category="agent", df=cleaned_df):
+            stats = StatsAgent().analyze(cleaned_df)
+        with tracer.span("DataQualityAgent.generate_report", category="agent", df=cleaned_df):
+            fingerprints = RowFingerprintIndex.from_frame(cleaned_df)
+            quality_report = DataQualityAgent().generate_report(cleaned_df, fingerprints=fingerprints)
+        with tracer.span("AnomalyAgent.scan", category="agent", df=cleaned_df):
+            anomalies = AnomalyAgent().scan(cleaned_df)["summary"]
+        narration = None
+        if narrate:
+            from agents.narration_agent import NarrationAgent
+            with tracer.span("NarrationAgent.describe", category="agent", df=cleaned_df):
+                narration = NarrationAgent().describe(cleaned_df)
+        pipeline_span.output(cleaned_df)
+
+    os.makedirs(out_dir, exist_ok=True)
+    write_frame(cleaned_df, os.path.join(out_dir, "cleaned.parquet"))
+    write_frame(stats["description"], os.path.join(out_dir, "stats.parquet"))
+    write_frame(stats["top_correlations"], os.path.join(out_dir, "correlations.parquet"))
+    write_frame(quality_report, os.path.join(out_dir, "quality.parquet"))
+    write_frame(anomalies, os.path.join(out_dir, "anomalies.parquet"))
+    write_json(tracer.to_dict(), os.path.join(out_dir, "trace.json"))
+
+    record.update({
+        "status": "completed",
+        "rows": rows,
+        "columns": len(cleaned_df.columns),
+        "rows_cleaned": len(cleaned_df),
+        "duplicate_rows": fingerprints.duplicate_count(),
+        "seconds": time.perf_counter() - started,
+    })
+    # Written last: its presence marks the folder complete for resumed runs
+    write_json({**record, "schema": schema.to_dict(), "narration": narration, "logs": logs},
+               os.path.join(out_dir, SUMMARY_FILE))
+    return record
+
+
+def run_batch(paths, output_root, workers=None, narrate=False, force=False, drop_duplicates=False):
+    """Fan `paths` out over a process pool; yields manifest records as files finish"""
+    os.makedirs(output_root, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(paths), 1))) as executor:
+        futures = {executor.submit(process_file, path, output_root, narrate, force, drop_duplicates): path
+                   for path in paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"path": futures[future], "status": "failed", "error": f"{type(e).__name__}: {e}"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Smart Data Analyzer pipeline over many CSV files")
+    parser.add_argument("inputs", nargs="+", help="CSV files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="batch_output", help="Output directory (default: batch_output)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--pattern", default="*.csv", help="File pattern used inside directories")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("--narrate", action="store_true", help="Add a model-written dataset summary")
+    parser.add_argument("--force", action="store_true", help="Reprocess files that already have results")
+    parser.add_argument("--drop-duplicates", action="store_true", help="Drop exact duplicate rows while cleaning")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs, args.pattern, args.recursive)
+    if not paths:
+        parser.error("no CSV files matched the given inputs")
+    print(f"🚀 Processing {len(paths)} file(s) with {args.workers or os.cpu_count()} worker(s) → {args.output}")
+
+    counts = {"completed": 0, "skipped": 0, "failed": 0}
+    started = time.perf_counter()
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, MANIFEST_FILE), "a") as manifest:
+        for record in run_batch(paths, args.output, args.workers, args.narrate, args.force,
+                                args.drop_duplicates):
+            counts[record["status"]] += 1
+            manifest.write(json.dumps(record, default=str) + "\n")
+            manifest.flush()
+            if record["status"] == "completed":
+                print(f"✅ {record['path']}: {record['rows_cleaned']:,} rows in {record['seconds']:.1f}s")
+            elif record["status"] == "skipped":
+                print(f"⏭️ {record['path']}: already processed")
+            else:
+                print(f"❌ {record['path']}: {record['error']}")
+
+    print(f"🎯 {counts['completed']} completed, {counts['skipped']} skipped, {counts['failed']} failed "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import io
+import json
+import tempfile
+import uuid
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import streamlit as st
 import pandas as pd
 from agents.controller_agent import ControllerAgent
@@ -11,12 +14,30 @@ from agents.anomaly_agent import AnomalyAgent
 from agents.chat_agent import ChatAgent
 from agents.data_quality_agent import DataQualityAgent
 from agents.feature_generation_agent import FeatureGenerationAgent
+from memory.artifact_cache import ArtifactCache
+from memory.model_registry import model_registry
+from memory.session_store import session_store
+from tools.anomaly_detector_tool import MAX_ANOMALY_ROWS
+from tools.csv_ingestion_tool import CSVIngestionTool, DatasetSchema
+from tools.data_cleaning_tool import CHUNKED_CLEANING_BYTES
+from tools.group_index_tool import GroupIndexTool
+from tools.page_provider_tool import FILTER_OPERATORS, PageProviderTool
+from tools.row_fingerprint_tool import RowFingerprintIndex
+from tools.tracing_tool import TracingTool
 from st_aggrid import AgGrid, GridOptionsBuilder
 import plotly.express as px
 import plotly.graph_objects as go
 
 # 📌 Custom CSS Styling - Dark Themed Flip Cards
 st.set_page_config(page_title="📊 Smart Data Analyzer", layout="wide")
+
+
+@st.cache_resource
+def get_artifact_cache():
+    # One cache per server process, shared by every session and rerun
+    return ArtifactCache()
+
+
 st.markdown("""
     <style>
         html, body, [class*="css"]  {
@@ -170,44 +191,187 @@ st.markdown("""
 
 #uploaded_file = st.file_uploader("Upload a CSV file to get started", type=["csv"])
 uploaded_file = st.file_uploader("Upload a CSV file to get started", type=["csv"])
-
-if uploaded_file is not None:
+drop_duplicates = st.checkbox("Drop exact duplicate rows while cleaning")
+
+
+def run_pipeline(df, tracer, drop_duplicates=False, source=None):
+    """`source` (a seekable CSV, with df=None) takes the out-of-core cleaning path for large uploads"""
+    with tracer.span("pipeline", category="pipeline", df=df) as pipeline_span:
+        controller = ControllerAgent(tracer=tracer, drop_duplicates=drop_duplicates)
+        if source is not None:
+            df = pd.read_csv(source, nrows=5)  # Raw preview only
+            source.seek(0)
+            fd, cleaning_path = tempfile.mkstemp(suffix=".arrow")
+            os.close(fd)
+            try:
+                cleaned_df, logs = controller.execute_csv(source, cleaning_path)
+            finally:
+                try:
+                    os.remove(cleaning_path)  # Mapped pages stay readable; the session store keeps its own copy
+                except OSError:
+                    pass
+        else:
+            cleaned_df, logs = controller.execute(df)
+
+        with tracer.span("StatsAgent.analyze", category="agent", df=cleaned_df):
+            stats_agent = StatsAgent()
+            stats = stats_agent.analyze(cleaned_df)
+
+        quality_agent = DataQualityAgent()
+        # Built once per upload and cached with the artifacts, so duplicate checks never rehash
+        with tracer.span("RowFingerprintIndex.from_frame", df=cleaned_df):
+            fingerprints = RowFingerprintIndex.from_frame(cleaned_df)
+        with tracer.span("DataQualityAgent.generate_report", category="agent", df=cleaned_df):
+            quality_report = quality_agent.generate_report(cleaned_df, fingerprints=fingerprints)
+        pipeline_span.output(cleaned_df)
+    return {
+        "raw_preview": df.head(),
+        "cleaned_df": cleaned_df,
+        "logs": logs,
+        "stats": stats,
+        "fingerprints": fingerprints,
+        "quality_report": quality_report,
+        "trace": tracer.to_dict(),
+    }
+
+
+def render_trace(trace):
+    """Gantt-style timeline of the pipeline spans plus JSON / Chrome trace downloads"""
+    timeline = TracingTool.timeline(trace)
+    if timeline.empty:
+        return
+    st.markdown("**Pipeline trace**")
+    labels = [" " * depth + name for depth, name in zip(timeline["depth"], timeline["span"])]
+    fig = go.Figure()
+    for category, rows in timeline.groupby("category", sort=False):
+        fig.add_trace(go.Bar(
+            y=rows.index, x=rows["wall_s"], base=rows["start_s"], orientation="h", name=category,
+            customdata=rows[["cpu_s", "rows_in", "rows_out", "thread"]].astype(str).to_numpy(),
+            hovertemplate="%{x:.3f}s wall, %{customdata[0]}s CPU<br>rows %{customdata[1]} → %{customdata[2]}"
+                          "<br>%{customdata[3]}<extra></extra>",
+        ))
+    fig.update_yaxes(tickvals=timeline.index, ticktext=labels, autorange="reversed")
+    fig.update_layout(xaxis_title="seconds since upload", barmode="overlay", height=120 + 28 * len(timeline))
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(timeline)
+
+    profiles = TracingTool.profiles(trace)
+    if profiles:
+        # Expanders can't nest inside the System Logs expander, so pick one report at a time
+        stage = st.selectbox("cProfile report", list(profiles), key="trace_profile")
+        st.text(profiles[stage])
+    c1, c2 = st.columns(2)
+    c1.download_button("⬇️ Trace (JSON)", json.dumps(trace, default=str), file_name="trace.json",
+                       mime="application/json")
+    c2.download_button("⬇️ Chrome trace", json.dumps(TracingTool.chrome_trace(trace), default=str),
+                       file_name="trace.chrome.json", mime="application/json")
+
+
+def render_paged_table(provider, key, grid=False):
+    """Sort / filter / page controls over a server-side provider; only one window of rows is sent"""
+    columns = provider.df.columns.tolist()
+    c1, c2, c3, c4, c5 = st.columns([2, 1, 2, 1, 2])
+    sort_by = c1.selectbox("Sort by", ["(none)"] + columns, key=f"{key}_sort")
+    ascending = c2.radio("Order", ["Asc", "Desc"], key=f"{key}_order", horizontal=True) == "Asc"
+    filter_col = c3.selectbox("Filter column", ["(none)"] + columns, key=f"{key}_filter_col")
+    filter_op = c4.selectbox("Operator", FILTER_OPERATORS, key=f"{key}_filter_op")
+    filter_value = c5.text_input("Value", key=f"{key}_filter_value")
+
+    filters = []
+    if filter_col != "(none)" and filter_value != "":
+        filters.append((filter_col, filter_op, filter_value))
+    query = dict(sort_by=None if sort_by == "(none)" else sort_by, ascending=ascending, filters=filters)
     try:
-        # Read bytes from uploaded file and decode safely
-        stringio = io.StringIO(uploaded_file.getvalue().decode("utf-8"))
-        df = pd.read_csv(stringio)
+        total = len(provider.positions(**query))
+    except (ValueError, TypeError) as e:
+        st.error(f"❌ Invalid filter: {e}")
+        return
+
+    n_pages = max(1, -(-total // provider.page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages  # A narrower filter left the old page out of range
+    number = st.number_input(f"Page (1-{n_pages:,})", min_value=1, max_value=n_pages, key=page_key) - 1
+    window = provider.page(number, **query)
+    st.caption(f"Rows {window['start'] + 1:,}-{min(window['start'] + provider.page_size, total):,} of {total:,}")
+    if grid:
+        # The grid pages through the prefetched window client-side without a rerun
+        gb = GridOptionsBuilder.from_dataframe(window["rows"])
+        gb.configure_pagination(paginationAutoPageSize=False, paginationPageSize=provider.page_size)
+        gb.configure_default_column(editable=True, groupable=True)
+        AgGrid(window["rows"], gridOptions=gb.build(), enable_enterprise_modules=False, height=400, key=f"{key}_grid")
+    else:
+        st.dataframe(window["rows"].head(provider.page_size))
 
-        if df.empty or df.columns.size == 0:
-            st.error("❌ Uploaded CSV has no data or no columns.")
+
+artifacts = None
+if uploaded_file is not None:
+    artifact_cache = get_artifact_cache()
+    file_bytes = uploaded_file.getvalue()
+    # The cleaning option changes every artifact, so it is part of the key
+    cache_key = ArtifactCache.make_key(file_bytes, *(["drop_duplicates"] if drop_duplicates else []))
+    artifacts = artifact_cache.get(cache_key)
+    if artifacts is not None and not session_store.exists(cache_key):
+        artifacts = None  # The mapped dataset file is gone; rebuild it
+
+    if artifacts is None:
+        tracer = TracingTool()
+        # Too large to parse whole: the pipeline cleans it chunk by chunk instead
+        large = len(file_bytes) > CHUNKED_CLEANING_BYTES
+        try:
+            if large:
+                df = schema = None
+            else:
+                # Parse the uploaded bytes once, straight into compact dtypes
+                with tracer.span("CSVIngestionTool.read", category="tool") as span:
+                    df, schema = CSVIngestionTool().read(file_bytes)
+                    span.output(df)
+
+                if df.empty or df.columns.size == 0:
+                    st.error("❌ Uploaded CSV has no data or no columns.")
+                    st.stop()
+
+        except pd.errors.EmptyDataError:
+            st.error("❌ The uploaded CSV file is empty or unreadable.")
+            st.stop()
+        except Exception as e:
+            st.error(f"❌ Failed to read CSV: {e}")
             st.stop()
 
-        st.success("✅ File uploaded successfully!")
+        artifacts = run_pipeline(df, tracer, drop_duplicates, source=io.BytesIO(file_bytes) if large else None)
+        artifacts["schema"] = schema or DatasetSchema.from_frame(artifacts["cleaned_df"], source_bytes=len(file_bytes))
+        # The cleaned frame lives in the memory-mapped session store, shared by every session
+        session_store.persist(cache_key, artifacts.pop("cleaned_df"))
+        artifact_cache.put(cache_key, artifacts)
 
-    except pd.errors.EmptyDataError:
-        st.error("❌ The uploaded CSV file is empty or unreadable.")
-        st.stop()
-    except Exception as e:
-        st.error(f"❌ Failed to read CSV: {e}")
-        st.stop()
+    st.success("✅ File uploaded successfully!")
 
 # -------------------- MAIN INTERFACE --------------------
 
-if uploaded_file:
-    df = pd.read_csv(uploaded_file)
-    st.subheader("🔍 Raw Data Preview")
-    st.dataframe(df.head())
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+current_key = cache_key if artifacts is not None else None
+previous_key = st.session_state.get("dataset_key")
+if previous_key is not None and previous_key != current_key:
+    # New or removed upload: this session's derived columns for the old dataset go with it
+    session_store.drop_overlay(session_id, previous_key)
+st.session_state["dataset_key"] = current_key
 
-    controller = ControllerAgent()
-    cleaned_df, logs = controller.execute(df)
+if artifacts is not None:
+    st.subheader("🔍 Raw Data Preview")
+    st.dataframe(artifacts["raw_preview"])
 
-    stats_agent = StatsAgent()
-    stats = stats_agent.analyze(cleaned_df)
+    base_df = session_store.open(cache_key)
+    # Shared read-only base plus this session's derived columns; no per-session copy of the data
+    cleaned_df = session_store.frame(session_id, cache_key)
+    overlay_token = session_store.overlay_token(session_id, cache_key)
+    logs = artifacts["logs"]
+    stats = artifacts["stats"]
 
     vis_agent = VisualizationAgent()
     anomaly_agent = AnomalyAgent()
-    chat_agent = ChatAgent(cleaned_df)
-    quality_agent = DataQualityAgent()
-    feature_agent = FeatureGenerationAgent()
+    chat_agent = ChatAgent(base_df, dataset_key=cache_key)
+    # The live overlay dict: columns this session derives later in the run bypass the date cache too
+    feature_agent = FeatureGenerationAgent(dataset_key=cache_key, overlay_columns=session_store.overlay(session_id, cache_key))
 
     tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
         "🧹 Cleaned Data", "📈 Summary Stats", "🔗 Correlation",
@@ -216,55 +380,95 @@ if uploaded_file:
     ])
 
     with tab1:
-        st.dataframe(cleaned_df)
+        render_paged_table(PageProviderTool.for_dataset(cache_key, cleaned_df, overlay_token), key="cleaned")
 
     with tab2:
         st.dataframe(stats["description"])
 
     with tab3:
+        st.markdown("#### 🔝 Strongest Correlations")
+        st.dataframe(stats["top_correlations"])
+        st.markdown("#### 🧩 Clustered Correlation Matrix (most correlated columns)")
         st.dataframe(stats["correlation"])
 
     with tab4:
+        st.markdown("### 🖼️ Auto Dashboard")
+        if st.toggle("Show auto-generated charts", value=True):
+            # Figures are cached per dataset and chart spec, so reopening this tab is a cache hit
+            auto_figures = vis_agent.generate_all(
+                base_df, schema=artifacts["schema"], dataset_key=cache_key, cache=artifact_cache
+            )
+            chart_columns = st.columns(2)
+            for i, (name, fig) in enumerate(auto_figures.items()):
+                with chart_columns[i % 2]:
+                    st.plotly_chart(fig, use_container_width=True, key=f"auto_{name}")
+            build_times = ", ".join(
+                f"{name}: {'cached' if seconds == 0 else f'{seconds:.2f}s'}" for name, seconds in vis_agent.last_build_times.items()
+            )
+            if build_times:
+                st.caption(f"⏱️ {build_times}")
+
         st.markdown("### 📊 Generate Custom Visualizations")
         numeric_cols = cleaned_df.select_dtypes(include="number").columns.tolist()
-        cat_cols = cleaned_df.select_dtypes(include="object").columns.tolist()
+        cat_cols = cleaned_df.select_dtypes(include=["object", "category"]).columns.tolist()
         x_axis = st.selectbox("Select X-axis", options=numeric_cols + cat_cols)
         y_axis = st.selectbox("Select Y-axis (bar/scatter)", options=numeric_cols)
-        chart_type = st.selectbox("Chart Type", ["Bar Chart", "Scatter Plot", "Pie Chart"])
+        chart_type = st.selectbox("Chart Type", ["Bar Chart", "Scatter Plot", "Pie Chart", "Histogram"])
+        bar_agg = st.selectbox("Bar aggregation", ["sum", "mean"]) if chart_type == "Bar Chart" else "sum"
         if st.button("Generate Chart"):
             if chart_type == "Bar Chart":
-                fig = vis_agent.tool.create_custom_bar_chart(cleaned_df, x_axis, y_axis)
+                fig = vis_agent.tool.create_custom_bar_chart(cleaned_df, x_axis, y_axis, agg=bar_agg)
             elif chart_type == "Scatter Plot":
                 fig = vis_agent.tool.create_custom_scatter_plot(cleaned_df, x_axis, y_axis)
             elif chart_type == "Pie Chart":
                 fig = vis_agent.tool.create_custom_pie_chart(cleaned_df, x_axis)
+            elif chart_type == "Histogram":
+                fig = vis_agent.tool.create_histogram(cleaned_df, x_axis if x_axis in numeric_cols else y_axis)
             st.plotly_chart(fig, use_container_width=True)
+            build = vis_agent.tool.last_build
+            st.caption(
+                f"⏱️ {build['rows']:,} rows → {build['points']:,} points in "
+                f"{build['aggregate_seconds'] * 1000:.0f} ms aggregation + {build['figure_seconds'] * 1000:.0f} ms figure build"
+            )
 
     with tab5:
         st.markdown("### 🧪 Interactive Data Playground")
-        gb = GridOptionsBuilder.from_dataframe(cleaned_df)
-        gb.configure_pagination()
-        gb.configure_default_column(editable=True, groupable=True)
-        grid_options = gb.build()
-        AgGrid(cleaned_df, gridOptions=grid_options, enable_enterprise_modules=False, height=400)
+        render_paged_table(PageProviderTool.for_dataset(cache_key, cleaned_df, overlay_token), key="playground", grid=True)
 
         st.markdown("#### 🔀 Group and Aggregate")
-        group_col = st.selectbox("Group by column", options=cleaned_df.columns)
+        group_cols = st.multiselect("Group by column(s)", options=cleaned_df.columns, max_selections=3)
         agg_col = st.selectbox("Aggregate column", options=cleaned_df.select_dtypes(include='number').columns)
         agg_func = st.selectbox("Aggregation", ["sum", "mean", "count", "min", "max"])
-        if st.button("Apply Grouping"):
-            grouped = cleaned_df.groupby(group_col)[agg_col].agg(agg_func).reset_index()
+        if st.button("Apply Grouping") and group_cols:
+            # Key codes and the per-key aggregate cube are built once per dataset; repeat groupings are lookups
+            group_index = GroupIndexTool.for_dataset(cache_key, base_df)
+            if all(col in group_index.df.columns for col in group_cols + [agg_col]):
+                grouped = group_index.aggregate(group_cols, agg_col, agg_func).reset_index()
+            else:
+                grouped = cleaned_df.groupby(group_cols, observed=True)[agg_col].agg(agg_func).reset_index()
             st.dataframe(grouped)
-            st.plotly_chart(px.bar(grouped, x=group_col, y=agg_col, title=f"{agg_func.title()} of {agg_col} by {group_col}"), use_container_width=True)
+            label = group_cols[0] if len(group_cols) == 1 else " / ".join(group_cols)
+            x = grouped[group_cols].astype(str).agg(" / ".join, axis=1) if len(group_cols) > 1 else group_cols[0]
+            st.plotly_chart(px.bar(grouped, x=x, y=agg_col, title=f"{agg_func.title()} of {agg_col} by {label}"), use_container_width=True)
 
     with tab6:
         st.markdown("### 🚨 Anomaly Detection")
         anomaly_col = st.selectbox("Column for anomaly detection", options=cleaned_df.select_dtypes(include='number').columns)
         if st.button("Detect Anomalies"):
             result_df, fig = anomaly_agent.detect(cleaned_df, anomaly_col)
+            # Only the flagged rows are sent to the browser, largest |z| first
+            st.caption(f"Top {len(result_df):,} anomalous rows by |z-score| (at most {MAX_ANOMALY_ROWS:,})")
             st.dataframe(result_df)
             st.plotly_chart(fig, use_container_width=True)
 
+        st.markdown("#### 🔎 Scan All Numeric Columns")
+        use_forest = st.checkbox("Include Isolation Forest (row-level, subsampled)")
+        if st.button("Scan All Columns"):
+            scan = anomaly_agent.scan(cleaned_df, isolation_forest=use_forest)
+            st.dataframe(scan["summary"])
+            if use_forest:
+                st.metric("Isolation Forest anomalous rows", int(scan["flags"]["isolation_forest"].sum()))
+
     with tab7:
         st.markdown("### 💬 Chat with CSV (LLM-powered)")
         if "chat_history" not in st.session_state:
@@ -284,13 +488,26 @@ if uploaded_file:
 
     with tab8:
         st.markdown("### 📋 Data Quality Report")
-        report = quality_agent.generate_report(cleaned_df)
-        st.dataframe(report)
+        st.dataframe(artifacts["quality_report"])
+
+        fingerprints = artifacts["fingerprints"]
+        duplicate_mask = fingerprints.duplicated()
+        st.metric("🔁 Exact Duplicate Rows", f"{int(duplicate_mask.sum()):,}")
+        if duplicate_mask.any():
+            with st.expander("Show duplicate rows"):
+                st.dataframe(base_df[duplicate_mask].head(1000))
+
+        st.markdown("#### 🔍 Near-Duplicate Lookup")
+        near_cols = st.multiselect("Compare on columns (leave empty for all)", base_df.columns.tolist())
+        if st.button("Find Near-Duplicates"):
+            groups = RowFingerprintIndex.near_duplicates(base_df, columns=near_cols or None)
+            st.write(f"{len(groups):,} rows in {groups.nunique():,} near-duplicate groups (text normalized, floats rounded to 2 dp)")
+            st.dataframe(base_df.loc[groups.sort_values().index[:1000]].assign(group=groups))
 
     with tab9:
         st.markdown("### ➕ Derived Feature Generator")
         columns = cleaned_df.columns.tolist()
-        feature_type = st.radio("Feature Type", ["Math", "Date"])
+        feature_type = st.radio("Feature Type", ["Math", "Date", "Expressions"])
         if feature_type == "Math":
             col1 = st.selectbox("Select Column 1", options=columns)
             operation = st.selectbox("Operation", ["+", "-", "*", "/"])
@@ -298,19 +515,46 @@ if uploaded_file:
             new_col = st.text_input("New Column Name")
             if st.button("Generate Feature"):
                 new_df = feature_agent.create_math_feature(cleaned_df, col1, col2, operation, new_col)
-                cleaned_df[new_col] = new_df[new_col]
-                st.success(f"Feature '{new_col}' created!")
-                st.dataframe(cleaned_df.head())
-        else:
+                if new_col in new_df:
+                    cleaned_df[new_col] = session_store.set_column(session_id, cache_key, new_col, new_df[new_col])
+                    st.success(f"Feature '{new_col}' created!")
+                    st.dataframe(cleaned_df.head())
+                else:
+                    st.error(f"❌ Could not create feature '{new_col}'")
+        elif feature_type == "Date":
             date_col = st.selectbox("Select Date Column", options=columns)
-            date_part = st.selectbox("Date Part", ["year", "month", "day", "weekday"])
+            date_part = st.selectbox("Date Part", ["year", "month", "day", "weekday", "hour", "quarter", "week"])
             new_col = st.text_input("New Column Name")
             if st.button("Extract Date Part"):
                 new_df = feature_agent.create_date_feature(cleaned_df, date_col, date_part, new_col)
-                cleaned_df[new_col] = new_df[new_col]
-                st.success(f"Feature '{new_col}' created!")
-                st.dataframe(cleaned_df.head())
+                if new_col in new_df:
+                    cleaned_df[new_col] = session_store.set_column(session_id, cache_key, new_col, new_df[new_col])
+                    st.success(f"Feature '{new_col}' created!")
+                    st.dataframe(cleaned_df.head())
+                else:
+                    st.error(f"❌ Could not extract '{date_part}' from '{date_col}'")
+        else:
+            expressions = st.text_area(
+                "One feature per line as `name = expression` (wrap column names with spaces in backticks)",
+                placeholder="margin = revenue - cost\nmargin_pct = (revenue - cost) / revenue * 100"
+            )
+            if st.button("Generate Features"):
+                new_df = feature_agent.create_expression_features(cleaned_df, expressions)
+                if new_df.columns.size:
+                    # Only the new columns are assigned; the existing ones are not copied
+                    for new_col in new_df.columns:
+                        cleaned_df[new_col] = session_store.set_column(session_id, cache_key, new_col, new_df[new_col])
+                    st.success(f"Created {new_df.columns.size} feature(s): {', '.join(map(str, new_df.columns))}")
+                    st.dataframe(cleaned_df.head())
+                else:
+                    st.error("❌ Could not evaluate the expressions")
 
     with st.expander("🧠 System Logs"):
         for log in logs:
             st.text(log)
+        model_latency = model_registry.latency_report()
+        if model_latency:
+            st.markdown("**Model load / inference latency (seconds)**")
+            st.dataframe(pd.DataFrame(model_latency).transpose())
+        if artifacts.get("trace"):
+            render_trace(artifacts["trace"])